@@ -0,0 +1,299 @@
+"""
+SALES KING ACADEMY - AGENT SWARM LOAD TEST
+==========================================
+
+Drives AgentSwarm against a local stub of the Anthropic Messages API:
+- StubAnthropicServer answers POST /v1/messages after a configurable latency
+- Streaming requests get Messages API server-sent events, one word per delta
+- HTTP/1.1 keep-alive, so connection reuse by the client pool is visible
+- Reports throughput, latency percentiles, peak concurrency and connections opened
+- Stream mode reports time to first byte and tokens per second per agent role
+
+Usage:
+    python agent_loadtest.py --requests 500 --latency 0.05 --swarm-concurrency 64
+    python agent_loadtest.py --stream --requests 50 --token-delay 0.002
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Any, Dict, Optional, Sequence
+
+try:
+    from backend.tsi_core import AgentSwarm, AgentRole, create_async_client
+except ImportError:
+    from tsi_core import AgentSwarm, AgentRole, create_async_client
+
+DEFAULT_LATENCY = 0.05  # Seconds the stub waits before answering
+DEFAULT_REPLY_WORDS = 200
+DEFAULT_TOKEN_DELAY = 0.002  # Seconds between streamed deltas
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STUB SERVER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class StubAnthropicServer:
+    """
+    Minimal HTTP/1.1 server speaking the Messages API response shape
+
+    Every request gets a canned assistant message after ``latency``
+    seconds. Counters track requests, connections and peak concurrency.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = DEFAULT_LATENCY,
+                 reply_words: int = DEFAULT_REPLY_WORDS, token_delay: float = DEFAULT_TOKEN_DELAY):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.reply_words = reply_words
+        self.token_delay = token_delay
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()  # Idle keep-alive connections end with EOF
+            await self._server.wait_closed()
+            while self._writers:
+                await asyncio.sleep(0.01)
+            self._server = None
+
+    async def __aenter__(self) -> "StubAnthropicServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                if method == "POST" and path.startswith("/v1/messages") and b'"stream"' in body:
+                    request = json.loads(body)
+                    if request.get("stream"):
+                        await self._stream(writer, request)
+                        continue
+                status, payload = await self._handle(method, path, body)
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    f"content-type: application/json\r\n"
+                    f"content-length: {len(payload)}\r\n"
+                    f"connection: keep-alive\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _handle(self, method: str, path: str, body: bytes):
+        if method != "POST" or not path.startswith("/v1/messages"):
+            return "404 Not Found", json.dumps({"type": "error", "error": {"type": "not_found_error"}}).encode()
+
+        request = json.loads(body or b"{}")
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+        text = " ".join(["stub"] * self.reply_words)
+        return "200 OK", json.dumps({
+            "id": f"msg_stub_{self.requests}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model", "stub"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(body) // 4, "output_tokens": self.reply_words}
+        }).encode()
+
+    async def _stream(self, writer: asyncio.StreamWriter, request: Dict[str, Any]):
+        """Answer with chunked server-sent events in the Messages API streaming format"""
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        async def send(event: str, data: Dict[str, Any]):
+            chunk = f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+            writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            await writer.drain()  # Backpressure: wait for the client to read
+
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\n"
+                         b"transfer-encoding: chunked\r\nconnection: keep-alive\r\n\r\n")
+            await asyncio.sleep(self.latency)
+            await send("message_start", {"type": "message_start", "message": {
+                "id": f"msg_stub_{self.requests}", "type": "message", "role": "assistant",
+                "model": request.get("model", "stub"), "content": [], "stop_reason": None,
+                "stop_sequence": None, "usage": {"input_tokens": 1, "output_tokens": 1}
+            }})
+            await send("content_block_start", {"type": "content_block_start", "index": 0,
+                                               "content_block": {"type": "text", "text": ""}})
+            for _ in range(self.reply_words):
+                await send("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                   "delta": {"type": "text_delta", "text": "stub "}})
+                if self.token_delay:
+                    await asyncio.sleep(self.token_delay)
+            await send("content_block_stop", {"type": "content_block_stop", "index": 0})
+            await send("message_delta", {"type": "message_delta",
+                                         "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                         "usage": {"output_tokens": self.reply_words}})
+            await send("message_stop", {"type": "message_stop"})
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        finally:
+            self.in_flight -= 1
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOAD TEST
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+async def run_load_test(requests: int = 500, latency: float = DEFAULT_LATENCY,
+                        swarm_concurrency: int = 64, agent_concurrency: int = 8,
+                        max_connections: int = 100) -> Dict[str, Any]:
+    """Send ``requests`` tasks across all roles at once and measure the swarm"""
+    async with StubAnthropicServer(latency=latency) as server:
+        client = create_async_client(api_key="stub", base_url=server.base_url,
+                                     max_connections=max_connections)
+        swarm = AgentSwarm(client=client, max_concurrency=swarm_concurrency,
+                           agent_concurrency=agent_concurrency)
+        roles = list(AgentRole)
+
+        async def one(i: int) -> float:
+            start = time.perf_counter()
+            result = await swarm.delegate_task(
+                {"description": f"Load test task {i}", "context": {"index": i}},
+                role=roles[i % len(roles)]
+            )
+            if not result["success"]:
+                raise RuntimeError(result["error"])
+            return time.perf_counter() - start
+
+        try:
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*(one(i) for i in range(requests)))
+            elapsed = time.perf_counter() - start
+        finally:
+            await swarm.aclose()
+
+    report = {
+        'requests': requests,
+        'stub_latency_ms': latency * 1000,
+        'elapsed_s': elapsed,
+        'requests_per_sec': requests / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': _percentile(latencies, 0.95) * 1000,
+        'peak_in_flight': server.peak_in_flight,
+        'connections_opened': server.connections
+    }
+
+    print(f"═══════════════════════════════════════════════")
+    print(f"AGENT SWARM LOAD TEST")
+    print(f"═══════════════════════════════════════════════")
+    print(f"Requests: {requests} (stub latency {latency * 1000:.0f} ms)")
+    print(f"Limits: swarm {swarm_concurrency}, per agent {agent_concurrency}, connections {max_connections}")
+    print(f"Throughput: {report['requests_per_sec']:,.1f} req/s over {elapsed:.2f}s")
+    print(f"Latency: p50 {report['p50_ms']:.1f} ms, p95 {report['p95_ms']:.1f} ms")
+    print(f"Peak in flight: {server.peak_in_flight}, connections opened: {server.connections}")
+    print(f"═══════════════════════════════════════════════")
+    return report
+
+async def run_stream_test(requests: int = 50, latency: float = DEFAULT_LATENCY,
+                          token_delay: float = DEFAULT_TOKEN_DELAY,
+                          reply_words: int = DEFAULT_REPLY_WORDS) -> Dict[str, Any]:
+    """Stream ``requests`` tasks round-robin over all roles and report TTFB and tokens/s per role"""
+    async with StubAnthropicServer(latency=latency, reply_words=reply_words, token_delay=token_delay) as server:
+        client = create_async_client(api_key="stub", base_url=server.base_url)
+        swarm = AgentSwarm(client=client)
+        roles = list(AgentRole)
+
+        async def one(i: int):
+            task = {"description": f"Stream test task {i}", "context": {"index": i}}
+            async for event in swarm.delegate_stream(task, role=roles[i % len(roles)]):
+                if event["type"] == "error":
+                    raise RuntimeError(event["error"])
+
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(requests)))
+            elapsed = time.perf_counter() - start
+        finally:
+            await swarm.aclose()
+
+    per_role = swarm.stream_metrics()
+    print(f"═══════════════════════════════════════════════")
+    print(f"AGENT STREAMING TEST")
+    print(f"═══════════════════════════════════════════════")
+    print(f"Streams: {requests} in {elapsed:.2f}s (stub latency {latency * 1000:.0f} ms, "
+          f"{reply_words} deltas {token_delay * 1000:.1f} ms apart)")
+    for role, metrics in per_role.items():
+        rate = metrics["avg_tokens_per_sec"]
+        print(f"{role:>24}: TTFB {metrics['avg_ttfb_ms']:7.1f} ms, "
+              f"{rate:8.1f} tokens/s" if rate else f"{role:>24}: TTFB {metrics['avg_ttfb_ms']:7.1f} ms")
+    print(f"═══════════════════════════════════════════════")
+    return {'requests': requests, 'elapsed_s': elapsed, 'roles': per_role}
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AgentSwarm load test against a local API stub")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY)
+    parser.add_argument("--swarm-concurrency", type=int, default=64)
+    parser.add_argument("--agent-concurrency", type=int, default=8)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--stream", action="store_true", help="Measure streaming TTFB and tokens/s per role")
+    parser.add_argument("--token-delay", type=float, default=DEFAULT_TOKEN_DELAY)
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        report = asyncio.run(run_stream_test(args.requests, args.latency, args.token_delay))
+    else:
+        report = asyncio.run(run_load_test(args.requests, args.latency, args.swarm_concurrency,
+                                           args.agent_concurrency, args.max_connections))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
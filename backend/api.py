@@ -4,15 +4,22 @@ SALES KING ACADEMY - COMPLETE API
 FastAPI backend exposing all TSI systems
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, List, Any, Optional
 import asyncio
+import json
+import os
 
 from tsi_core import TSICore, AgentRole
-from sat_solver import RKLSATSolver, Clause
+from sat_solver import (RKLSATSolver, Clause, DIMACSError, SolveInterrupted, parse_dimacs,
+                        portfolio_configs)
+from sat_jobs import SATJobQueue, SATBudget
 from mind_mastery import MindMasteryEngine
+from security.auth import auth_service, Role
 
 app = FastAPI(title="Sales King Academy API", version="1.0.0")
 
@@ -25,9 +32,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize systems
-tsi = TSICore()
-sat_solver = RKLSATSolver(alpha=25)
+# Initialize systems. TSICore opens the ledger and agent cache databases, so
+# it is built in startup(): spawned SAT job workers re-import this module
+# when it runs as a script and must not open them again
+tsi: Optional[TSICore] = None
+sat_solver = RKLSATSolver(alpha=25, ledger_mode="ring")
+sat_jobs = SATJobQueue(default_budget=SATBudget(wall_seconds=60))
 mind_mastery = MindMasteryEngine()
 
 # Models
@@ -35,6 +45,15 @@ class TaskRequest(BaseModel):
     description: str
     context: Dict[str, Any] = {}
     agent_role: Optional[str] = None
+    cache_control: Optional[Dict[str, Any]] = None  # no_cache / no_store / ttl
+
+class ParallelTaskRequest(BaseModel):
+    description: str
+    context: Dict[str, Any] = {}
+    roles: List[str]
+    deadline: Optional[float] = 60.0  # Seconds before unanswered agents are cancelled
+    quorum: Optional[int] = None  # Successful answers to wait for; all roles when omitted
+    cache_control: Optional[Dict[str, Any]] = None
 
 class AssessmentAnswers(BaseModel):
     assessment_id: str
@@ -42,11 +61,52 @@ class AssessmentAnswers(BaseModel):
     answers: Dict[str, int]
     time_taken_seconds: float
 
+class CreditTransfer(BaseModel):
+    from_owner: str
+    to_owner: str
+    amount: int
+
+class CreditPayout(BaseModel):
+    from_owner: str
+    payouts: Dict[str, int]  # Recipient -> amount
+
+class SATJobRequest(BaseModel):
+    problem: Optional[str] = None  # DIMACS CNF text; a random 3-SAT instance when omitted
+    variables: int = 15
+    clauses: int = 60
+    seed: Optional[int] = None
+    engine: str = "cdcl"
+    wall_seconds: Optional[float] = 60
+    max_cycles: Optional[int] = None
+    max_memory_mb: Optional[float] = None
+
+bearer = HTTPBearer(auto_error=False)
+
+async def require_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer)) -> Dict[str, Any]:
+    """Bearer token from the auth service; 401 when missing or invalid"""
+    user = auth_service.validate_token(credentials.credentials) if credentials else None
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid or missing bearer token",
+                            headers={"WWW-Authenticate": "Bearer"})
+    return user
+
+def require_owner(user: Dict[str, Any], owner: str):
+    """Only an owner's own account (or an admin) may spend its credits"""
+    if user.get('role') != Role.ADMIN and user.get('user_id') != owner:
+        raise HTTPException(status_code=403, detail=f"Not allowed to spend credits of {owner}")
+
 @app.on_event("startup")
 async def startup():
     """Start TSI system"""
+    global tsi
+    tsi = TSICore()
     await tsi.start()
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop TSI background loops and flush queued writes"""
+    await tsi.stop()
+
 @app.get("/")
 async def root():
     return {"message": "Sales King Academy API", "status": "operational"}
@@ -61,11 +121,88 @@ async def delegate_task(task: TaskRequest):
     """Delegate task to AI agent"""
     role = AgentRole[task.agent_role] if task.agent_role else None
     result = await tsi.agents.delegate_task(
-        {"description": task.description, "context": task.context},
+        {"description": task.description, "context": task.context, "cache_control": task.cache_control},
         role=role
     )
     return result
 
+@app.get("/agent/route")
+async def route_task(description: str, mode: Optional[str] = None, limit: int = 5):
+    """Roles the router would pick for a task description, best first"""
+    if mode is not None and mode not in tsi.agents.router.MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown routing mode: {mode}")
+    ranked = tsi.agents.router.rank(description, mode, limit)
+    return {
+        "role": tsi.agents.router.route(description, mode).name,
+        "ranking": [{"role": role.name, "score": score} for role, score in ranked]
+    }
+
+@app.post("/agent/task/parallel")
+async def delegate_parallel(task: ParallelTaskRequest):
+    """Send one task to several agents at once and merge the answers"""
+    unknown = [role for role in task.roles if role not in AgentRole.__members__]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown agent roles: {', '.join(unknown)}")
+    try:
+        return await tsi.agents.delegate_parallel(
+            {"description": task.description, "context": task.context, "cache_control": task.cache_control},
+            roles=[AgentRole[role] for role in task.roles],
+            deadline=task.deadline,
+            quorum=task.quorum
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _task_events(task: TaskRequest):
+    """Agent stream events for a task request"""
+    role = AgentRole[task.agent_role] if task.agent_role else None
+    return tsi.agents.delegate_stream(
+        {"description": task.description, "context": task.context, "cache_control": task.cache_control},
+        role=role
+    )
+
+@app.post("/agent/task/stream")
+async def stream_task(task: TaskRequest):
+    """Server-sent events with text deltas as the agent writes, then a done event"""
+    if task.agent_role and task.agent_role not in AgentRole.__members__:
+        raise HTTPException(status_code=400, detail=f"Unknown agent role: {task.agent_role}")
+    
+    async def events():
+        async for event in _task_events(task):
+            yield f"data: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.websocket("/agent/ws")
+async def agent_socket(websocket: WebSocket):
+    """Run tasks over a WebSocket: send TaskRequest JSON, receive delta events then done"""
+    await websocket.accept()
+    try:
+        while True:
+            try:
+                task = TaskRequest(**await websocket.receive_json())
+                if task.agent_role and task.agent_role not in AgentRole.__members__:
+                    raise ValueError(f"Unknown agent role: {task.agent_role}")
+            except (ValueError, TypeError) as e:
+                await websocket.send_json({"type": "error", "error": str(e)})
+                continue
+            # Each send is awaited, so a slow reader throttles generation
+            async for event in _task_events(task):
+                await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+
+@app.get("/agent/stream/metrics")
+async def agent_stream_metrics():
+    """Mean time to first byte and tokens per second per agent role"""
+    return tsi.agents.stream_metrics()
+
+@app.get("/agent/cache")
+async def agent_cache_stats():
+    """Agent response cache hit/miss metrics"""
+    cache = tsi.agents.cache
+    return cache.stats() if cache else {"enabled": False}
+
 @app.get("/credits/supply")
 async def get_credits_supply():
     """Get current SKA Credits supply"""
@@ -76,6 +213,35 @@ async def get_credits_supply():
         "minting_rate": 1.0
     }
 
+@app.get("/credits/balance/{owner}")
+async def get_credits_balance(owner: str):
+    """Get the number of SKA Credits held by an owner"""
+    return {"owner": owner, "balance": tsi.currency.balance(owner)}
+
+@app.post("/credits/transfer")
+async def transfer_credits(transfer: CreditTransfer, user: Dict[str, Any] = Depends(require_user)):
+    """Move an amount of SKA Credits from the caller's account"""
+    require_owner(user, transfer.from_owner)
+    try:
+        ids = await tsi.currency.transfer_amount_async(transfer.from_owner, transfer.to_owner, transfer.amount)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"transferred": len(ids), "credit_ids": ids}
+
+@app.post("/credits/payouts")
+async def payout_credits(payout: CreditPayout, user: Dict[str, Any] = Depends(require_user)):
+    """Pay many recipients from the caller's account in a single transaction"""
+    require_owner(user, payout.from_owner)
+    transfers = [(payout.from_owner, owner, amount) for owner, amount in payout.payouts.items()]
+    try:
+        moved = await tsi.currency.transfer_many_async(transfers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "transferred": sum(len(ids) for ids in moved),
+        "recipients": {owner: len(ids) for (_, owner, _), ids in zip(transfers, moved)}
+    }
+
 @app.get("/assessments")
 async def list_assessments():
     """List all available assessments"""
@@ -92,24 +258,107 @@ async def score_assessment(data: AssessmentAnswers):
     )
     return result
 
+def _solve_portfolio_blocking(clauses, num_variables: int, workers: int, engine: str,
+                              wall_seconds: Optional[float]):
+    """Portfolio race on a private solver; solve_portfolio rewrites its solver's cycles, ledger and stats"""
+    solver = RKLSATSolver(alpha=sat_solver.alpha, ledger_mode="ring")
+    return solver.solve_portfolio(clauses, num_variables,
+                                  configs=portfolio_configs(workers, solver.alpha, engine),
+                                  wall_seconds=wall_seconds)
+
 @app.get("/sat/benchmark")
-async def sat_benchmark(variables: int = 15, clauses: int = 60):
-    """Run SAT solver benchmark"""
+async def sat_benchmark(variables: int = 15, clauses: int = 60, engine: str = "rkl",
+                        workers: int = 1):
+    """Run SAT solver benchmark (workers > 1 races a portfolio of ``engine`` solvers across processes)"""
     from sat_solver import generate_random_3sat
     
+    if engine not in RKLSATSolver.ENGINES:
+        raise HTTPException(status_code=400, detail=f"Unknown engine: {engine}")
+    max_workers = os.cpu_count() or 1
+    if not 1 <= workers <= max_workers:
+        raise HTTPException(status_code=400, detail=f"workers must be between 1 and {max_workers}")
+    
     problem_clauses = generate_random_3sat(variables, clauses)
-    result = sat_solver.solve(problem_clauses, variables)
+    if workers > 1:
+        try:
+            result = await asyncio.to_thread(_solve_portfolio_blocking, problem_clauses, variables,
+                                             workers, engine, sat_jobs.default_budget.wall_seconds)
+        except SolveInterrupted as e:
+            return {"variables": variables, "clauses": clauses, "engine": engine,
+                    "satisfiable": None, "answer": "UNKNOWN", "reason": "time budget exhausted",
+                    "cycles": e.cycles}
+        solution = {
+            "engine": result.engine,
+            "satisfiable": result.satisfiable,
+            "cycles": result.cycles,
+            "time_ms": result.time_ms,
+            "verification_hash": result.verification_hash,
+            "stats": result.stats,
+            "workers": result.workers
+        }
+    else:
+        # Solve in the job queue so a hard instance cannot stall the event loop
+        job = await sat_jobs.wait(sat_jobs.submit(problem_clauses, variables, engine=engine))
+        if job.result is None:
+            return {"variables": variables, "clauses": clauses, "engine": engine,
+                    "satisfiable": None, "answer": job.answer, "reason": job.reason,
+                    "cycles": job.progress.get("cycles", 0)}
+        solution = {key: job.result[key] for key in
+                    ("engine", "satisfiable", "cycles", "time_ms", "verification_hash", "stats",
+                     "workers")}
     
     return {
         "variables": variables,
         "clauses": clauses,
-        "satisfiable": result.satisfiable,
-        "cycles": result.cycles,
-        "time_ms": result.time_ms,
         "complexity": f"O({variables}^1.77)",
-        "verification_hash": result.verification_hash
+        **solution
     }
 
+@app.post("/sat/jobs")
+async def submit_sat_job(request: SATJobRequest):
+    """Queue a SAT solve; returns a job id to poll, stream or cancel"""
+    from sat_solver import generate_random_3sat
+    
+    try:
+        if request.problem is not None:
+            problem_clauses, num_variables = parse_dimacs(request.problem.encode())
+        else:
+            problem_clauses = generate_random_3sat(request.variables, request.clauses, request.seed)
+            num_variables = request.variables
+        budget = SATBudget(request.wall_seconds, request.max_cycles, request.max_memory_mb)
+        job_id = sat_jobs.submit(problem_clauses, num_variables, request.engine, budget)
+    except (DIMACSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"job_id": job_id, "status": sat_jobs.get(job_id).status.value}
+
+@app.get("/sat/jobs/{job_id}")
+async def get_sat_job(job_id: str):
+    """Status, progress and (once done) result of a SAT job"""
+    job = sat_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job.to_dict()
+
+@app.get("/sat/jobs/{job_id}/progress")
+async def stream_sat_job(job_id: str):
+    """Server-sent events with cycles, conflicts and depth until the job finishes"""
+    if sat_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    
+    async def events():
+        async for snapshot in sat_jobs.stream(job_id):
+            yield f"data: {json.dumps(snapshot)}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.delete("/sat/jobs/{job_id}")
+async def cancel_sat_job(job_id: str):
+    """Cancel a queued or running SAT job"""
+    job = sat_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return {"job_id": job_id, "cancelled": sat_jobs.cancel(job_id), "status": job.status.value}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
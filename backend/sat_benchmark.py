@@ -0,0 +1,374 @@
+"""
+SALES KING ACADEMY - SAT SOLVER BENCHMARK HARNESS
+=================================================
+
+Reproducible benchmarks for RKLSATSolver:
+- Seeded random 3-SAT families over variable counts × clause/variable ratios
+- DIMACS instances from a directory (.cnf, .cnf.gz, .cnf.xz)
+- Wall time, cycles, peak RSS and propagation rate per configuration
+- Empirical scaling exponent fit, checked against the O(n^1.77) claim
+- JSON/CSV output and regression checks against a stored baseline
+
+Usage:
+    python sat_benchmark.py --json results.json --baseline baseline.json --tolerance 20
+"""
+
+import argparse
+import csv
+import glob
+import json
+import math
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    from backend.sat_solver import RKLSATSolver, generate_random_3sat, parse_dimacs
+except ImportError:
+    from sat_solver import RKLSATSolver, generate_random_3sat, parse_dimacs
+
+CLAIMED_EXPONENT = 1.77
+DEFAULT_VARIABLES = (10, 15, 20, 25)
+DEFAULT_RATIOS = (3.0, 4.26)
+DEFAULT_ENGINES = ("rkl", "cdcl")
+DEFAULT_TOLERANCE_PCT = 25.0
+MIN_COMPARABLE_MS = 1.0  # Timings below this are too noisy to flag as regressions
+DIMACS_PATTERNS = ("*.cnf", "*.cnf.gz", "*.cnf.xz", "*.dimacs")
+HASH_SEEDED_ENGINES = ("rkl",)  # Engines whose search depends on str hashing
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+def _load_instance(spec: Tuple) -> Tuple[Any, int]:
+    """Build the clauses for ('random', variables, clauses, seed) or ('dimacs', path)"""
+    if spec[0] == "random":
+        _, num_variables, num_clauses, seed = spec
+        return generate_random_3sat(num_variables, num_clauses, seed=seed), num_variables
+    clauses, num_variables = parse_dimacs(spec[1])
+    return clauses, num_variables
+
+def _measure(spec: Tuple, engine: str, alpha: int) -> Dict[str, Any]:
+    """Solve one instance once; runs in a fresh process when isolated"""
+    clauses, num_variables = _load_instance(spec)
+    solver = RKLSATSolver(alpha=alpha, engine=engine, ledger_mode="off")
+    start = time.perf_counter()
+    result = solver.solve(clauses, num_variables)
+    wall_ms = (time.perf_counter() - start) * 1000
+    return {
+        'satisfiable': result.satisfiable,
+        'wall_ms': wall_ms,
+        'cycles': result.cycles,
+        'propagations': result.stats.get('propagations'),
+        'peak_rss_kb': _peak_rss_kb()
+    }
+
+class _Runner:
+    """
+    Runs measurements either in-process or one fresh process per run
+
+    Isolated runs use the spawn start method so peak RSS belongs to that
+    run alone. Every spawned child gets a pinned PYTHONHASHSEED so the RKL
+    quantum score (which hashes variable names) is the same in every run;
+    the parent's hash seed is random, so RKL measurements always run in a
+    spawned child, even when not isolated (then one long-lived child
+    serves all of them).
+    """
+
+    def __init__(self, isolate: bool = True, hash_seed: int = 0):
+        self.isolate = isolate
+        self.hash_seed = hash_seed
+        self.pool = None
+        self._seeded_pool = None
+        self._saved_hash_seed = None
+
+    def __enter__(self):
+        self._saved_hash_seed = os.environ.get("PYTHONHASHSEED")
+        os.environ["PYTHONHASHSEED"] = str(self.hash_seed)
+        if self.isolate:
+            self.pool = multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1)
+        return self
+
+    def __exit__(self, *exc):
+        for pool in (self.pool, self._seeded_pool):
+            if pool is not None:
+                pool.close()
+                pool.join()
+        self.pool = self._seeded_pool = None
+        if self._saved_hash_seed is None:
+            os.environ.pop("PYTHONHASHSEED", None)
+        else:
+            os.environ["PYTHONHASHSEED"] = self._saved_hash_seed
+
+    def measure(self, spec: Tuple, engine: str, alpha: int) -> Dict[str, Any]:
+        pool = self.pool
+        if pool is None and engine in HASH_SEEDED_ENGINES:
+            if self._seeded_pool is None:
+                self._seeded_pool = multiprocessing.get_context("spawn").Pool(1)
+            pool = self._seeded_pool
+        if pool is None:
+            return _measure(spec, engine, alpha)
+        return pool.apply(_measure, (spec, engine, alpha))
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BENCHMARK SUITE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def random_family(variables: Iterable[int] = DEFAULT_VARIABLES,
+                  ratios: Iterable[float] = DEFAULT_RATIOS,
+                  seed: int = 0) -> List[Dict[str, Any]]:
+    """Seeded random 3-SAT instances over a grid of sizes and clause/variable ratios"""
+    instances = []
+    for ratio in ratios:
+        for num_variables in variables:
+            num_clauses = max(1, round(ratio * num_variables))
+            instance_seed = seed * 1000003 + num_variables * 1009 + round(ratio * 100)
+            instances.append({
+                'family': 'random-3sat',
+                'name': f"3sat-n{num_variables}-r{ratio:g}",
+                'ratio': ratio,
+                'seed': instance_seed,
+                'spec': ("random", num_variables, num_clauses, instance_seed)
+            })
+    return instances
+
+def dimacs_family(directory: str) -> List[Dict[str, Any]]:
+    """Every DIMACS file in a directory, in name order"""
+    paths = set()
+    for pattern in DIMACS_PATTERNS:
+        paths.update(glob.glob(os.path.join(directory, pattern)))
+    return [{
+        'family': 'dimacs',
+        'name': os.path.basename(path),
+        'ratio': None,
+        'seed': None,
+        'spec': ("dimacs", path)
+    } for path in sorted(paths)]
+
+def run_benchmarks(instances: List[Dict[str, Any]], engines: Sequence[str] = DEFAULT_ENGINES,
+                   repeats: int = 3, alpha: int = 25, isolate: bool = True,
+                   hash_seed: int = 0, verbose: bool = True) -> List[Dict[str, Any]]:
+    """
+    Run every instance with every engine ``repeats`` times
+
+    Returns:
+        One record per (instance, engine) with median/min wall time,
+        cycles, peak RSS and propagations/cycles per second
+    """
+    for engine in engines:
+        if engine not in RKLSATSolver.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+    if repeats < 1:
+        raise ValueError("repeats must be positive")
+
+    records = []
+    with _Runner(isolate, hash_seed) as runner:
+        for instance in instances:
+            clauses, num_variables = _load_instance(instance['spec'])
+            num_clauses = len(clauses)
+            for engine in engines:
+                runs = [runner.measure(instance['spec'], engine, alpha) for _ in range(repeats)]
+                times = [run['wall_ms'] for run in runs]
+                median_ms = statistics.median(times)
+                seconds = median_ms / 1000
+                cycles = runs[-1]['cycles']
+                propagations = runs[-1]['propagations']
+                rss = [run['peak_rss_kb'] for run in runs if run['peak_rss_kb'] is not None]
+                record = {
+                    'family': instance['family'],
+                    'name': instance['name'],
+                    'engine': engine,
+                    'variables': num_variables,
+                    'clauses': num_clauses,
+                    'ratio': instance['ratio'],
+                    'seed': instance['seed'],
+                    'repeats': repeats,
+                    'satisfiable': runs[-1]['satisfiable'],
+                    'wall_ms_median': median_ms,
+                    'wall_ms_min': min(times),
+                    'wall_ms_runs': times,
+                    'cycles': cycles,
+                    'cycles_per_sec': cycles / seconds if seconds > 0 else None,
+                    'propagations_per_sec': (propagations / seconds
+                                             if propagations is not None and seconds > 0 else None),
+                    'peak_rss_kb': max(rss) if rss else None
+                }
+                records.append(record)
+                if verbose:
+                    print(f"{record['name']:<28} {engine:<5} {median_ms:10.2f} ms  "
+                          f"{cycles:>10} cycles  {'SAT' if record['satisfiable'] else 'UNSAT'}")
+    return records
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCALING ANALYSIS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def fit_scaling_exponent(points: Iterable[Tuple[float, float]]) -> Optional[float]:
+    """
+    Least-squares slope of log(y) against log(n)
+
+    Returns:
+        k such that y ≈ c * n^k, or None with fewer than two usable points
+    """
+    logs = [(math.log(n), math.log(y)) for n, y in points if n > 0 and y > 0]
+    if len({x for x, _ in logs}) < 2:
+        return None
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in logs)
+    variance = sum((x - mean_x) ** 2 for x, _ in logs)
+    return covariance / variance
+
+def scaling_report(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fitted time and cycle exponents per (engine, ratio) random family"""
+    groups: Dict[Tuple[str, float], List[Dict[str, Any]]] = {}
+    for record in records:
+        if record['family'] == 'random-3sat':
+            groups.setdefault((record['engine'], record['ratio']), []).append(record)
+
+    report = []
+    for (engine, ratio), group in sorted(groups.items()):
+        time_exponent = fit_scaling_exponent((r['variables'], r['wall_ms_median']) for r in group)
+        cycles_exponent = fit_scaling_exponent((r['variables'], r['cycles']) for r in group)
+        report.append({
+            'engine': engine,
+            'ratio': ratio,
+            'points': len(group),
+            'time_exponent': time_exponent,
+            'cycles_exponent': cycles_exponent,
+            'claimed_exponent': CLAIMED_EXPONENT,
+            'within_claim': time_exponent is not None and time_exponent <= CLAIMED_EXPONENT
+        })
+    return report
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# OUTPUT AND BASELINES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+CSV_FIELDS = ("family", "name", "engine", "variables", "clauses", "ratio", "seed", "repeats",
+              "satisfiable", "wall_ms_median", "wall_ms_min", "cycles", "cycles_per_sec",
+              "propagations_per_sec", "peak_rss_kb")
+
+def write_json(report: Dict[str, Any], path: str):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def write_csv(records: List[Dict[str, Any]], path: str):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+
+def load_baseline(path: str) -> List[Dict[str, Any]]:
+    """Records from a previous JSON report (or a bare list of records)"""
+    with open(path) as f:
+        data = json.load(f)
+    return data['results'] if isinstance(data, dict) else data
+
+def compare_to_baseline(records: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                        tolerance_pct: float = DEFAULT_TOLERANCE_PCT,
+                        min_ms: float = MIN_COMPARABLE_MS) -> List[Dict[str, Any]]:
+    """
+    Configurations whose median wall time grew by more than tolerance_pct
+
+    Configurations are matched on (family, name, engine); ones missing from
+    the baseline, or faster than min_ms in both runs, are not compared.
+    """
+    previous = {(r['family'], r['name'], r['engine']): r for r in baseline}
+    regressions = []
+    for record in records:
+        old = previous.get((record['family'], record['name'], record['engine']))
+        if old is None:
+            continue
+        before, after = old['wall_ms_median'], record['wall_ms_median']
+        if max(before, after) < min_ms or before <= 0:
+            continue
+        slowdown_pct = (after - before) / before * 100
+        if slowdown_pct > tolerance_pct:
+            regressions.append({
+                'family': record['family'],
+                'name': record['name'],
+                'engine': record['engine'],
+                'baseline_ms': before,
+                'current_ms': after,
+                'slowdown_pct': slowdown_pct
+            })
+    return regressions
+
+def build_report(records: List[Dict[str, Any]],
+                 regressions: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    return {
+        'created': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        'python': sys.version.split()[0],
+        'results': records,
+        'scaling': scaling_report(records),
+        'regressions': regressions or []
+    }
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMMAND LINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="RKL SAT solver benchmark harness")
+    parser.add_argument("--variables", type=int, nargs="*", default=list(DEFAULT_VARIABLES))
+    parser.add_argument("--ratios", type=float, nargs="*", default=list(DEFAULT_RATIOS))
+    parser.add_argument("--engines", nargs="+", default=list(DEFAULT_ENGINES))
+    parser.add_argument("--dimacs-dir", help="Also run every DIMACS file in this directory")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--alpha", type=int, default=25)
+    parser.add_argument("--in-process", action="store_true",
+                        help="Skip per-run subprocesses (peak RSS becomes process-wide; "
+                             "RKL still runs in one hash-seeded subprocess)")
+    parser.add_argument("--json", help="Write the full report as JSON")
+    parser.add_argument("--csv", help="Write per-configuration results as CSV")
+    parser.add_argument("--baseline", help="Baseline JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE_PCT,
+                        help="Allowed median slowdown in percent before failing")
+    args = parser.parse_args(argv)
+
+    instances = random_family(args.variables, args.ratios, args.seed)
+    if args.dimacs_dir:
+        instances += dimacs_family(args.dimacs_dir)
+
+    records = run_benchmarks(instances, args.engines, args.repeats, args.alpha,
+                             isolate=not args.in_process)
+    regressions = []
+    if args.baseline:
+        regressions = compare_to_baseline(records, load_baseline(args.baseline), args.tolerance)
+    report = build_report(records, regressions)
+
+    for row in report['scaling']:
+        exponent = row['time_exponent']
+        shown = f"{exponent:.2f}" if exponent is not None else "n/a"
+        print(f"Scaling {row['engine']} @ ratio {row['ratio']:g}: time ~ n^{shown} "
+              f"(claimed n^{CLAIMED_EXPONENT})")
+
+    if args.json:
+        write_json(report, args.json)
+    if args.csv:
+        write_csv(records, args.csv)
+
+    for regression in regressions:
+        print(f"REGRESSION {regression['name']} [{regression['engine']}]: "
+              f"{regression['baseline_ms']:.2f} ms -> {regression['current_ms']:.2f} ms "
+              f"(+{regression['slowdown_pct']:.1f}%)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""
+SALES KING ACADEMY - SAT JOB QUEUE
+==================================
+
+Runs RKLSATSolver instances off the event loop:
+- One worker process per job, at most ``max_workers`` at a time
+- Progress (cycles, conflicts, depth) streamed back while the search runs
+- Cancellation, plus wall-clock, cycle and memory budgets per job
+- A job that exhausts its budget finishes as UNKNOWN instead of running forever
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    from backend.sat_solver import RKLSATSolver, Clause, SolveInterrupted
+except ImportError:
+    from sat_solver import RKLSATSolver, Clause, SolveInterrupted
+
+JOB_POLL_INTERVAL = 0.05  # Seconds between checks of a worker's pipe
+JOB_PROGRESS_INTERVAL = 0.25  # Seconds between progress reports from a worker
+JOB_CHECK_INTERVAL = 64  # Cycles/conflicts between budget checks inside the search
+JOB_KILL_GRACE = 2.0  # Seconds a worker gets to stop on its own before it is terminated
+MAX_FINISHED_JOBS = 1000  # Finished jobs kept for polling before the oldest are dropped
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+FINISHED = (JobStatus.DONE, JobStatus.CANCELLED, JobStatus.FAILED)
+
+@dataclass
+class SATBudget:
+    """Per-job limits; None means unlimited"""
+    wall_seconds: Optional[float] = None
+    max_cycles: Optional[int] = None
+    max_memory_mb: Optional[float] = None
+
+@dataclass
+class SATJob:
+    """One submitted solve and everything known about it so far"""
+    job_id: str
+    num_variables: int
+    num_clauses: int
+    engine: str
+    budget: SATBudget
+    preprocess: bool = False
+    status: JobStatus = JobStatus.QUEUED
+    answer: Optional[str] = None  # SAT, UNSAT or UNKNOWN once done
+    reason: Optional[str] = None  # Exhausted budget, cancellation or error
+    result: Optional[Dict[str, Any]] = None
+    progress: Dict[str, Any] = field(default_factory=dict)
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'status': self.status.value,
+            'answer': self.answer,
+            'reason': self.reason,
+            'engine': self.engine,
+            'preprocess': self.preprocess,
+            'variables': self.num_variables,
+            'clauses': self.num_clauses,
+            'budget': asdict(self.budget),
+            'progress': dict(self.progress),
+            'result': self.result,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished
+        }
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WORKER PROCESS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _rss_mb() -> Optional[float]:
+    """Resident set size of this process in MiB"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1 << 20)
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Peak, not current
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+def _job_worker(conn, cancel, clauses: List[List[int]], num_variables: int, engine: str,
+                budget: SATBudget, progress_interval: float, preprocess: bool = False):
+    """
+    Solve in a child process, reporting over ``conn``
+
+    Messages: ("progress", counters), then one of ("result", SATResult dict),
+    ("unknown", reason, counters) or ("error", message).
+    """
+    solver = RKLSATSolver(engine=engine, ledger_mode="off", preprocess=preprocess)
+    solver.interrupt_interval = JOB_CHECK_INTERVAL
+    started = time.monotonic()
+    state = {'reported': started, 'reason': None}
+
+    def interrupt() -> bool:
+        now = time.monotonic()
+        counters = solver.progress()
+        if now - state['reported'] >= progress_interval:
+            counters['elapsed'] = now - started
+            conn.send(("progress", counters))
+            state['reported'] = now
+        if cancel.is_set():
+            state['reason'] = "cancelled"
+        elif budget.wall_seconds is not None and now - started > budget.wall_seconds:
+            state['reason'] = "time budget exhausted"
+        elif budget.max_cycles is not None and counters['cycles'] >= budget.max_cycles:
+            state['reason'] = "cycle budget exhausted"
+        elif budget.max_memory_mb is not None and (_rss_mb() or 0) > budget.max_memory_mb:
+            state['reason'] = "memory budget exhausted"
+        return state['reason'] is not None
+
+    solver.interrupt = interrupt
+    try:
+        result = solver.solve([Clause(literals) for literals in clauses], num_variables)
+        conn.send(("result", asdict(result)))
+    except SolveInterrupted:
+        conn.send(("unknown", state['reason'], solver.progress()))
+    except MemoryError:
+        conn.send(("unknown", "memory budget exhausted", solver.progress()))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# JOB QUEUE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class SATJobQueue:
+    """
+    Asynchronous SAT job queue
+
+    Submit from a running event loop; each job is supervised by an asyncio
+    task that only polls its worker's pipe, so the loop never blocks on a
+    solve. Workers that ignore cancellation or overrun their wall-clock
+    budget by more than JOB_KILL_GRACE are terminated.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 default_budget: Optional[SATBudget] = None,
+                 max_finished: int = MAX_FINISHED_JOBS):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.default_budget = default_budget or SATBudget()
+        self.max_finished = max_finished
+        self.jobs: "OrderedDict[str, SATJob]" = OrderedDict()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._cancels: Dict[str, Any] = {}
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Spawn, not fork: the API process already runs writer threads and
+        # holds SQLite connections that a forked child would inherit mid-use
+        self._context = multiprocessing.get_context("spawn")
+
+    def submit(self, clauses: List[Clause], num_variables: int, engine: str = "cdcl",
+               budget: Optional[SATBudget] = None, preprocess: bool = False) -> str:
+        """Queue a solve and return its job id"""
+        if engine not in RKLSATSolver.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        raw = [list(clause.literals) for clause in clauses]
+        job = SATJob(job_id=uuid.uuid4().hex, num_variables=num_variables,
+                     num_clauses=len(raw), engine=engine, budget=budget or self.default_budget,
+                     preprocess=preprocess)
+        self.jobs[job.job_id] = job
+        self._cancels[job.job_id] = self._context.Event()
+        self._changed[job.job_id] = asyncio.Event()
+        self._tasks[job.job_id] = asyncio.get_running_loop().create_task(self._run(job, raw))
+        return job.job_id
+
+    def get(self, job_id: str) -> Optional[SATJob]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation; returns False if the job is unknown or already finished"""
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED:
+            return False
+        self._cancels[job_id].set()
+        return True
+
+    async def wait(self, job_id: str) -> SATJob:
+        """Wait for a job to finish (the job is returned even if evicted meanwhile)"""
+        job = self.jobs[job_id]
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return job
+
+    async def stream(self, job_id: str, heartbeat: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+        """Job snapshots on every progress update, ending with the finished job"""
+        job = self.jobs[job_id]
+        while True:
+            changed = self._changed.get(job_id)
+            yield job.to_dict()
+            if job.status in FINISHED or changed is None:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                pass
+
+    def _notify(self, job: SATJob):
+        event = self._changed.get(job.job_id)
+        if event is not None:
+            event.set()
+            self._changed[job.job_id] = asyncio.Event()
+
+    def _finish(self, job: SATJob, status: JobStatus, answer: Optional[str] = None,
+                reason: Optional[str] = None):
+        job.status = status
+        job.answer = answer
+        job.reason = reason
+        job.finished = time.time()
+        self._notify(job)
+        self._changed.pop(job.job_id, None)
+        self._cancels.pop(job.job_id, None)
+        self._tasks.pop(job.job_id, None)
+        self._evict()
+
+    def _evict(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+
+    async def _run(self, job: SATJob, clauses: List[List[int]]):
+        cancel = self._cancels[job.job_id]
+        async with self._slots:
+            if cancel.is_set():
+                self._finish(job, JobStatus.CANCELLED, reason="cancelled")
+                return
+
+            receiver, sender = self._context.Pipe(duplex=False)
+            process = self._context.Process(
+                target=_job_worker,
+                args=(sender, cancel, clauses, job.num_variables, job.engine, job.budget,
+                      JOB_PROGRESS_INTERVAL, job.preprocess),
+                daemon=True
+            )
+            process.start()
+            sender.close()
+            job.status = JobStatus.RUNNING
+            job.started = time.time()
+            self._notify(job)
+
+            started = time.monotonic()
+            cancel_at: Optional[float] = None
+            outcome = None
+            try:
+                while outcome is None:
+                    while receiver.poll():
+                        try:
+                            message = receiver.recv()
+                        except EOFError:
+                            outcome = ("error", "worker exited without a result")
+                            break
+                        if message[0] == "progress":
+                            job.progress = message[1]
+                            self._notify(job)
+                        else:
+                            outcome = message
+                            break
+                    if outcome is not None:
+                        break
+
+                    now = time.monotonic()
+                    if cancel.is_set() and cancel_at is None:
+                        cancel_at = now
+                    overdue = (job.budget.wall_seconds is not None
+                               and now - started > job.budget.wall_seconds + JOB_KILL_GRACE)
+                    if overdue or (cancel_at is not None and now - cancel_at > JOB_KILL_GRACE):
+                        process.terminate()
+                        reason = "cancelled" if cancel_at is not None else "time budget exhausted"
+                        outcome = ("unknown", reason, job.progress)
+                    elif not process.is_alive() and not receiver.poll():
+                        outcome = ("error", f"worker exited with code {process.exitcode}")
+                    else:
+                        await asyncio.sleep(JOB_POLL_INTERVAL)
+            finally:
+                receiver.close()
+                await asyncio.get_running_loop().run_in_executor(None, process.join, JOB_KILL_GRACE)
+                if process.is_alive():
+                    process.kill()
+
+        kind = outcome[0]
+        if kind == "result":
+            job.result = outcome[1]
+            job.progress = dict(job.progress, cycles=job.result['cycles'])
+            self._finish(job, JobStatus.DONE, "SAT" if job.result['satisfiable'] else "UNSAT")
+        elif kind == "unknown":
+            job.progress = dict(job.progress, **(outcome[2] or {}))
+            if outcome[1] == "cancelled":
+                self._finish(job, JobStatus.CANCELLED, reason="cancelled")
+            else:
+                self._finish(job, JobStatus.DONE, "UNKNOWN", outcome[1])
+        else:
+            self._finish(job, JobStatus.FAILED, reason=outcome[1])
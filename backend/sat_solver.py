@@ -9,11 +9,26 @@ Twin-ledger verification for 100% mathematical correctness
 Author: Robert Kaleb Long
 """
 
+import gzip
 import hashlib
+import io
+import lzma
+import mmap
+import multiprocessing
+import os
 import time
 import math
-from typing import List, Set, Dict, Tuple, Optional
-from dataclasses import dataclass
+import random
+import tracemalloc
+import warnings
+import zlib
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from multiprocessing import shared_memory
+from typing import (List, Set, Dict, Tuple, Optional, Iterable, Union, BinaryIO, AsyncIterable,
+                    Any, Callable)
+from dataclasses import dataclass, field, asdict
 
 @dataclass
 class Clause:
@@ -22,24 +37,151 @@ class Clause:
     
     def evaluate(self, assignment: Dict[int, bool]) -> Optional[bool]:
         """Evaluate clause with given variable assignment"""
+        undetermined = False
         for lit in self.literals:
-            var = abs(lit)
-            if var not in assignment:
-                continue
-            
-            value = assignment[var]
-            if lit < 0:
-                value = not value
-            
-            if value:
+            value = assignment.get(lit if lit > 0 else -lit)
+            if value is None:
+                undetermined = True
+            elif value == (lit > 0):
                 return True  # Clause satisfied
         
-        # Check if clause can still be satisfied
-        unassigned = [lit for lit in self.literals if abs(lit) not in assignment]
-        if unassigned:
-            return None  # Still undetermined
+        # Unassigned literals mean the clause can still be satisfied
+        return None if undetermined else False
+
+def dense_assignment(assignment: Dict[int, bool], num_variables: int) -> array:
+    """Convert a variable -> bool dict into a dense array (1 true, 0 false, -1 unassigned)"""
+    values = array('b', [-1]) * (num_variables + 1)
+    for var, value in assignment.items():
+        values[var] = 1 if value else 0
+    return values
+
+class ClauseDatabase:
+    """
+    Packed clause store
+    
+    Every literal lives in one flat ``array('i')``; clause i occupies
+    ``literals[offsets[i]:offsets[i] + lengths[i]]``. A length of 0 marks a
+    deleted slot, reclaimed by ``compact``. Indexing returns a ``Clause`` so
+    code written against ``List[Clause]`` keeps working.
+    """
+    
+    def __init__(self):
+        self.literals = array('i')
+        self.offsets = array('q')
+        self.lengths = array('i')
+        self.wasted = 0  # Literal slots held by deleted clauses
+    
+    @classmethod
+    def from_clauses(cls, clauses: Iterable[Clause]) -> "ClauseDatabase":
+        db = cls()
+        for clause in clauses:
+            db.add(clause.literals)
+        return db
+    
+    def add(self, literals: Iterable[int]) -> int:
+        """Append a clause and return its index"""
+        offset = len(self.literals)
+        self.literals.extend(literals)
+        self.offsets.append(offset)
+        self.lengths.append(len(self.literals) - offset)
+        return len(self.offsets) - 1
+    
+    def delete(self, index: int):
+        self.wasted += self.lengths[index]
+        self.lengths[index] = 0
+    
+    def is_deleted(self, index: int) -> bool:
+        return self.lengths[index] == 0
+    
+    def get(self, index: int) -> List[int]:
+        """Literals of clause index as a list"""
+        offset = self.offsets[index]
+        return self.literals[offset:offset + self.lengths[index]].tolist()
+    
+    def __len__(self) -> int:
+        return len(self.offsets)
+    
+    def __getitem__(self, index: int) -> Clause:
+        return Clause(self.get(index))
+    
+    def __iter__(self):
+        for index in range(len(self.offsets)):
+            if self.lengths[index]:
+                yield self[index]
+    
+    def to_clauses(self) -> List[Clause]:
+        return list(self)
+    
+    def evaluate(self, index: int, values: array) -> Optional[bool]:
+        """Evaluate clause index against a dense assignment (see dense_assignment)"""
+        offset = self.offsets[index]
+        undetermined = False
+        for lit in self.literals[offset:offset + self.lengths[index]]:
+            value = values[lit if lit > 0 else -lit]
+            if value < 0:
+                undetermined = True
+            elif (value == 1) == (lit > 0):
+                return True
+        return None if undetermined else False
+    
+    def evaluate_all(self, values: array) -> Tuple[int, int, int]:
+        """
+        Walk every live clause once against a dense assignment
+        
+        Returns:
+            (satisfied, falsified, undetermined) clause counts
+        """
+        # Literal truth table: index v holds the value of v, index -v (from
+        # the end) the value of NOT v; 1 true, 0 unassigned, -1 false
+        n = len(values) - 1
+        table = [0] * (2 * n + 1)
+        for var in range(1, n + 1):
+            value = values[var]
+            if value >= 0:
+                table[var] = 1 if value else -1
+                table[-var] = -table[var]
+        truth = list(map(table.__getitem__, self.literals))
         
-        return False  # Clause unsatisfied
+        # A clause's status is the max over its literals
+        widths = set(self.lengths)
+        if len(widths) == 1 and not self.wasted:
+            # Uniform width (e.g. random k-SAT): strided columns, no per-clause slicing
+            width = widths.pop()
+            status = list(map(max, *[truth[k::width] for k in range(width)]))
+        else:
+            ends = [offset + size for offset, size in zip(self.offsets, self.lengths) if size]
+            starts = [offset for offset, size in zip(self.offsets, self.lengths) if size]
+            status = list(map(max, map(truth.__getitem__, map(slice, starts, ends))))
+        return status.count(1), status.count(-1), status.count(0)
+    
+    def compact(self) -> Dict[int, int]:
+        """
+        Drop deleted clauses and rewrite the buffers
+        
+        Returns:
+            Mapping from old clause index to new clause index
+        """
+        literals, offsets, lengths = self.literals, self.offsets, self.lengths
+        new_literals = array('i')
+        new_offsets = array('q')
+        new_lengths = array('i')
+        remap = {}
+        for index in range(len(offsets)):
+            size = lengths[index]
+            if not size:
+                continue
+            remap[index] = len(new_offsets)
+            new_offsets.append(len(new_literals))
+            new_lengths.append(size)
+            offset = offsets[index]
+            new_literals.extend(literals[offset:offset + size])
+        self.literals, self.offsets, self.lengths = new_literals, new_offsets, new_lengths
+        self.wasted = 0
+        return remap
+    
+    def nbytes(self) -> int:
+        """Bytes held by the packed buffers"""
+        return sum(buf.itemsize * len(buf) for buf in (self.literals, self.offsets, self.lengths))
 
 @dataclass
 class SATResult:
@@ -49,6 +191,96 @@ class SATResult:
     cycles: int
     time_ms: float
     verification_hash: str
+    engine: str = "rkl"
+    stats: Dict[str, int] = field(default_factory=dict)
+    workers: List[Dict[str, Any]] = field(default_factory=list)  # Portfolio per-worker reports
+    preprocessing: List[Dict[str, Any]] = field(default_factory=list)  # Per-pass reports
+    core: Optional[List[int]] = None  # Failed assumptions behind an UNSAT answer (incremental)
+
+class SolveInterrupted(Exception):
+    """Raised from inside a search when its interrupt hook fires"""
+    
+    def __init__(self, cycles: int):
+        super().__init__(f"Search interrupted after {cycles} cycles")
+        self.cycles = cycles
+
+INTERRUPT_CHECK_INTERVAL = 1024  # Cycles/conflicts between interrupt hook calls
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TWIN LEDGER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_MASK64 = (1 << 64) - 1
+
+def assignment_key(var: int, value: bool) -> int:
+    """
+    64-bit key for one variable assignment (SplitMix64 of 2*var + value)
+    
+    The shadow hash of an assignment is the XOR of its keys, so setting or
+    clearing a single variable updates it in O(1).
+    """
+    x = (2 * var + (1 if value else 0) + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+def assignment_hash(assignment: Dict[int, bool]) -> int:
+    """Shadow hash of a whole assignment (XOR of assignment_key values)"""
+    h = 0
+    for var, value in assignment.items():
+        h ^= assignment_key(var, value)
+    return h
+
+class TwinLedger:
+    """
+    Twin-ledger recorder with bounded storage
+    
+    Modes:
+    - off: count entries only
+    - sampled: keep every ``sample_every``-th entry
+    - ring: keep the last ``capacity`` entries
+    - full: keep every entry
+    
+    ``recorded`` always counts every entry offered, so it is the same in
+    every mode and safe to feed into the verification hash.
+    """
+    
+    MODES = ("off", "sampled", "ring", "full")
+    
+    def __init__(self, mode: str = "full", sample_every: int = 1000, capacity: int = 1024):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown ledger mode: {mode}")
+        if sample_every < 1 or capacity < 1:
+            raise ValueError("sample_every and capacity must be positive")
+        self.mode = mode
+        self.sample_every = sample_every
+        self.capacity = capacity
+        self.reset()
+    
+    def reset(self):
+        self.recorded = 0
+        if self.mode == "ring":
+            self.primary = deque(maxlen=self.capacity)
+            self.shadow = deque(maxlen=self.capacity)
+        else:
+            self.primary = []
+            self.shadow = []
+    
+    def record(self, cycle: int, assignment: Dict[int, bool], state_hash: int):
+        """Record one search node; state_hash is the incremental assignment_hash"""
+        self.recorded += 1
+        mode = self.mode
+        if mode == "off" or (mode == "sampled" and self.recorded % self.sample_every):
+            return
+        self.primary.append({
+            'cycle': cycle,
+            'assignment': assignment.copy(),
+            'timestamp': time.time()
+        })
+        self.shadow.append({
+            'cycle': cycle,
+            'hash': f"{state_hash:016x}"
+        })
 
 class RKLSATSolver:
     """
@@ -61,33 +293,101 @@ class RKLSATSolver:
     - O(n^1.77) polynomial complexity
     """
     
-    def __init__(self, alpha: int = 25):
+    ENGINES = ("rkl", "cdcl")
+    
+    def __init__(self, alpha: int = 25, engine: str = "rkl", ledger_mode: str = "full",
+                 ledger_sample_every: int = 1000, ledger_capacity: int = 1024,
+                 cdcl_options: Optional[Dict[str, Any]] = None, preprocess: bool = False):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
         self.alpha = alpha
+        self.engine = engine
+        self.preprocess = preprocess
         self.cycles = 0
-        self.ledger_primary = []
-        self.ledger_shadow = []
+        self.ledger = TwinLedger(ledger_mode, ledger_sample_every, ledger_capacity)
+        self.stats = {}
+        self.last_engine: Optional["CDCLEngine"] = None
+        self.cdcl_options = dict(cdcl_options or {})  # Extra CDCLEngine keyword arguments
+        self.interrupt: Optional[Callable[[], bool]] = None  # Returns True to abort the search
+        self.interrupt_interval = INTERRUPT_CHECK_INTERVAL
+        self.depth = 0  # Current rkl recursion depth, see progress()
+        self._running: Optional[str] = None
+        self.exchange: Optional["ClauseExchange"] = None  # Learned-clause sharing (CDCL only)
+        self._scores: Optional["_RKLScoreIndex"] = None  # Branching index for the rkl engine
+    
+    @property
+    def ledger_primary(self):
+        return self.ledger.primary
     
-    def solve(self, clauses: List[Clause], num_variables: int) -> SATResult:
+    @property
+    def ledger_shadow(self):
+        return self.ledger.shadow
+    
+    def solve(self, clauses: Union[List[Clause], "ClauseDatabase"], num_variables: int,
+              engine: Optional[str] = None, preprocess: Optional[bool] = None,
+              proof: Optional[Union[str, os.PathLike, BinaryIO]] = None,
+              proof_binary: bool = True) -> SATResult:
         """
         Solve SAT problem
         
         Args:
-            clauses: List of Boolean clauses
+            clauses: List of Boolean clauses or a packed ClauseDatabase
             num_variables: Number of variables
+            engine: "rkl" (recursive search) or "cdcl" (clause learning);
+                defaults to the engine the solver was created with
+            preprocess: Simplify the formula with SATPreprocessor before
+                searching; defaults to the solver's setting
+            proof: Path or binary file receiving a DRAT proof (cdcl only,
+                without preprocessing); check it with check_drat
+            proof_binary: Binary DRAT encoding rather than text
         
         Returns:
             SATResult with solution or UNSAT proof
         """
+        engine = engine or self.engine
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if preprocess is None:
+            preprocess = self.preprocess
+        if proof is not None and (engine != "cdcl" or preprocess):
+            raise ValueError("DRAT proofs need the cdcl engine without preprocessing")
+        
         start_time = time.time()
         self.cycles = 0
-        self.ledger_primary = []
-        self.ledger_shadow = []
+        self.ledger.reset()
+        self.stats = {}
         
-        # Initialize assignment
-        assignment = {}
+        self.depth = 0
+        self._running = engine
+        if isinstance(clauses, ClauseDatabase) and (engine == "rkl" or preprocess):
+            clauses = clauses.to_clauses()
+        search_clauses = clauses
+        simplified = None
+        if preprocess:
+            simplified = SATPreprocessor().run(clauses, num_variables)
+            search_clauses = simplified.clauses
         
-        # Apply RKL Framework
-        satisfiable, final_assignment = self._rkl_search(clauses, assignment, num_variables)
+        if simplified is not None and simplified.unsatisfiable:
+            satisfiable, final_assignment = False, None
+        elif engine == "cdcl":
+            writer = DRATWriter(proof, binary=proof_binary) if proof is not None else None
+            try:
+                satisfiable, final_assignment = self._cdcl_search(search_clauses, num_variables,
+                                                                  writer)
+            finally:
+                if writer is not None:
+                    writer.close()
+        else:
+            self._scores = _RKLScoreIndex(search_clauses, num_variables, self.alpha)
+            # Apply RKL Framework
+            try:
+                satisfiable, final_assignment = self._rkl_search(search_clauses, {}, num_variables)
+            finally:
+                self._scores = None
+        
+        if satisfiable and simplified is not None:
+            # Put back eliminated and fixed variables
+            final_assignment = simplified.extend(final_assignment)
         
         # Calculate metrics
         time_ms = (time.time() - start_time) * 1000
@@ -102,11 +402,137 @@ class RKLSATSolver:
             assignment=final_assignment if satisfiable else None,
             cycles=self.cycles,
             time_ms=time_ms,
-            verification_hash=verification_hash
+            verification_hash=verification_hash,
+            engine=engine,
+            stats=dict(self.stats),
+            preprocessing=simplified.passes if simplified is not None else []
         )
     
+    def progress(self) -> Dict[str, int]:
+        """
+        Live counters of the running search, safe to call from the interrupt hook
+        
+        depth is the recursion depth for rkl and the decision level for cdcl.
+        """
+        engine = self.last_engine
+        if self._running == "cdcl" and engine is not None:
+            return {
+                'cycles': engine.decisions,
+                'conflicts': engine.conflicts,
+                'propagations': engine.propagations,
+                'depth': len(engine.trail_lim)
+            }
+        return {'cycles': self.cycles, 'conflicts': 0, 'propagations': 0, 'depth': self.depth}
+    
+    def solve_portfolio(self, clauses: Union[List[Clause], "ClauseDatabase"], num_variables: int,
+                        workers: Optional[int] = None,
+                        configs: Optional[List["PortfolioConfig"]] = None,
+                        share_clauses: bool = True,
+                        share_max_length: Optional[int] = None,
+                        mp_context: Optional[Any] = None,
+                        wall_seconds: Optional[float] = None) -> SATResult:
+        """
+        Race diversified solvers in a process pool; the first answer wins
+        
+        Args:
+            clauses: List of Boolean clauses or a packed ClauseDatabase
+            num_variables: Number of variables
+            workers: Number of worker processes (default: CPU count)
+            configs: Explicit per-worker settings (overrides workers)
+            share_clauses: Exchange learned clauses through shared memory
+            share_max_length: Longest learned clause that is shared
+            mp_context: multiprocessing context for the workers (default:
+                spawn, so callers running threads or holding open SQLite
+                connections are never forked)
+            wall_seconds: Deadline for the whole race (None: no deadline)
+        
+        Returns:
+            The winning worker's SATResult; ``workers`` holds one report
+            per worker (settings, cycles, time, whether it was interrupted)
+        
+        Raises:
+            SolveInterrupted: No worker answered within ``wall_seconds``;
+                the answer is unknown
+        """
+        if configs is None:
+            configs = portfolio_configs(workers or os.cpu_count() or 1, self.alpha)
+        for config in configs:
+            if config.engine not in self.ENGINES:
+                raise ValueError(f"Unknown engine: {config.engine}")
+        share_max_length = share_max_length or SHARE_MAX_LENGTH
+        
+        if isinstance(clauses, ClauseDatabase):
+            raw = [clauses.get(i) for i in range(len(clauses)) if not clauses.is_deleted(i)]
+        else:
+            raw = [list(clause.literals) for clause in clauses]
+        
+        start_time = time.time()
+        self.cycles = 0
+        self.ledger.reset()
+        self.stats = {}
+        
+        context = mp_context or multiprocessing.get_context("spawn")
+        stop = context.Event()
+        share = None
+        if share_clauses:
+            share = shared_memory.SharedMemory(
+                create=True, size=ClauseExchange.buffer_size(len(configs), share_max_length)
+            )
+        share_name = share.name if share is not None else None
+        
+        reports: List[Dict[str, Any]] = [{} for _ in configs]
+        winner: Optional[SATResult] = None
+        winner_index = -1
+        try:
+            with ProcessPoolExecutor(max_workers=len(configs), mp_context=context,
+                                     initializer=_portfolio_init, initargs=(stop,)) as pool:
+                try:
+                    futures = {
+                        pool.submit(_portfolio_worker, index, config, raw, num_variables,
+                                    share_name, len(configs), share_max_length): index
+                        for index, config in enumerate(configs)
+                    }
+                    for future in as_completed(futures, timeout=wall_seconds):
+                        index = futures[future]
+                        report, result = future.result()
+                        reports[index] = report
+                        if winner is None and result is not None:
+                            winner, winner_index = result, index
+                            stop.set()  # Losers notice at their next interrupt check
+                except FuturesTimeout:
+                    pass  # Deadline passed without an answer; the stop below ends the race
+                finally:
+                    stop.set()
+        finally:
+            if share is not None:
+                share.close()
+                share.unlink()
+        
+        if winner is None:
+            # Every worker has stopped by now; keep their reports for the caller
+            for future, index in futures.items():
+                if not reports[index] and future.exception() is None:
+                    reports[index] = future.result()[0]
+            self.cycles = max((report.get('cycles', 0) for report in reports), default=0)
+            self.stats = {'portfolio_workers': len(configs), 'portfolio_timeout': 1}
+            raise SolveInterrupted(self.cycles)
+        
+        for index, report in enumerate(reports):
+            report['winner'] = index == winner_index
+        
+        self.cycles = winner.cycles
+        final = winner.assignment or {}
+        self.ledger.record(self.cycles, final, assignment_hash(final))
+        
+        winner.time_ms = (time.time() - start_time) * 1000
+        winner.stats['portfolio_workers'] = len(configs)
+        winner.stats['portfolio_winner'] = winner_index
+        winner.workers = reports
+        self.stats = dict(winner.stats)
+        return winner
+    
     def _rkl_search(self, clauses: List[Clause], assignment: Dict[int, bool], 
-                    num_variables: int) -> Tuple[bool, Optional[Dict[int, bool]]]:
+                    num_variables: int, state_hash: int = 0) -> Tuple[bool, Optional[Dict[int, bool]]]:
         """
         RKL-optimized search with O(n^1.77) complexity
         
@@ -114,19 +540,18 @@ class RKLSATSolver:
         - Quantum-Classical Balance (α=25)
         - Manifold decomposition
         - Predictive compression
+        
+        state_hash is the shadow hash of ``assignment``, extended by one
+        assignment_key per branch instead of being recomputed.
         """
         self.cycles += 1
+        self.depth = len(assignment)
+        if (self.interrupt is not None and not self.cycles % self.interrupt_interval
+                and self.interrupt()):
+            raise SolveInterrupted(self.cycles)
         
         # Log to twin ledgers
-        self.ledger_primary.append({
-            'cycle': self.cycles,
-            'assignment': assignment.copy(),
-            'timestamp': time.time()
-        })
-        self.ledger_shadow.append({
-            'cycle': self.cycles,
-            'hash': hashlib.sha256(str(assignment).encode()).hexdigest()
-        })
+        self.ledger.record(self.cycles, assignment, state_hash)
         
         # Check if all clauses satisfied
         all_satisfied = True
@@ -141,12 +566,12 @@ class RKLSATSolver:
             return True, assignment  # SAT!
         
         # Select next variable using RKL heuristics
-        unassigned = [v for v in range(1, num_variables + 1) if v not in assignment]
-        if not unassigned:
-            return False, None
+        scores = self._scores
+        if not scores:
+            return False, None  # Every variable assigned
         
         # Quantum-Classical Balance for variable selection
-        var = self._select_variable_rkl(clauses, assignment, unassigned)
+        var = self._select_variable_rkl()
         
         # Try both values (True first based on α=25 weighting)
         for value in [True, False]:
@@ -158,41 +583,61 @@ class RKLSATSolver:
             
             # Recursive search
             if self._is_consistent(simplified_clauses, new_assignment):
+                scores.assign(var, value)
                 satisfiable, result_assignment = self._rkl_search(
-                    simplified_clauses, new_assignment, num_variables
+                    simplified_clauses, new_assignment, num_variables,
+                    state_hash ^ assignment_key(var, value)
                 )
                 if satisfiable:
                     return True, result_assignment
+                scores.unassign(var, value)
         
         return False, None
     
-    def _select_variable_rkl(self, clauses: List[Clause], assignment: Dict[int, bool],
-                            unassigned: List[int]) -> int:
+    def _cdcl_search(self, clauses: Union[List[Clause], "ClauseDatabase"], num_variables: int,
+                     proof: Optional["DRATWriter"] = None) -> Tuple[bool, Optional[Dict[int, bool]]]:
+        """
+        Conflict-driven clause learning search
+        
+        Every decision counts as one RKL cycle. The twin ledger receives a
+        single summary entry for the final state instead of one per node.
+        The engine is kept on ``last_engine`` so learned clauses can be dumped.
+        """
+        engine = CDCLEngine(num_variables, alpha=self.alpha, interrupt=self.interrupt,
+                            exchange=self.exchange, proof=proof, **self.cdcl_options)
+        engine.interrupt_interval = self.interrupt_interval
+        self.last_engine = engine
+        if isinstance(clauses, ClauseDatabase):
+            for index in range(len(clauses)):
+                if not clauses.is_deleted(index):
+                    engine.add_clause(clauses.get(index))
+        else:
+            for clause in clauses:
+                engine.add_clause(clause.literals)
+        
+        satisfiable = engine.solve()
+        assignment = engine.model() if satisfiable else None
+        
+        self.cycles = engine.decisions
+        self.stats = engine.get_stats()
+        
+        final = assignment or {}
+        self.ledger.record(self.cycles, final, assignment_hash(final))
+        
+        return satisfiable, assignment
+    
+    def _select_variable_rkl(self) -> int:
         """
         Select next variable using RKL Framework heuristics
         
         Uses quantum-classical balance (α=25) to weight:
         - Clause frequency (classical)
         - Manifold position (quantum)
-        """
-        scores = {}
-        
-        for var in unassigned:
-            # Classical component: frequency in unsatisfied clauses
-            classical_score = 0
-            for clause in clauses:
-                if clause.evaluate(assignment) is None:  # Unresolved
-                    if var in [abs(lit) for lit in clause.literals]:
-                        classical_score += 1
-            
-            # Quantum component: manifold position
-            quantum_score = abs(hash(str(var)) % 100)
-            
-            # RKL balance: α=25 means 25% quantum, 75% classical
-            scores[var] = (quantum_score * self.alpha + classical_score * (100 - self.alpha)) / 100
         
-        # Select variable with highest score
-        return max(scores.keys(), key=lambda v: scores[v])
+        Scores are kept current by _RKLScoreIndex as the search assigns and
+        unassigns variables, so this is a heap lookup.
+        """
+        return self._scores.best()
     
     def _simplify_clauses(self, clauses: List[Clause], assignment: Dict[int, bool]) -> List[Clause]:
         """Apply unit propagation and simplification"""
@@ -203,7 +648,7 @@ class RKLSATSolver:
             if result is True:
                 continue  # Clause satisfied, remove it
             elif result is False:
-                return []  # Contradiction detected
+                return [Clause([])]  # Contradiction: keep an empty clause so the branch fails
             else:
                 # Keep unresolved literals
                 new_literals = [
@@ -225,38 +670,2060 @@ class RKLSATSolver:
     
     def _generate_verification_hash(self, clauses: List[Clause], 
                                     assignment: Optional[Dict[int, bool]]) -> str:
-        """Generate SHA-256 verification hash for twin-ledger"""
+        """
+        Generate SHA-256 verification hash for twin-ledger
+        
+        Uses the number of entries offered to each ledger rather than the
+        number retained, so the hash does not depend on the ledger mode.
+        """
         data = {
             'clauses': [[lit for lit in clause.literals] for clause in clauses],
             'assignment': assignment,
             'cycles': self.cycles,
-            'primary_ledger': len(self.ledger_primary),
-            'shadow_ledger': len(self.ledger_shadow)
+            'primary_ledger': self.ledger.recorded,
+            'shadow_ledger': self.ledger.recorded
         }
         
         return hashlib.sha256(str(data).encode()).hexdigest()
     
-    def verify_solution(self, clauses: List[Clause], assignment: Dict[int, bool]) -> bool:
-        """Verify that assignment satisfies all clauses"""
+    def verify_solution(self, clauses: Union[List[Clause], "ClauseDatabase"],
+                        assignment: Dict[int, bool]) -> bool:
+        """Verify that assignment satisfies all clauses (see check_model)"""
+        return check_model(clauses, assignment)
+
+def _quantum_score(var: int) -> int:
+    """Quantum (manifold position) component of the RKL variable score"""
+    return abs(hash(str(var)) % 100)
+
+class _RKLScoreIndex:
+    """
+    Incremental RKL variable scores for the recursive search
+    
+    The classical term of a variable is the number of unsatisfied clauses
+    containing it. Occurrence lists plus a per-clause count of true literals
+    mean it only changes when a clause flips between satisfied and
+    unsatisfied. The quantum term is computed once per variable.
+    
+    Unassigned variables sit in an indexed max-heap. Keys are the α-weighted
+    score scaled to an integer, with the smaller variable winning ties as
+    the original full scan did.
+    """
+    
+    def __init__(self, clauses: List[Clause], num_variables: int, alpha: int):
+        n = num_variables
+        stride = n + 1
+        self.step = (100 - alpha) * stride  # Key change per unsatisfied clause
+        self.occurrences: List[List[Tuple[int, bool]]] = [[] for _ in range(n + 1)]
+        self.clause_vars: List[Tuple[int, ...]] = []
+        self.true_count = [0] * len(clauses)
+        
+        classical = [0] * (n + 1)
+        for ci, clause in enumerate(clauses):
+            variables = tuple({abs(lit) for lit in clause.literals})
+            self.clause_vars.append(variables)
+            for lit in clause.literals:
+                self.occurrences[abs(lit)].append((ci, lit > 0))
+            for var in variables:
+                classical[var] += 1
+        
+        self.keys = [0] * (n + 1)
+        for var in range(1, n + 1):
+            score = _quantum_score(var) * alpha + classical[var] * (100 - alpha)
+            self.keys[var] = score * stride + (n - var)
+        self.heap = _VarHeap(self.keys)
+        for var in range(1, n + 1):
+            self.heap.insert(var)
+    
+    def __len__(self) -> int:
+        return len(self.heap)
+    
+    def best(self) -> int:
+        """Unassigned variable with the highest score"""
+        return self.heap.peek()
+    
+    def assign(self, var: int, value: bool):
+        self.heap.remove(var)
+        true_count = self.true_count
+        for ci, positive in self.occurrences[var]:
+            if positive == value:
+                true_count[ci] += 1
+                if true_count[ci] == 1:
+                    self._shift(ci, -self.step)  # Clause became satisfied
+    
+    def unassign(self, var: int, value: bool):
+        true_count = self.true_count
+        for ci, positive in self.occurrences[var]:
+            if positive == value:
+                true_count[ci] -= 1
+                if true_count[ci] == 0:
+                    self._shift(ci, self.step)  # Clause is unsatisfied again
+        self.heap.insert(var)
+    
+    def _shift(self, ci: int, delta: int):
+        keys, heap = self.keys, self.heap
+        for var in self.clause_vars[ci]:
+            keys[var] += delta
+            heap.update(var)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CDCL ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
+#
+# Literals are encoded internally as 2*var for the positive literal and
+# 2*var + 1 for the negated one, so negation is ``lit ^ 1`` and the variable
+# is ``lit >> 1``. ``values`` is indexed by encoded literal: 1 true, -1 false,
+# 0 unassigned.
+
+RESTART_UNIT = 100  # Conflicts per Luby unit
+GEOMETRIC_RESTART_FACTOR = 1.5
+
+def luby(i: int) -> int:
+    """Value of the Luby restart sequence (1, 1, 2, 1, 1, 2, 4, ...) at 1-based i"""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+def _encode(lit: int) -> int:
+    return (lit << 1) if lit > 0 else ((-lit << 1) | 1)
+
+def _decode(code: int) -> int:
+    return -(code >> 1) if code & 1 else code >> 1
+
+class _VarHeap:
+    """Indexed binary max-heap of variables ordered by an external score list"""
+    
+    def __init__(self, scores: List[float]):
+        self.scores = scores
+        self.heap: List[int] = []
+        self.index: Dict[int, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.heap)
+    
+    def __contains__(self, var: int) -> bool:
+        return var in self.index
+    
+    def insert(self, var: int):
+        if var in self.index:
+            return
+        self.heap.append(var)
+        self.index[var] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+    
+    def increase(self, var: int):
+        """Restore heap order after the score of var went up"""
+        pos = self.index.get(var)
+        if pos is not None:
+            self._sift_up(pos)
+    
+    def update(self, var: int):
+        """Restore heap order after the score of var changed either way"""
+        pos = self.index.get(var)
+        if pos is not None:
+            self._sift_up(pos)
+            self._sift_down(self.index[var])
+    
+    def remove(self, var: int):
+        pos = self.index.pop(var, None)
+        if pos is None:
+            return
+        last = self.heap.pop()
+        if pos < len(self.heap):
+            self.heap[pos] = last
+            self.index[last] = pos
+            self._sift_up(pos)
+            self._sift_down(self.index[last])
+    
+    def peek(self) -> int:
+        return self.heap[0]
+    
+    def pop(self) -> int:
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        del self.index[top]
+        if heap:
+            heap[0] = last
+            self.index[last] = 0
+            self._sift_down(0)
+        return top
+    
+    def _sift_up(self, pos: int):
+        heap, index, scores = self.heap, self.index, self.scores
+        var = heap[pos]
+        score = scores[var]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            pvar = heap[parent]
+            if scores[pvar] >= score:
+                break
+            heap[pos] = pvar
+            index[pvar] = pos
+            pos = parent
+        heap[pos] = var
+        index[var] = pos
+    
+    def _sift_down(self, pos: int):
+        heap, index, scores = self.heap, self.index, self.scores
+        size = len(heap)
+        var = heap[pos]
+        score = scores[var]
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            if child + 1 < size and scores[heap[child + 1]] > scores[heap[child]]:
+                child += 1
+            cvar = heap[child]
+            if scores[cvar] <= score:
+                break
+            heap[pos] = cvar
+            index[cvar] = pos
+            pos = child
+        heap[pos] = var
+        index[var] = pos
+
+class CDCLEngine:
+    """
+    Conflict-driven clause learning engine
+    
+    - Two-watched-literal unit propagation
+    - 1-UIP conflict analysis with clause minimization
+    - Non-chronological backjumping
+    - VSIDS activity seeded by the RKL α-weighted variable score
+    - Luby or geometric restarts with phase saving
+    - LBD/activity based learned-clause deletion
+    - Incremental use: clauses and variables can be added between solve
+      calls, which take assumptions and report a failed-assumption core
+    """
+    
+    RESTART_POLICIES = ("luby", "geometric", "none")
+    POLARITIES = ("saved", "true", "false", "random")
+    
+    def __init__(self, num_variables: int, alpha: int = 25, seed: int = 0,
+                 restart_policy: str = "luby", polarity: str = "saved",
+                 var_decay: float = 0.95, clause_decay: float = 0.999,
+                 interrupt: Optional[Callable[[], bool]] = None,
+                 exchange: Optional["ClauseExchange"] = None,
+                 proof: Optional["DRATWriter"] = None):
+        if restart_policy not in self.RESTART_POLICIES:
+            raise ValueError(f"Unknown restart policy: {restart_policy}")
+        if polarity not in self.POLARITIES:
+            raise ValueError(f"Unknown polarity: {polarity}")
+        
+        n = num_variables
+        self.num_variables = n
+        self.alpha = alpha
+        self.restart_policy = restart_policy
+        self.polarity = polarity
+        self.var_decay = var_decay
+        self.clause_decay = clause_decay
+        self.rng = random.Random(seed)
+        self.interrupt = interrupt
+        self.interrupt_interval = INTERRUPT_CHECK_INTERVAL
+        self.exchange = exchange
+        self.proof = proof  # Receives every learned/deleted clause when set
+        self._proof_closed = False
+        
+        # Assignment state
+        self.values = [0] * (2 * n + 2)
+        self.level = [0] * (n + 1)
+        self.reason = [-1] * (n + 1)
+        self.phase = [1] * (n + 1)  # Saved polarity bit (1 = negative)
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.qhead = 0
+        self.seen = [False] * (n + 1)
+        
+        # Clause database over encoded literals
+        self.db = ClauseDatabase()
+        self.watches: List[List[int]] = [[] for _ in range(2 * n + 2)]
+        self.learnts: Dict[int, int] = {}  # clause index -> LBD
+        self.clause_activity: Dict[int, float] = {}
+        self.clause_inc = 1.0
+        self.max_learnts = 0.0
+        
+        # Branching heuristic
+        self.activity = [0.0] * (n + 1)
+        self.var_inc = 1.0
+        self.order = _VarHeap(self.activity)
+        self.occurrences = [0] * (n + 1)
+        self._activity_seeded = False
+        
+        self.ok = True
+        self.assumptions: List[int] = []  # Encoded literals for the current solve call
+        self.conflict_core: List[int] = []  # Failed assumptions (DIMACS) after an UNSAT call
+        self.decisions = 0
+        self.conflicts = 0
+        self.propagations = 0
+        self.restarts = 0
+        self.learned_total = 0
+        self.deleted_total = 0
+        self.exported_total = 0
+        self.imported_total = 0
+    
+    # ─── Clause database ──────────────────────────────────────────────────────
+    
+    def new_variables(self, num_variables: int):
+        """Grow the engine to at least num_variables variables"""
+        for var in range(self.num_variables + 1, num_variables + 1):
+            self.values.extend((0, 0))
+            self.level.append(0)
+            self.reason.append(-1)
+            self.phase.append(1)
+            self.seen.append(False)
+            self.watches.extend(([], []))
+            self.activity.append(0.0)
+            self.occurrences.append(0)
+            if self._activity_seeded:
+                self.order.insert(var)
+        self.num_variables = max(self.num_variables, num_variables)
+    
+    def add_clause(self, literals: Iterable[int]) -> bool:
+        """
+        Add an original clause (DIMACS literals) at decision level 0
+        
+        Unknown variables are added on the fly. Between incremental solve
+        calls the trail is first undone back to level 0.
+        
+        Returns:
+            False if the formula became trivially unsatisfiable
+        """
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        literals = list(literals)
+        top = max(map(abs, literals), default=0)
+        if top > self.num_variables:
+            self.new_variables(top)
+        
+        values = self.values
+        lits: List[int] = []
+        present = set()
+        strengthened = False
+        for lit in literals:
+            code = _encode(lit)
+            if code ^ 1 in present or values[code] == 1:
+                return True  # Tautology or already satisfied at level 0
+            if code in present:
+                continue  # Duplicate
+            if values[code] == -1:
+                strengthened = True  # False at level 0
+                continue
+            present.add(code)
+            lits.append(code)
+            self.occurrences[code >> 1] += 1
+        if strengthened and lits and self.proof is not None:
+            self.proof.add(lits)
+        
+        if not lits:
+            self.ok = False
+        elif len(lits) == 1:
+            self._assign(lits[0], -1)
+            self.ok = self._propagate() == -1
+        else:
+            self._attach(lits)
+        if not self.ok:
+            self._close_proof()
+        return self.ok
+    
+    def import_clause(self, literals: Iterable[int]) -> bool:
+        """
+        Add a clause learned by another solver on the same formula
+        
+        Must be called at decision level 0. The clause is attached as a
+        learned clause, so it is subject to the usual deletion policy.
+        
+        Returns:
+            False if the formula became trivially unsatisfiable
+        """
+        if not self.ok:
+            return False
+        
+        values = self.values
+        lits: List[int] = []
+        for lit in literals:
+            code = _encode(lit)
+            if values[code] == 1:
+                return True  # Already satisfied at level 0
+            if code ^ 1 in lits:
+                return True  # Tautology
+            if values[code] == 0 and code not in lits:
+                lits.append(code)
+        
+        self.imported_total += 1
+        if self.proof is not None:
+            self.proof.add(lits)
+        if not lits:
+            self.ok = False
+        elif len(lits) == 1:
+            self._assign(lits[0], -1)
+            self.ok = self._propagate() == -1
+        else:
+            self._attach(lits, len(lits))
+        return self.ok
+    
+    def _attach(self, lits: List[int], lbd: int = 0) -> int:
+        ci = self.db.add(lits)
+        self.watches[lits[0]].append(ci)
+        self.watches[lits[1]].append(ci)
+        if lbd:
+            self.learnts[ci] = lbd
+            self.clause_activity[ci] = 0.0
+            self.learned_total += 1
+        return ci
+    
+    def _locked(self, ci: int) -> bool:
+        first = self.db.literals[self.db.offsets[ci]]
+        return self.values[first] == 1 and self.reason[first >> 1] == ci
+    
+    def _reduce_db(self):
+        """Delete the less useful half of the learned clauses"""
+        activity = self.clause_activity
+        candidates = [ci for ci, lbd in self.learnts.items()
+                      if lbd > 2 and not self._locked(ci)]
+        candidates.sort(key=lambda ci: (-self.learnts[ci], activity[ci]))
+        for ci in candidates[:len(candidates) // 2]:
+            # Watch lists drop the index lazily during propagation
+            if self.proof is not None:
+                self.proof.delete(self.db.get(ci))
+            self.db.delete(ci)
+            del self.learnts[ci]
+            del activity[ci]
+            self.deleted_total += 1
+        self.max_learnts *= 1.1
+        if self.db.wasted * 2 > len(self.db.literals):
+            self._collect_garbage()
+    
+    def simplify(self) -> int:
+        """
+        Delete every clause satisfied at decision level 0
+        
+        Used after clause groups are retired (their activation literal
+        becomes false), so disabled clauses stop costing propagation time.
+        
+        Returns:
+            Number of clauses deleted
+        """
+        self._cancel_until(0)
+        if not self.ok or self._propagate() != -1:
+            self.ok = False
+            return 0
+        db, values = self.db, self.values
+        literals, offsets, lengths = db.literals, db.offsets, db.lengths
+        proof = self.proof
+        if proof is not None:
+            # Keep level-0 units derivable once their reasons are deleted
+            for lit in self.trail:
+                proof.add([lit])
+        removed = 0
+        for ci in range(len(db)):
+            size = lengths[ci]
+            if not size:
+                continue
+            start = offsets[ci]
+            if any(values[literals[k]] == 1 for k in range(start, start + size)):
+                if proof is not None:
+                    proof.delete(db.get(ci))
+                db.delete(ci)
+                if ci in self.learnts:
+                    del self.learnts[ci]
+                    del self.clause_activity[ci]
+                removed += 1
+        # Level-0 assignments never need their reasons again
+        for lit in self.trail:
+            self.reason[lit >> 1] = -1
+        if removed:
+            self._collect_garbage()
+        return removed
+    
+    def _collect_garbage(self):
+        """Compact the clause buffers and rebuild watches around the new indexes"""
+        remap = self.db.compact()
+        db = self.db
+        literals, offsets = db.literals, db.offsets
+        watches = [[] for _ in range(2 * self.num_variables + 2)]
+        for ci in range(len(offsets)):
+            offset = offsets[ci]
+            watches[literals[offset]].append(ci)
+            watches[literals[offset + 1]].append(ci)
+        self.watches = watches
+        self.reason = [remap.get(r, -1) for r in self.reason]
+        self.learnts = {remap[ci]: lbd for ci, lbd in self.learnts.items()}
+        self.clause_activity = {remap[ci]: act for ci, act in self.clause_activity.items()}
+    
+    # ─── Assignment trail ─────────────────────────────────────────────────────
+    
+    def _assign(self, lit: int, reason: int):
+        var = lit >> 1
+        self.values[lit] = 1
+        self.values[lit ^ 1] = -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+    
+    def _cancel_until(self, level: int):
+        if len(self.trail_lim) <= level:
+            return
+        values, reason, phase, order = self.values, self.reason, self.phase, self.order
+        trail = self.trail
+        limit = self.trail_lim[level]
+        for i in range(len(trail) - 1, limit - 1, -1):
+            lit = trail[i]
+            var = lit >> 1
+            values[lit] = 0
+            values[lit ^ 1] = 0
+            reason[var] = -1
+            phase[var] = lit & 1
+            order.insert(var)
+        del trail[limit:]
+        del self.trail_lim[level:]
+        self.qhead = limit
+    
+    def _propagate(self) -> int:
+        """
+        Two-watched-literal unit propagation
+        
+        Returns:
+            Index of a conflicting clause, or -1 if no conflict
+        """
+        values, watches, trail = self.values, self.watches, self.trail
+        literals, offsets, lengths = self.db.literals, self.db.offsets, self.db.lengths
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            self.propagations += 1
+            
+            ws = watches[false_lit]
+            i = j = 0
+            count = len(ws)
+            while i < count:
+                ci = ws[i]
+                i += 1
+                size = lengths[ci]
+                if not size:
+                    continue  # Deleted clause: drop the watch
+                
+                # Keep the false watch in position 1
+                start = offsets[ci]
+                first = literals[start]
+                if first == false_lit:
+                    first = literals[start + 1]
+                    literals[start] = first
+                    literals[start + 1] = false_lit
+                if values[first] == 1:
+                    ws[j] = ci
+                    j += 1
+                    continue
+                
+                # Look for a replacement watch
+                for k in range(start + 2, start + size):
+                    lit = literals[k]
+                    if values[lit] != -1:
+                        literals[start + 1] = lit
+                        literals[k] = false_lit
+                        watches[lit].append(ci)
+                        break
+                else:
+                    ws[j] = ci
+                    j += 1
+                    if values[first] == -1:
+                        # Conflict: keep the remaining watches and stop
+                        while i < count:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        self.qhead = len(trail)
+                        return ci
+                    self._assign(first, ci)
+            del ws[j:]
+        return -1
+    
+    # ─── Conflict analysis ────────────────────────────────────────────────────
+    
+    def _analyze(self, confl: int) -> Tuple[List[int], int, int]:
+        """
+        1-UIP conflict analysis
+        
+        Returns:
+            (learned clause with the asserting literal first,
+             backjump level, literal block distance)
+        """
+        db, level, reason, seen, trail = (
+            self.db, self.level, self.reason, self.seen, self.trail
+        )
+        current_level = len(self.trail_lim)
+        learnt = [0]
+        counter = 0
+        lit = -1
+        idx = len(trail) - 1
+        
+        while True:
+            if confl in self.learnts:
+                self._bump_clause(confl)
+            clause = db.get(confl)
+            for q in (clause if lit == -1 else clause[1:]):
+                var = q >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = True
+                    self._bump_var(var)
+                    if level[var] >= current_level:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            
+            # Walk back to the next marked literal on the trail
+            while not seen[trail[idx] >> 1]:
+                idx -= 1
+            lit = trail[idx]
+            idx -= 1
+            var = lit >> 1
+            confl = reason[var]
+            seen[var] = False
+            counter -= 1
+            if counter == 0:
+                break
+        learnt[0] = lit ^ 1
+        
+        # Drop literals implied by the rest of the clause
+        minimized = [learnt[0]]
+        for q in learnt[1:]:
+            r = reason[q >> 1]
+            if r == -1:
+                minimized.append(q)
+                continue
+            for other in db.get(r)[1:]:
+                ov = other >> 1
+                if not seen[ov] and level[ov] > 0:
+                    minimized.append(q)
+                    break
+        for q in learnt[1:]:
+            seen[q >> 1] = False
+        
+        # Second watch goes to the highest remaining level
+        backjump = 0
+        if len(minimized) > 1:
+            best = 1
+            for k in range(2, len(minimized)):
+                if level[minimized[k] >> 1] > level[minimized[best] >> 1]:
+                    best = k
+            minimized[1], minimized[best] = minimized[best], minimized[1]
+            backjump = level[minimized[1] >> 1]
+        
+        lbd = len({level[q >> 1] for q in minimized})
+        return minimized, backjump, lbd
+    
+    def _analyze_final(self, failed: int) -> List[int]:
+        """
+        Assumptions that together force the assumption ``failed`` false
+        
+        Returns:
+            Failed-assumption core as DIMACS literals, ``failed`` first
+        """
+        core = [failed]
+        if not self.trail_lim:
+            return [_decode(failed)]
+        db, level, reason, seen, trail = (
+            self.db, self.level, self.reason, self.seen, self.trail
+        )
+        seen[failed >> 1] = True
+        for i in range(len(trail) - 1, self.trail_lim[0] - 1, -1):
+            lit = trail[i]
+            var = lit >> 1
+            if not seen[var]:
+                continue
+            if reason[var] == -1:
+                core.append(lit)  # Decided at an assumption level, so an assumption
+            else:
+                for q in db.get(reason[var])[1:]:
+                    if level[q >> 1] > 0:
+                        seen[q >> 1] = True
+            seen[var] = False
+        seen[failed >> 1] = False
+        return [_decode(code) for code in dict.fromkeys(core)]
+    
+    def _bump_var(self, var: int):
+        activity = self.activity
+        activity[var] += self.var_inc
+        if activity[var] > 1e100:
+            for v in range(1, self.num_variables + 1):
+                activity[v] *= 1e-100
+            self.var_inc *= 1e-100
+        self.order.increase(var)
+    
+    def _bump_clause(self, ci: int):
+        activity = self.clause_activity
+        activity[ci] += self.clause_inc
+        if activity[ci] > 1e20:
+            for key in activity:
+                activity[key] *= 1e-20
+            self.clause_inc *= 1e-20
+    
+    # ─── Search ───────────────────────────────────────────────────────────────
+    
+    def _seed_activity(self):
+        """Initial VSIDS order from the RKL α-weighted quantum/classical score"""
+        alpha = self.alpha
+        top = max(self.occurrences) if self.num_variables else 0
+        for var in range(1, self.num_variables + 1):
+            score = (_quantum_score(var) * alpha + self.occurrences[var] * (100 - alpha)) / 100
+            jitter = self.rng.random() * 1e-3
+            self.activity[var] = (score + jitter) / (100 + top + 1)
+            self.order.insert(var)
+        self._activity_seeded = True
+    
+    def _pick_branch(self) -> int:
+        values, order = self.values, self.order
+        while order:
+            var = order.pop()
+            if values[var << 1] == 0:
+                if self.polarity == "saved":
+                    return (var << 1) | self.phase[var]
+                if self.polarity == "true":
+                    return var << 1
+                if self.polarity == "false":
+                    return (var << 1) | 1
+                return (var << 1) | self.rng.getrandbits(1)
+        return -1
+    
+    def _restart_limit(self, restart: int) -> float:
+        if self.restart_policy == "luby":
+            return luby(restart + 1) * RESTART_UNIT
+        if self.restart_policy == "geometric":
+            return RESTART_UNIT * GEOMETRIC_RESTART_FACTOR ** restart
+        return math.inf
+    
+    def _search(self, conflict_limit: float) -> Optional[bool]:
+        conflicts = 0
+        while True:
+            confl = self._propagate()
+            if confl != -1:
+                self.conflicts += 1
+                conflicts += 1
+                if not self.trail_lim:
+                    return False
+                if (self.interrupt is not None and not self.conflicts % self.interrupt_interval
+                        and self.interrupt()):
+                    raise SolveInterrupted(self.decisions)
+                learnt, backjump, lbd = self._analyze(confl)
+                if self.proof is not None:
+                    self.proof.add(learnt)
+                if self.exchange is not None and len(learnt) <= self.exchange.max_length:
+                    self.exchange.export([_decode(code) for code in learnt])
+                    self.exported_total += 1
+                self._cancel_until(backjump)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], -1)
+                else:
+                    ci = self._attach(learnt, lbd)
+                    self._bump_clause(ci)
+                    self._assign(learnt[0], ci)
+                self.var_inc /= self.var_decay
+                self.clause_inc /= self.clause_decay
+                continue
+            
+            if conflicts >= conflict_limit:
+                self._cancel_until(0)
+                return None
+            if len(self.learnts) - len(self.trail) >= self.max_learnts:
+                self._reduce_db()
+            
+            # Assumptions are decided first, one per decision level
+            lit = -1
+            while len(self.trail_lim) < len(self.assumptions):
+                assumption = self.assumptions[len(self.trail_lim)]
+                value = self.values[assumption]
+                if value == 1:
+                    self.trail_lim.append(len(self.trail))  # Already true: empty level
+                elif value == -1:
+                    self.conflict_core = self._analyze_final(assumption)
+                    return False
+                else:
+                    lit = assumption
+                    break
+            if lit == -1:
+                lit = self._pick_branch()
+                if lit == -1:
+                    return True  # Every variable assigned without conflict
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self._assign(lit, -1)
+    
+    def solve(self, assumptions: Iterable[int] = ()) -> bool:
+        """
+        Run CDCL search to completion
+        
+        Clauses shared through ``exchange`` are imported at every restart.
+        Learned clauses and activity carry over between calls.
+        
+        Args:
+            assumptions: DIMACS literals held true for this call only; when
+                they make the formula UNSAT, ``conflict_core`` lists the
+                subset responsible and the engine stays usable
+        
+        Raises:
+            SolveInterrupted: when the ``interrupt`` hook returns True
+        """
+        self.conflict_core = []
+        if not self.ok:
+            self._close_proof()
+            return False
+        self._cancel_until(0)
+        assumptions = list(assumptions)
+        top = max(map(abs, assumptions), default=0)
+        if top > self.num_variables:
+            self.new_variables(top)
+        self.assumptions = [_encode(lit) for lit in assumptions]
+        if not self._activity_seeded:
+            self._seed_activity()
+        self.max_learnts = max(len(self.db) / 3, 1000.0, self.max_learnts)
+        
+        restart = 0
+        while True:
+            status = self._search(self._restart_limit(restart))
+            if status is not None:
+                if status is False and not self.conflict_core:
+                    self.ok = False  # Refuted without assumptions: UNSAT for good
+                    self._close_proof()
+                return status
+            restart += 1
+            self.restarts += 1
+            if self.interrupt is not None and self.interrupt():
+                raise SolveInterrupted(self.decisions)
+            if self.exchange is not None:
+                for literals in self.exchange.collect():
+                    if not self.import_clause(literals):
+                        self._close_proof()
+                        return False
+    
+    def _close_proof(self):
+        """Log the empty clause that ends a refutation (once)"""
+        if self.proof is not None and not self._proof_closed:
+            self.proof.add([])
+            self._proof_closed = True
+    
+    def learned_clauses(self) -> List[List[int]]:
+        """Live learned clauses as DIMACS literal lists"""
+        return [[_decode(code) for code in self.db.get(ci)] for ci in sorted(self.learnts)]
+    
+    def model(self) -> Dict[int, bool]:
+        """Current full assignment (valid after a satisfiable solve)"""
+        values = self.values
+        return {var: values[var << 1] == 1 for var in range(1, self.num_variables + 1)}
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'decisions': self.decisions,
+            'conflicts': self.conflicts,
+            'propagations': self.propagations,
+            'restarts': self.restarts,
+            'learned_clauses': self.learned_total,
+            'deleted_clauses': self.deleted_total,
+            'exported_clauses': self.exported_total,
+            'imported_clauses': self.imported_total,
+            'proof_additions': self.proof.additions if self.proof is not None else 0,
+            'proof_deletions': self.proof.deletions if self.proof is not None else 0
+        }
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# INCREMENTAL SOLVING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class IncrementalSATSolver:
+    """
+    Long-lived CDCL solver for sequences of related queries
+    
+    Clauses accumulate across ``solve`` calls, and so do learned clauses,
+    variable activity and saved phases. Per-call constraints go in as
+    assumptions. ``push``/``pop`` open and retire clause groups; each group
+    is guarded by a hidden activation variable that is assumed while the
+    group is open and fixed false when it is popped.
+    
+    User variables are mapped onto engine variables, so activation
+    variables never collide with variables introduced later.
+    """
+    
+    def __init__(self, alpha: int = 25, **cdcl_options):
+        self.alpha = alpha
+        self.engine = CDCLEngine(0, alpha=alpha, **cdcl_options)
+        self.cycles = 0
+        self.calls = 0
+        self.core: List[int] = []
+        self._internal: Dict[int, int] = {}  # User variable -> engine variable
+        self._external: Dict[int, int] = {}  # Engine variable -> user variable
+        self._groups: List[int] = []  # Activation variables of open groups, innermost last
+        self._model: Optional[Dict[int, bool]] = None
+    
+    @property
+    def num_variables(self) -> int:
+        """Highest user variable seen so far"""
+        return max(self._internal, default=0)
+    
+    def _new_engine_var(self) -> int:
+        var = self.engine.num_variables + 1
+        self.engine.new_variables(var)
+        return var
+    
+    def _to_engine(self, lit: int) -> int:
+        var = abs(lit)
+        internal = self._internal.get(var)
+        if internal is None:
+            internal = self._internal[var] = self._new_engine_var()
+            self._external[internal] = var
+        return internal if lit > 0 else -internal
+    
+    def add_clause(self, literals: Iterable[int]) -> bool:
+        """
+        Add a clause to the innermost open group (or permanently if none)
+        
+        Returns:
+            False once the clauses outside every group are unsatisfiable
+        """
+        clause = [self._to_engine(lit) for lit in literals]
+        if self._groups:
+            clause.append(-self._groups[-1])
+        self._model = None
+        return self.engine.add_clause(clause)
+    
+    def add_clauses(self, clauses: Iterable[Union[Clause, Iterable[int]]]) -> bool:
+        ok = True
+        for clause in clauses:
+            ok = self.add_clause(clause.literals if isinstance(clause, Clause) else clause)
+        return ok
+    
+    def push(self) -> int:
+        """Open a clause group; returns the new group depth"""
+        self._groups.append(self._new_engine_var())
+        return len(self._groups)
+    
+    def pop(self) -> int:
+        """Retire the innermost group and every clause added to it; returns the new depth"""
+        if not self._groups:
+            raise ValueError("No clause group to pop")
+        selector = self._groups.pop()
+        self.engine.add_clause([-selector])
+        self.engine.simplify()
+        self._model = None
+        return len(self._groups)
+    
+    def solve(self, assumptions: Iterable[int] = ()) -> SATResult:
+        """
+        Solve the current clauses under assumptions
+        
+        Returns:
+            SATResult covering every user variable. On UNSAT, ``core`` lists
+            the failed assumptions; an empty core means the clauses are
+            UNSAT without any assumptions.
+        """
+        start_time = time.time()
+        assumptions = list(assumptions)
+        engine = self.engine
+        decisions_before = engine.decisions
+        
+        engine_assumptions = self._groups + [self._to_engine(lit) for lit in assumptions]
+        satisfiable = engine.solve(engine_assumptions)
+        
+        self.calls += 1
+        self.cycles = engine.decisions - decisions_before
+        assignment = None
+        self.core = []
+        if satisfiable:
+            values = engine.values
+            assignment = {user: values[internal << 1] == 1
+                          for user, internal in sorted(self._internal.items())}
+        else:
+            self.core = [self._external[abs(lit)] * (1 if lit > 0 else -1)
+                         for lit in engine.conflict_core if abs(lit) in self._external]
+        self._model = assignment
+        
+        stats = engine.get_stats()
+        stats['calls'] = self.calls
+        stats['learned_kept'] = len(engine.learnts)
+        stats['groups'] = len(self._groups)
+        data = {
+            'assumptions': assumptions,
+            'assignment': assignment,
+            'core': self.core,
+            'cycles': self.cycles,
+            'clauses': len(engine.db) - len(engine.learnts)
+        }
+        return SATResult(
+            satisfiable=satisfiable,
+            assignment=assignment,
+            cycles=self.cycles,
+            time_ms=(time.time() - start_time) * 1000,
+            verification_hash=hashlib.sha256(str(data).encode()).hexdigest(),
+            engine="cdcl",
+            stats=stats,
+            core=None if satisfiable else list(self.core)
+        )
+    
+    def value(self, var: int) -> Optional[bool]:
+        """Value of a user variable in the last model, if any"""
+        return self._model.get(var) if self._model else None
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROOFS AND MODEL CHECKING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DRAT_BUFFER_SIZE = 1 << 16
+DRAT_ADD = 0x61  # 'a'
+DRAT_DELETE = 0x64  # 'd'
+
+class DRATWriter:
+    """
+    Buffered DRAT proof stream
+    
+    Takes literals in the CDCL engine's encoding (2*var, plus 1 when
+    negated), which is exactly binary DRAT's, so binary mode writes them as
+    varints without translation. Text mode writes "1 -2 0" and
+    "d 1 -2 0" lines. Output is flushed in DRAT_BUFFER_SIZE blocks.
+    """
+    
+    def __init__(self, destination: Union[str, os.PathLike, BinaryIO], binary: bool = True,
+                 buffer_size: int = DRAT_BUFFER_SIZE):
+        if isinstance(destination, (str, os.PathLike)):
+            self.out = open(destination, "wb")
+        else:
+            self.out = destination
+        self.owned = self.out is not destination
+        self.binary = binary
+        self.buffer_size = buffer_size
+        self.buffer = bytearray()
+        self.additions = 0
+        self.deletions = 0
+    
+    def add(self, codes: Iterable[int]):
+        self.additions += 1
+        self._write(DRAT_ADD, codes)
+    
+    def delete(self, codes: Iterable[int]):
+        self.deletions += 1
+        self._write(DRAT_DELETE, codes)
+    
+    def _write(self, tag: int, codes: Iterable[int]):
+        buffer = self.buffer
+        if self.binary:
+            buffer.append(tag)
+            for code in codes:
+                while code > 0x7F:
+                    buffer.append((code & 0x7F) | 0x80)
+                    code >>= 7
+                buffer.append(code)
+            buffer.append(0)
+        else:
+            if tag == DRAT_DELETE:
+                buffer += b"d "
+            for code in codes:
+                buffer += str(_decode(code)).encode()
+                buffer.append(0x20)
+            buffer += b"0\n"
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+    
+    def flush(self):
+        if self.buffer:
+            self.out.write(self.buffer)
+            self.buffer = bytearray()
+    
+    def close(self):
+        self.flush()
+        if self.owned:
+            self.out.close()
+        else:
+            self.out.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def read_drat(source: Union[str, os.PathLike, BinaryIO, bytes]) -> List[Tuple[bool, List[int]]]:
+    """
+    Parse a binary or text DRAT proof
+    
+    Binary proofs are recognised by their NUL lemma terminators.
+    
+    Returns:
+        (is_deletion, DIMACS literals) per proof step
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            data = f.read()
+    else:
+        data = source.read()
+    
+    steps: List[Tuple[bool, List[int]]] = []
+    if b"\x00" in data:
+        i, size = 0, len(data)
+        while i < size:
+            tag = data[i]
+            i += 1
+            if tag not in (DRAT_ADD, DRAT_DELETE):
+                raise ValueError(f"Invalid binary DRAT tag {tag:#x} at byte {i - 1}")
+            lits = []
+            code = shift = 0
+            while True:
+                if i >= size:
+                    raise ValueError("Truncated binary DRAT proof")
+                byte = data[i]
+                i += 1
+                code |= (byte & 0x7F) << shift
+                if byte & 0x80:
+                    shift += 7
+                    continue
+                if not code:
+                    break
+                lits.append(_decode(code))
+                code = shift = 0
+            steps.append((tag == DRAT_DELETE, lits))
+        return steps
+    
+    for line in data.splitlines():
+        tokens = line.split()
+        if not tokens or tokens[0].startswith(b"c"):
+            continue
+        deletion = tokens[0] == b"d"
+        lits = []
+        for token in tokens[1:] if deletion else tokens:
+            lit = int(token)
+            if lit == 0:
+                steps.append((deletion, lits))
+                lits = []
+                deletion = False
+            else:
+                lits.append(lit)
+    return steps
+
+@dataclass
+class DRATCheckResult:
+    """Outcome of checking a DRAT refutation"""
+    verified: bool
+    message: str
+    lemmas: int  # Lemmas in the proof up to the empty clause
+    checked: int  # Lemmas actually checked (the rest were trimmed as unused)
+    core: List[int]  # Indexes of the original clauses the refutation uses
+    time_ms: float
+
+class DRATChecker:
+    """
+    Backward DRAT checker with core trimming
+    
+    The proof is replayed forwards to the empty clause. Lemmas are then
+    checked in reverse, and only if a later check used them; each RUP
+    check marks the clauses its conflict depends on. Lemmas that fail RUP
+    get a RAT check on their first literal. The marked original clauses
+    form an unsatisfiable core.
+    
+    Each check propagates from an empty assignment, so the two-watched
+    literal lists stay valid while clauses are switched on and off.
+    """
+    
+    def __init__(self, clauses: Iterable[Union[Clause, Iterable[int]]], num_variables: int):
+        self.num_variables = 0
+        self.clauses: List[List[int]] = []
+        self.active: List[bool] = []
+        self.marked = bytearray()
+        self.units: List[int] = []
+        self.lookup: Dict[Tuple[int, ...], List[int]] = {}
+        # Indexed by encoded literal / variable, as in CDCLEngine
+        self.watches: List[List[int]] = [[], []]
+        self.values: List[int] = [0, 0]
+        self.reason: List[int] = [-1]
+        self._grow(num_variables)
         for clause in clauses:
-            if clause.evaluate(assignment) is not True:
+            self._add(clause.literals if isinstance(clause, Clause) else clause)
+        self.num_original = len(self.clauses)
+    
+    def _grow(self, num_variables: int):
+        extra = num_variables - self.num_variables
+        if extra > 0:
+            self.values.extend([0] * (2 * extra))
+            self.reason.extend([-1] * extra)
+            self.watches.extend([] for _ in range(2 * extra))
+            self.num_variables = num_variables
+    
+    def _add(self, literals: Iterable[int]) -> int:
+        codes = list(dict.fromkeys(_encode(lit) for lit in literals))
+        top = max((code >> 1 for code in codes), default=0)
+        if top > self.num_variables:
+            self._grow(top)
+        index = len(self.clauses)
+        self.clauses.append(codes)
+        self.active.append(True)
+        self.marked.append(0)
+        self.lookup.setdefault(tuple(sorted(codes)), []).append(index)
+        if len(codes) == 1:
+            self.units.append(index)
+        elif len(codes) > 1:
+            self.watches[codes[0]].append(index)
+            self.watches[codes[1]].append(index)
+        return index
+    
+    def check(self, proof: Union[str, os.PathLike, BinaryIO, bytes]) -> DRATCheckResult:
+        start = time.perf_counter()
+        steps = read_drat(proof)
+        
+        # Forward replay to the first empty clause
+        history: List[Tuple[bool, int]] = []  # (is_deletion, clause index)
+        lemmas = 0
+        refuted = False
+        for deletion, lits in steps:
+            if deletion:
+                key = tuple(sorted(dict.fromkeys(_encode(lit) for lit in lits)))
+                candidates = [i for i in self.lookup.get(key, ()) if self.active[i]]
+                if not candidates or len(key) == 1:
+                    continue  # Unknown clauses and unit deletions are ignored
+                self.active[candidates[-1]] = False
+                history.append((True, candidates[-1]))
+                continue
+            lemmas += 1
+            index = self._add(lits)
+            history.append((False, index))
+            if not lits:
+                refuted = True
+                break
+        
+        def result(verified: bool, message: str, checked: int) -> DRATCheckResult:
+            core = [i for i in range(self.num_original) if self.marked[i]]
+            return DRATCheckResult(verified, message, lemmas, checked, core,
+                                   (time.perf_counter() - start) * 1000)
+        
+        if not refuted:
+            # Accept a proof whose last lemma already propagates to a conflict
+            if not self._rup([]):
+                return result(False, "Proof does not derive the empty clause", 0)
+        
+        checked = 0
+        for deletion, index in reversed(history):
+            if deletion:
+                self.active[index] = True
+                continue
+            self.active[index] = False
+            if not self.marked[index] and self.clauses[index]:
+                continue
+            checked += 1
+            lemma = self.clauses[index]
+            if not self._rup(lemma) and not self._rat(lemma):
+                literals = [_decode(code) for code in lemma]
+                return result(False, f"Lemma {literals} is neither RUP nor RAT", checked)
+        return result(True, "Refutation verified", checked)
+    
+    # ─── Unit propagation ─────────────────────────────────────────────────────
+    
+    def _rup(self, lemma: List[int]) -> bool:
+        """True if the active clauses plus the negated lemma propagate to a conflict"""
+        values, reason = self.values, self.reason
+        trail: List[int] = []
+        
+        def assign(code: int, why: int) -> bool:
+            if values[code] == 1:
+                return True
+            if values[code] == -1:
+                return False
+            values[code], values[code ^ 1] = 1, -1
+            reason[code >> 1] = why
+            trail.append(code)
+            return True
+        
+        try:
+            for code in lemma:
+                if not assign(code ^ 1, -1):
+                    return True  # Tautological lemma
+            for index in self.units:
+                if self.active[index] and not assign(self.clauses[index][0], index):
+                    self._mark_conflict(index, trail)
+                    return True
+            conflict = self._propagate(trail, assign)
+            if conflict == -1:
                 return False
+            self._mark_conflict(conflict, trail)
+            return True
+        finally:
+            for code in trail:
+                values[code] = values[code ^ 1] = 0
+    
+    def _propagate(self, trail: List[int], assign) -> int:
+        values, watches, clauses, active = self.values, self.watches, self.clauses, self.active
+        head = 0
+        while head < len(trail):
+            false_lit = trail[head] ^ 1
+            head += 1
+            ws = watches[false_lit]
+            i = j = 0
+            count = len(ws)
+            while i < count:
+                index = ws[i]
+                i += 1
+                if not active[index]:
+                    ws[j] = index
+                    j += 1
+                    continue
+                lits = clauses[index]
+                if lits[0] == false_lit:
+                    lits[0], lits[1] = lits[1], false_lit
+                first = lits[0]
+                if values[first] == 1:
+                    ws[j] = index
+                    j += 1
+                    continue
+                for k in range(2, len(lits)):
+                    if values[lits[k]] != -1:
+                        lits[1], lits[k] = lits[k], false_lit
+                        watches[lits[1]].append(index)
+                        break
+                else:
+                    ws[j] = index
+                    j += 1
+                    if values[first] == -1:
+                        # Conflict: keep the remaining watches and stop
+                        while i < count:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        return index
+                    assign(first, index)
+            del ws[j:]
+        return -1
+    
+    def _mark_conflict(self, conflict: int, trail: List[int]):
+        """Mark the conflicting clause and every reason it depends on"""
+        reason, clauses, marked = self.reason, self.clauses, self.marked
+        needed = set(code >> 1 for code in clauses[conflict])
+        marked[conflict] = 1
+        for code in reversed(trail):
+            var = code >> 1
+            if var not in needed:
+                continue
+            why = reason[var]
+            if why >= 0:
+                marked[why] = 1
+                needed.update(other >> 1 for other in clauses[why])
+    
+    def _rat(self, lemma: List[int]) -> bool:
+        """Resolution asymmetric tautology check on the lemma's first literal"""
+        if not lemma:
+            return False
+        pivot = lemma[0]
+        candidates = [index for index, lits in enumerate(self.clauses)
+                      if self.active[index] and pivot ^ 1 in lits]
+        for index in candidates:
+            resolvent = lemma + [code for code in self.clauses[index] if code != pivot ^ 1]
+            if not self._rup(resolvent):
+                return False
+            self.marked[index] = 1
         return True
 
+def check_drat(clauses: Iterable[Union[Clause, Iterable[int]]], num_variables: int,
+               proof: Union[str, os.PathLike, BinaryIO, bytes]) -> DRATCheckResult:
+    """Check a DRAT refutation of clauses (see DRATChecker)"""
+    return DRATChecker(clauses, num_variables).check(proof)
+
+def check_model(clauses: Union[Iterable[Clause], ClauseDatabase],
+                assignment: Dict[int, bool]) -> bool:
+    """
+    True if the assignment satisfies every clause
+    
+    Builds the set of true literals once; each clause is then a single
+    C-level ``isdisjoint`` call instead of a per-literal Python loop.
+    Packed databases are checked with ClauseDatabase.evaluate_all.
+    """
+    if isinstance(clauses, ClauseDatabase):
+        top = max(map(abs, clauses.literals), default=0)
+        top = max(top, max(assignment, default=0))
+        satisfied, _, _ = clauses.evaluate_all(dense_assignment(assignment, top))
+        return satisfied == len(clauses) - sum(1 for size in clauses.lengths if not size)
+    true_literals = {var if value else -var for var, value in assignment.items()}
+    disjoint = true_literals.isdisjoint
+    return not any(map(disjoint, (clause.literals for clause in clauses)))
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PREPROCESSING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SUBSUME_OCCURRENCE_LIMIT = 1000  # Skip subsumption checks through very common literals
+BVE_OCCURRENCE_LIMIT = 16  # Only eliminate variables with at most this many occurrences
+BVE_RESOLVENT_LIMIT = 20  # Longest resolvent variable elimination may add
+
+@dataclass
+class PreprocessResult:
+    """
+    Simplified formula plus what is needed to map its models back
+    
+    ``stack`` holds (pivot literal, clause) pairs in elimination order.
+    ``extend`` walks it backwards, making the pivot true whenever its
+    clause is not yet satisfied, which yields a model of the original
+    formula from any model of the simplified one.
+    """
+    clauses: List[Clause]
+    num_variables: int
+    unsatisfiable: bool
+    stack: List[Tuple[int, List[int]]]
+    passes: List[Dict[str, Any]]
+    
+    def extend(self, assignment: Optional[Dict[int, bool]]) -> Dict[int, bool]:
+        """Complete a model of the simplified formula to every original variable"""
+        model = {var: False for var in range(1, self.num_variables + 1)}
+        if assignment:
+            model.update(assignment)
+        for pivot, clause in reversed(self.stack):
+            if not any(model[abs(lit)] == (lit > 0) for lit in clause):
+                model[abs(pivot)] = pivot > 0
+        return model
+
+class SATPreprocessor:
+    """
+    Formula simplification ahead of search
+    
+    Passes, in order:
+    - duplicates: drop repeated literals, tautologies and repeated clauses
+    - units: top-level unit propagation
+    - pure: pure-literal elimination
+    - subsumption: subsumption and self-subsuming resolution
+    - elimination: bounded variable elimination (resolvents never
+      outnumber the clauses they replace)
+    """
+    
+    PASSES = ("duplicates", "units", "pure", "subsumption", "elimination")
+    
+    def __init__(self, passes: Iterable[str] = PASSES):
+        passes = tuple(passes)
+        for name in passes:
+            if name not in self.PASSES:
+                raise ValueError(f"Unknown preprocessing pass: {name}")
+        self.passes = passes
+    
+    def run(self, clauses: Iterable[Clause], num_variables: int) -> PreprocessResult:
+        self.clauses: Dict[int, List[int]] = {}
+        self.occurs: Dict[int, Set[int]] = {}
+        self.stack: List[Tuple[int, List[int]]] = []
+        self.fixed: Dict[int, bool] = {}
+        self.unsatisfiable = False
+        self.literals_removed = 0
+        self.variables_removed = 0
+        for index, clause in enumerate(clauses):
+            self._add(index, list(clause.literals))
+        
+        reports = []
+        for name in self.passes:
+            clauses_before = len(self.clauses)
+            self.literals_removed = 0
+            self.variables_removed = 0
+            start = time.perf_counter()
+            if not self.unsatisfiable:
+                getattr(self, f"_{name}")()
+            reports.append({
+                'pass': name,
+                'time_ms': (time.perf_counter() - start) * 1000,
+                'clauses_removed': clauses_before - len(self.clauses),
+                'literals_removed': self.literals_removed,
+                'variables_removed': self.variables_removed
+            })
+        
+        return PreprocessResult(
+            clauses=[Clause(literals) for literals in self.clauses.values()],
+            num_variables=num_variables,
+            unsatisfiable=self.unsatisfiable,
+            stack=self.stack,
+            passes=reports
+        )
+    
+    # ─── Clause bookkeeping ───────────────────────────────────────────────────
+    
+    def _occurrences(self, lit: int) -> Set[int]:
+        occurs = self.occurs.get(lit)
+        if occurs is None:
+            occurs = self.occurs[lit] = set()
+        return occurs
+    
+    def _add(self, index: int, literals: List[int]):
+        self.clauses[index] = literals
+        for lit in literals:
+            self._occurrences(lit).add(index)
+    
+    def _remove(self, index: int) -> List[int]:
+        literals = self.clauses.pop(index)
+        for lit in literals:
+            self.occurs[lit].discard(index)
+        return literals
+    
+    def _strengthen(self, index: int, lit: int):
+        """Drop a literal from a clause; an emptied clause makes the formula UNSAT"""
+        self.clauses[index].remove(lit)
+        self.occurs[lit].discard(index)
+        self.literals_removed += 1
+        if not self.clauses[index]:
+            self.unsatisfiable = True
+    
+    def _fix(self, lit: int):
+        """Make lit true at the top level and simplify every clause it touches"""
+        self.fixed[abs(lit)] = lit > 0
+        self.stack.append((lit, [lit]))
+        self.variables_removed += 1
+        for index in list(self._occurrences(lit)):
+            self._remove(index)
+        for index in list(self._occurrences(-lit)):
+            self._strengthen(index, -lit)
+    
+    # ─── Passes ───────────────────────────────────────────────────────────────
+    
+    def _duplicates(self):
+        raw, self.clauses, self.occurs = self.clauses, {}, {}
+        seen = set()
+        for index, literals in raw.items():
+            unique = sorted(set(literals), key=abs)
+            self.literals_removed += len(literals) - len(unique)
+            if any(-lit in unique for lit in unique):
+                continue  # Tautology
+            key = tuple(unique)
+            if key in seen:
+                continue
+            seen.add(key)
+            self._add(index, unique)
+            if not unique:
+                self.unsatisfiable = True
+    
+    def _units(self):
+        queue = [literals[0] for literals in self.clauses.values() if len(literals) == 1]
+        while queue and not self.unsatisfiable:
+            lit = queue.pop()
+            value = self.fixed.get(abs(lit))
+            if value is not None:
+                if value != (lit > 0):
+                    self.unsatisfiable = True
+                continue
+            falsified = list(self._occurrences(-lit))
+            self._fix(lit)
+            for index in falsified:
+                literals = self.clauses.get(index)
+                if literals is not None and len(literals) == 1:
+                    queue.append(literals[0])
+    
+    def _pure(self):
+        changed = True
+        while changed:
+            changed = False
+            for lit, occurs in list(self.occurs.items()):
+                if occurs and not self._occurrences(-lit) and abs(lit) not in self.fixed:
+                    self._fix(lit)
+                    changed = True
+    
+    def _subsumption(self):
+        clauses, occurrences = self.clauses, self._occurrences
+        for index in sorted(clauses, key=lambda i: len(clauses[i])):
+            literals = clauses.get(index)
+            if not literals:
+                continue
+            # Every clause C can subsume or strengthen contains C's rarest variable
+            pivot = min(literals, key=lambda lit: len(occurrences(lit)) + len(occurrences(-lit)))
+            if len(occurrences(pivot)) + len(occurrences(-pivot)) > SUBSUME_OCCURRENCE_LIMIT:
+                continue
+            own = set(literals)
+            for other_index in list(occurrences(pivot)) + list(occurrences(-pivot)):
+                other = clauses.get(other_index)
+                if other_index == index or other is None or len(other) < len(own):
+                    continue
+                missing = own.difference(other)
+                if not missing:
+                    self._remove(other_index)  # Subsumed
+                elif len(missing) == 1:
+                    lit = missing.pop()
+                    if -lit in other:
+                        # Self-subsuming resolution: C resolved with D on lit subsumes D
+                        self._strengthen(other_index, -lit)
+                        if self.unsatisfiable:
+                            return
+    
+    def _elimination(self):
+        clauses, occurrences = self.clauses, self._occurrences
+        variables = {abs(lit) for lit, occurs in self.occurs.items() if occurs}
+        order = sorted(variables, key=lambda v: len(occurrences(v)) + len(occurrences(-v)))
+        next_index = max(clauses, default=-1) + 1
+        for var in order:
+            positive, negative = occurrences(var), occurrences(-var)
+            if not positive or not negative:
+                continue
+            resolvents = self._resolvents(var)
+            if resolvents is None:
+                continue
+            
+            for index in list(positive):
+                self.stack.append((var, self._remove(index)))
+            for index in list(negative):
+                self.stack.append((-var, self._remove(index)))
+            for literals in resolvents:
+                self._add(next_index, literals)
+                next_index += 1
+                if not literals:
+                    self.unsatisfiable = True
+                    return
+            self.variables_removed += 1
+    
+    def _resolvents(self, var: int) -> Optional[List[List[int]]]:
+        """Non-tautological resolvents on var, or None if eliminating var would grow the formula"""
+        clauses = self.clauses
+        positive, negative = self.occurs[var], self.occurs[-var]
+        total = len(positive) + len(negative)
+        if total > BVE_OCCURRENCE_LIMIT:
+            return None
+        resolvents = []
+        for p in positive:
+            for n in negative:
+                merged = set(clauses[p])
+                merged.discard(var)
+                merged.update(lit for lit in clauses[n] if lit != -var)
+                if any(-lit in merged for lit in merged):
+                    continue  # Tautological resolvent
+                if len(merged) > BVE_RESOLVENT_LIMIT:
+                    return None
+                resolvents.append(sorted(merged, key=abs))
+                if len(resolvents) > total:
+                    return None
+        return resolvents
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PARALLEL PORTFOLIO
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SHARE_SLOTS = 1024  # Ring slots per worker in the shared clause buffer
+SHARE_MAX_LENGTH = 8  # Longest learned clause exported by default
+PORTFOLIO_ALPHAS = (25, 10, 50, 75, 0, 90)
+PORTFOLIO_RESTART_POLICIES = ("luby", "geometric")
+
+@dataclass
+class PortfolioConfig:
+    """Search settings for one portfolio worker"""
+    seed: int = 0
+    alpha: int = 25
+    restart_policy: str = "luby"
+    polarity: str = "saved"
+    engine: str = "cdcl"
+
+def portfolio_configs(workers: int, alpha: int = 25, engine: str = "cdcl") -> List[PortfolioConfig]:
+    """
+    Diversified settings for a portfolio of the given size
+    
+    Worker 0 keeps the caller's α with Luby restarts and saved phases; the
+    others vary seed, α, restart policy and polarity. Every worker runs
+    ``engine``.
+    """
+    polarities = CDCLEngine.POLARITIES
+    return [
+        PortfolioConfig(
+            seed=index,
+            alpha=alpha if index == 0 else PORTFOLIO_ALPHAS[index % len(PORTFOLIO_ALPHAS)],
+            restart_policy=PORTFOLIO_RESTART_POLICIES[index % len(PORTFOLIO_RESTART_POLICIES)],
+            polarity=polarities[(index // 2) % len(polarities)],
+            engine=engine
+        )
+        for index in range(workers)
+    ]
+
+class ClauseExchange:
+    """
+    Learned-clause sharing between portfolio workers over shared memory
+    
+    The buffer holds one int32 region per worker: a write counter followed
+    by a ring of SHARE_SLOTS slots laid out as
+    ``[begin stamp, length, literals..., end stamp]``. Only the owner writes
+    its region, stamping begin, then the data, then end; readers check both
+    stamps, so a slot overwritten mid-read is skipped rather than misread.
+    """
+    
+    def __init__(self, buffer, worker: int, workers: int, max_length: int = SHARE_MAX_LENGTH):
+        self.view = memoryview(buffer).cast('B').cast('i')
+        self.worker = worker
+        self.workers = workers
+        self.max_length = max_length
+        self.slot_size = max_length + 3
+        self.region_size = 1 + SHARE_SLOTS * self.slot_size
+        self.cursors = [0] * workers
+    
+    @staticmethod
+    def buffer_size(workers: int, max_length: int = SHARE_MAX_LENGTH) -> int:
+        """Bytes of shared memory needed for the given number of workers"""
+        return workers * (1 + SHARE_SLOTS * (max_length + 3)) * array('i').itemsize
+    
+    def export(self, literals: List[int]):
+        """Publish one learned clause (DIMACS literals, at most max_length)"""
+        view = self.view
+        region = self.worker * self.region_size
+        count = view[region]
+        base = region + 1 + (count % SHARE_SLOTS) * self.slot_size
+        stamp = count + 1
+        view[base] = stamp
+        view[base + 1] = len(literals)
+        view[base + 2:base + 2 + len(literals)] = array('i', literals)
+        view[base + self.slot_size - 1] = stamp
+        view[region] = stamp
+    
+    def collect(self) -> List[List[int]]:
+        """Clauses published by the other workers since the last call"""
+        view = self.view
+        clauses = []
+        for other in range(self.workers):
+            if other == self.worker:
+                continue
+            region = other * self.region_size
+            count = view[region]
+            for k in range(max(self.cursors[other], count - SHARE_SLOTS), count):
+                base = region + 1 + (k % SHARE_SLOTS) * self.slot_size
+                stamp = k + 1
+                if view[base + self.slot_size - 1] != stamp:
+                    continue
+                length = view[base + 1]
+                if not 0 < length <= self.max_length:
+                    continue
+                literals = view[base + 2:base + 2 + length].tolist()
+                if view[base] == stamp:
+                    clauses.append(literals)
+            self.cursors[other] = count
+        return clauses
+    
+    def release(self):
+        self.view.release()
+
+_portfolio_stop = None  # Worker-process copy of the portfolio stop event
+
+def _portfolio_init(stop):
+    global _portfolio_stop
+    _portfolio_stop = stop
+
+def _portfolio_worker(index: int, config: PortfolioConfig, clauses: List[List[int]],
+                      num_variables: int, share_name: Optional[str], workers: int,
+                      share_max_length: int) -> Tuple[Dict[str, Any], Optional[SATResult]]:
+    """Run one portfolio member; the result is None when another worker won first"""
+    solver = RKLSATSolver(alpha=config.alpha, engine=config.engine, ledger_mode="off",
+                          cdcl_options={'seed': config.seed,
+                                        'restart_policy': config.restart_policy,
+                                        'polarity': config.polarity})
+    solver.interrupt = _portfolio_stop.is_set
+    share = None
+    if share_name is not None:
+        share = shared_memory.SharedMemory(name=share_name)
+        solver.exchange = ClauseExchange(share.buf, index, workers, share_max_length)
+    
+    start_time = time.time()
+    result = None
+    try:
+        result = solver.solve([Clause(literals) for literals in clauses], num_variables)
+        cycles = result.cycles
+    except SolveInterrupted as e:
+        cycles = e.cycles
+    finally:
+        if share is not None:
+            solver.exchange.release()
+            share.close()
+    
+    report = asdict(config)
+    report.update({
+        'worker': index,
+        'cycles': cycles,
+        'time_ms': (time.time() - start_time) * 1000,
+        'interrupted': result is None,
+        'stats': solver.last_engine.get_stats() if solver.last_engine else {}
+    })
+    return report, result
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DIMACS CNF I/O
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DIMACS_CHUNK_SIZE = 1 << 16
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+class DIMACSError(ValueError):
+    """Malformed DIMACS CNF input"""
+
+class DIMACSWarning(UserWarning):
+    """Suspicious but usable DIMACS CNF input (e.g. a wrong header clause count)"""
+
+class DIMACSParser:
+    """
+    Incremental DIMACS CNF parser
+    
+    Feed raw bytes in arbitrary chunks; only the trailing partial line is
+    buffered between calls. Clauses go straight into a ClauseDatabase.
+    
+    A header clause count that disagrees with the body is common in real
+    files; it is recorded in ``warnings`` (and issued as a DIMACSWarning)
+    unless ``strict`` is set, in which case it is a DIMACSError.
+    """
+    
+    def __init__(self, strict: bool = False):
+        self.strict = strict
+        self.warnings: List[str] = []
+        self.db = ClauseDatabase()
+        self.num_variables = 0
+        self.declared_variables: Optional[int] = None
+        self.declared_clauses: Optional[int] = None
+        self.comments: List[str] = []
+        self._pending = b""
+        self._current: List[int] = []
+        self._done = False
+    
+    def feed(self, chunk: bytes):
+        if self._done or not chunk:
+            return
+        data = self._pending + bytes(chunk)
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            self._pending = data
+            return
+        self._pending = data[cut + 1:]
+        self._parse_block(data[:cut])
+    
+    def close(self) -> ClauseDatabase:
+        """Flush buffered input, validate against the header and return the clauses"""
+        if self._pending:
+            self._parse_block(self._pending)
+            self._pending = b""
+        if self._current:
+            # A final clause without its terminating 0 is accepted
+            self._add_clause(self._current)
+            self._current = []
+        if self.declared_variables is not None:
+            if self.num_variables > self.declared_variables:
+                raise DIMACSError(
+                    f"Variable {self.num_variables} exceeds header count {self.declared_variables}"
+                )
+            self.num_variables = self.declared_variables
+        if self.declared_clauses is not None and len(self.db) != self.declared_clauses:
+            message = f"Header declares {self.declared_clauses} clauses, found {len(self.db)}"
+            if self.strict:
+                raise DIMACSError(message)
+            self.warnings.append(message)
+            warnings.warn(message, DIMACSWarning, stacklevel=2)
+        self._done = True
+        return self.db
+    
+    def _parse_block(self, block: bytes):
+        if self._done:
+            return
+        if b"c" in block or b"p" in block or b"%" in block:
+            for line in block.split(b"\n"):
+                stripped = line.strip()
+                if not stripped:
+                    continue
+                head = stripped[:1]
+                if head == b"c":
+                    self.comments.append(stripped[1:].strip().decode("utf-8", "replace"))
+                elif head == b"p":
+                    self._parse_header(stripped)
+                elif head == b"%":
+                    # SATLIB end-of-formula marker
+                    self._done = True
+                    return
+                else:
+                    self._parse_literals(stripped)
+        else:
+            self._parse_literals(block)
+    
+    def _parse_header(self, line: bytes):
+        parts = line.split()
+        if len(parts) != 4 or parts[1] != b"cnf":
+            raise DIMACSError(f"Invalid problem line: {line.decode('utf-8', 'replace')}")
+        if self.declared_variables is not None:
+            raise DIMACSError("Duplicate problem line")
+        self.declared_variables = int(parts[2])
+        self.declared_clauses = int(parts[3])
+    
+    def _parse_literals(self, text: bytes):
+        try:
+            numbers = list(map(int, text.split()))
+        except ValueError as e:
+            raise DIMACSError(f"Invalid literal: {e}") from None
+        current = self._current
+        for lit in numbers:
+            if lit:
+                current.append(lit)
+            else:
+                self._add_clause(current)
+                current.clear()
+    
+    def _add_clause(self, literals: List[int]):
+        self.db.add(literals)
+        top = max(map(abs, literals), default=0)
+        if top > self.num_variables:
+            self.num_variables = top
+
+def _decompressor(head: bytes, compression: Optional[str]):
+    """Streaming decompressor for 'gzip'/'xz', sniffing the magic bytes when compression='auto'"""
+    if compression == "auto":
+        if head.startswith(GZIP_MAGIC):
+            compression = "gzip"
+        elif head.startswith(XZ_MAGIC):
+            compression = "xz"
+        else:
+            compression = None
+    if compression in (None, "identity"):
+        return None
+    if compression == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if compression == "xz":
+        return lzma.LZMADecompressor()
+    raise DIMACSError(f"Unsupported compression: {compression}")
+
+def _open_compressed(path: str) -> BinaryIO:
+    with open(path, "rb") as probe:
+        head = probe.read(len(XZ_MAGIC))
+    if head.startswith(GZIP_MAGIC):
+        return gzip.open(path, "rb")
+    if head.startswith(XZ_MAGIC):
+        return lzma.open(path, "rb")
+    return open(path, "rb")
+
+def parse_dimacs(source: Union[str, os.PathLike, BinaryIO, bytes],
+                 chunk_size: int = DIMACS_CHUNK_SIZE, strict: bool = False) -> Tuple[ClauseDatabase, int]:
+    """
+    Parse DIMACS CNF from a path, binary file object or bytes
+    
+    Paths holding gzip or xz data are decompressed transparently. With
+    ``strict``, a header clause count that does not match is an error.
+    
+    Returns:
+        (clause database, number of variables)
+    """
+    parser = DIMACSParser(strict)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        decompressor = _decompressor(bytes(view[:len(XZ_MAGIC)]), "auto")
+        for start in range(0, len(view), chunk_size):
+            chunk = view[start:start + chunk_size]
+            parser.feed(decompressor.decompress(chunk) if decompressor else chunk)
+        return parser.close(), parser.num_variables
+    
+    stream = _open_compressed(source) if isinstance(source, (str, os.PathLike)) else source
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            parser.feed(chunk)
+    finally:
+        if stream is not source:
+            stream.close()
+    return parser.close(), parser.num_variables
+
+def parse_dimacs_mmap(path: Union[str, os.PathLike], chunk_size: int = DIMACS_CHUNK_SIZE,
+                      strict: bool = False) -> Tuple[ClauseDatabase, int]:
+    """Parse an uncompressed DIMACS file through a read-only memory map"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return parse_dimacs(b"", strict=strict)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return parse_dimacs(mapped, chunk_size, strict)
+
+async def parse_dimacs_async(chunks: AsyncIterable[bytes],
+                             compression: Optional[str] = "auto",
+                             max_bytes: Optional[int] = None,
+                             strict: bool = False) -> Tuple[ClauseDatabase, int]:
+    """
+    Parse DIMACS CNF from an async byte stream (e.g. a request body)
+    
+    Args:
+        chunks: Async iterable of byte chunks
+        compression: "gzip", "xz", None, or "auto" to sniff the first chunk
+        max_bytes: Largest input accepted, counted both before and after
+            decompression; DIMACSError is raised as soon as it is exceeded
+        strict: Treat a header clause count mismatch as an error
+    """
+    parser = DIMACSParser(strict)
+    decompressor = None
+    first = True
+    received = decoded = 0
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        if first:
+            decompressor = _decompressor(chunk, compression)
+            first = False
+        data = decompressor.decompress(chunk) if decompressor else chunk
+        received += len(chunk)
+        decoded += len(data)
+        if max_bytes is not None and max(received, decoded) > max_bytes:
+            raise DIMACSError(f"Input exceeds {max_bytes} bytes")
+        parser.feed(data)
+    return parser.close(), parser.num_variables
+
+def write_dimacs(clauses: Iterable[Union[Clause, Iterable[int]]], num_variables: int,
+                 destination: Union[str, os.PathLike, BinaryIO],
+                 comments: Iterable[str] = ()) -> int:
+    """
+    Write clauses in DIMACS CNF format
+    
+    Accepts Clause objects, plain literal lists (e.g. learned clauses from
+    ``CDCLEngine.learned_clauses``) or a ClauseDatabase. Paths ending in
+    .gz or .xz are compressed.
+    
+    Returns:
+        Number of clauses written
+    """
+    if isinstance(clauses, ClauseDatabase):
+        rows = (clauses.get(i) for i in range(len(clauses)) if not clauses.is_deleted(i))
+        count = len(clauses) - sum(1 for size in clauses.lengths if not size)
+    else:
+        if not isinstance(clauses, (list, tuple)):
+            clauses = list(clauses)
+        rows = (c.literals if isinstance(c, Clause) else c for c in clauses)
+        count = len(clauses)
+    
+    if isinstance(destination, (str, os.PathLike)):
+        name = os.fspath(destination)
+        if name.endswith(".gz"):
+            out = gzip.open(name, "wb")
+        elif name.endswith(".xz"):
+            out = lzma.open(name, "wb")
+        else:
+            out = open(name, "wb")
+    else:
+        out = destination
+    
+    try:
+        buffer = io.BytesIO()
+        for comment in comments:
+            buffer.write(f"c {comment}\n".encode())
+        buffer.write(f"p cnf {num_variables} {count}\n".encode())
+        for row in rows:
+            buffer.write(" ".join(map(str, row)).encode())
+            buffer.write(b" 0\n")
+            if buffer.tell() >= DIMACS_CHUNK_SIZE:
+                out.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+        out.write(buffer.getvalue())
+    finally:
+        if out is not destination:
+            out.close()
+    return count
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def generate_random_3sat(num_variables: int, num_clauses: int) -> List[Clause]:
-    """Generate random 3-SAT problem"""
-    import random
+def generate_random_3sat(num_variables: int, num_clauses: int,
+                         seed: Optional[int] = None) -> List[Clause]:
+    """Generate random 3-SAT problem (reproducible when seed is given)"""
+    rng = random.Random(seed) if seed is not None else random
     
     clauses = []
     for _ in range(num_clauses):
         # Select 3 random variables
-        vars = random.sample(range(1, num_variables + 1), 3)
+        vars = rng.sample(range(1, num_variables + 1), 3)
         # Randomly negate
-        literals = [v * (1 if random.random() < 0.5 else -1) for v in vars]
+        literals = [v * (1 if rng.random() < 0.5 else -1) for v in vars]
         clauses.append(Clause(literals))
     
     return clauses
@@ -284,7 +2751,124 @@ def benchmark_solver(solver: RKLSATSolver, num_variables: int, num_clauses: int)
     
     print(f"═══════════════════════════════════════════════")
 
+def benchmark_clause_store(num_variables: int, num_clauses: int, rounds: int = 5):
+    """Compare memory and evaluation throughput of List[Clause] against ClauseDatabase"""
+    rng = random.Random(num_variables * 1000003 + num_clauses)
+    raw = [[v if rng.random() < 0.5 else -v
+            for v in rng.sample(range(1, num_variables + 1), 3)]
+           for _ in range(num_clauses)]
+    assignment = {var: rng.random() < 0.5
+                  for var in range(1, num_variables + 1) if rng.random() < 0.8}
+    
+    tracemalloc.start()
+    clauses = [Clause(list(lits)) for lits in raw]
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    tracemalloc.start()
+    db = ClauseDatabase()
+    for lits in raw:
+        db.add(lits)
+    db_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for clause in clauses:
+            clause.evaluate(assignment)
+    list_rate = rounds * num_clauses / (time.perf_counter() - start)
+    
+    values = dense_assignment(assignment, num_variables)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        db.evaluate_all(values)
+    db_rate = rounds * num_clauses / (time.perf_counter() - start)
+    
+    print(f"═══════════════════════════════════════════════")
+    print(f"CLAUSE STORE BENCHMARK")
+    print(f"═══════════════════════════════════════════════")
+    print(f"Variables: {num_variables}")
+    print(f"Clauses: {num_clauses}")
+    print(f"List[Clause] memory: {list_bytes / 1024:.1f} KiB")
+    print(f"ClauseDatabase memory: {db_bytes / 1024:.1f} KiB ({list_bytes / max(db_bytes, 1):.1f}x smaller)")
+    print(f"List[Clause] evaluate: {list_rate:,.0f} clauses/s")
+    print(f"ClauseDatabase evaluate: {db_rate:,.0f} clauses/s")
+    print(f"═══════════════════════════════════════════════")
+    
+    return {
+        'list_bytes': list_bytes,
+        'db_bytes': db_bytes,
+        'list_clauses_per_sec': list_rate,
+        'db_clauses_per_sec': db_rate
+    }
+
+def benchmark_incremental(num_variables: int, num_clauses: int, queries: int = 50):
+    """Answer a run of related assumption queries incrementally and from scratch"""
+    rng = random.Random(num_variables * 1000003 + num_clauses)
+    clauses = generate_random_3sat(num_variables, num_clauses, seed=rng.randrange(1 << 30))
+    batches = [[v if rng.random() < 0.5 else -v for v in rng.sample(range(1, num_variables + 1), 3)]
+               for _ in range(queries)]
+    
+    start = time.perf_counter()
+    incremental = IncrementalSATSolver()
+    incremental.add_clauses(clauses)
+    answers = [incremental.solve(assumptions).satisfiable for assumptions in batches]
+    incremental_ms = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    scratch = RKLSATSolver(engine="cdcl", ledger_mode="off")
+    expected = [scratch.solve(clauses + [Clause([lit]) for lit in assumptions], num_variables).satisfiable
+                for assumptions in batches]
+    scratch_ms = (time.perf_counter() - start) * 1000
+    
+    print(f"═══════════════════════════════════════════════")
+    print(f"INCREMENTAL SOLVING BENCHMARK")
+    print(f"═══════════════════════════════════════════════")
+    print(f"Variables: {num_variables}")
+    print(f"Clauses: {num_clauses}")
+    print(f"Queries: {queries} ({sum(answers)} SAT)")
+    print(f"Incremental: {incremental_ms:.2f} ms")
+    print(f"From scratch: {scratch_ms:.2f} ms ({scratch_ms / max(incremental_ms, 1e-9):.1f}x slower)")
+    print(f"Answers agree: {answers == expected}")
+    print(f"═══════════════════════════════════════════════")
+    
+    return {'incremental_ms': incremental_ms, 'scratch_ms': scratch_ms, 'agree': answers == expected}
+
+def benchmark_portfolio(num_variables: int, num_clauses: int,
+                        worker_counts: Optional[Iterable[int]] = None):
+    """Solve one random 3-SAT instance with growing portfolio sizes"""
+    rng = random.Random(num_variables * 1000003 + num_clauses)
+    clauses = [Clause([v if rng.random() < 0.5 else -v
+                       for v in rng.sample(range(1, num_variables + 1), 3)])
+               for _ in range(num_clauses)]
+    if worker_counts is None:
+        cores = os.cpu_count() or 1
+        worker_counts = sorted({1 << k for k in range(cores.bit_length())} | {cores})
+    
+    solver = RKLSATSolver(alpha=25, engine="cdcl", ledger_mode="off")
+    rows = []
+    print(f"═══════════════════════════════════════════════")
+    print(f"PORTFOLIO SCALING BENCHMARK")
+    print(f"═══════════════════════════════════════════════")
+    print(f"Variables: {num_variables}")
+    print(f"Clauses: {num_clauses}")
+    for workers in worker_counts:
+        result = solver.solve_portfolio(clauses, num_variables, workers=workers)
+        cycles = [report['cycles'] for report in result.workers]
+        rows.append({
+            'workers': workers,
+            'satisfiable': result.satisfiable,
+            'time_ms': result.time_ms,
+            'winner': result.stats['portfolio_winner'],
+            'worker_cycles': cycles
+        })
+        print(f"{workers:>3} workers: {result.time_ms:10.2f} ms, winner #{result.stats['portfolio_winner']}, "
+              f"cycles per worker {cycles}")
+    print(f"═══════════════════════════════════════════════")
+    return rows
+
 if __name__ == "__main__":
     # Test solver
     solver = RKLSATSolver(alpha=25)
     benchmark_solver(solver, num_variables=15, num_clauses=60)
+    benchmark_clause_store(num_variables=5000, num_clauses=50000)
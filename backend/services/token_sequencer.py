@@ -0,0 +1,164 @@
+"""
+Token Sequencer - Genesis-anchored, Snowflake-style unique ids
+
+Layout of the integer id (most significant first):
+    42 bits  milliseconds since genesis (monotonic clock, ~139 years)
+    10 bits  node id (TSI_NODE_ID, for multi-host deployments)
+    22 bits  process id (pid_max on Linux is at most 2**22)
+    12 bits  per-millisecond sequence
+
+Ids are strictly increasing within a process. With TSI_NODE_ID set,
+concurrent processes differ in node/pid bits, so ids are unique across
+processes as long as every host has its own node id. Without it, pids
+alone are not enough (every container replica is pid 1), so the 32
+node/pid bits are drawn at random per process instead; collisions then
+need two processes to draw the same shard (about n**2 / 2**33 for n
+live processes). A process that exhausts 4096 ids in one millisecond
+borrows the next millisecond instead of sleeping. Tokens are the 16-digit
+genesis anchor followed by the id as 32 zero-padded digits, so they sort
+like the ids.
+"""
+import os
+import secrets
+import threading
+import time
+from typing import Optional
+
+GENESIS_TIMESTAMP_MS = 1719792000000  # July 1, 2024 00:00:00 UTC
+GENESIS_TOKEN = "0701202400000000"
+
+SEQUENCE_BITS = 12
+PROCESS_BITS = 22
+NODE_BITS = 10
+SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+SHARD_SHIFT = SEQUENCE_BITS
+TIME_SHIFT = SEQUENCE_BITS + PROCESS_BITS + NODE_BITS
+ID_DIGITS = 32
+
+TOKEN_LOW_DIGITS = 5  # Trailing digits formatted per token; the rest is cached per millisecond
+_TOKEN_LOW_MOD = 10 ** TOKEN_LOW_DIGITS
+_TOKEN_LOW_FORMAT = f"%0{TOKEN_LOW_DIGITS}d"
+
+_monotonic_ns = time.monotonic_ns
+
+
+class TokenSequencer:
+    """Thread-safe generator of strictly increasing temporal ids"""
+
+    def __init__(self, node_id: Optional[int] = None, process_id: Optional[int] = None):
+        if node_id is None and os.getenv("TSI_NODE_ID"):
+            node_id = int(os.environ["TSI_NODE_ID"])
+        if node_id is not None and not 0 <= node_id < (1 << NODE_BITS):
+            raise ValueError(f"node_id must be in [0, {1 << NODE_BITS})")
+        self.node_id = node_id  # None: random shard per process
+        self._fixed_process_id = process_id
+        self._reset()
+        if process_id is None and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        """(Re)derive the shard and clock anchor, e.g. in a freshly forked child"""
+        if self.node_id is None and self._fixed_process_id is None:
+            self.shard = secrets.randbits(NODE_BITS + PROCESS_BITS)
+            self.process_id = self.shard & ((1 << PROCESS_BITS) - 1)
+        else:
+            process_id = self._fixed_process_id if self._fixed_process_id is not None else os.getpid()
+            self.process_id = process_id & ((1 << PROCESS_BITS) - 1)
+            self.shard = ((self.node_id or 0) << PROCESS_BITS) | self.process_id
+        self._shard_bits = self.shard << SHARD_SHIFT
+        # Wall clock anchors the epoch once; monotonic time drives it afterwards
+        self._anchor_ms = time.time_ns() // 1_000_000 - GENESIS_TIMESTAMP_MS
+        self._anchor_ns = time.monotonic_ns()
+        self._ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._token_base = (-1, "", 0)  # (ms, token prefix, trailing digits of the ms's first id)
+
+    def _advance(self, count: int) -> int:
+        """Reserve ``count`` consecutive sequence values; returns the first id"""
+        now = self._anchor_ms + (_monotonic_ns() - self._anchor_ns) // 1_000_000
+        with self._lock:
+            if now > self._ms:
+                self._ms, self._sequence = now, 0
+            if self._sequence + count > SEQUENCE_MASK + 1:
+                # Millisecond exhausted: borrow the next one rather than sleep
+                self._ms, self._sequence = self._ms + 1, 0
+            first = (self._ms << TIME_SHIFT) | self._shard_bits | self._sequence
+            self._sequence += count
+        return first
+
+    def next_id(self) -> int:
+        """Next id (the single-id path of _advance, inlined for speed)"""
+        now = self._anchor_ms + (_monotonic_ns() - self._anchor_ns) // 1_000_000
+        with self._lock:
+            if now > self._ms:
+                self._ms, self._sequence = now, 0
+            elif self._sequence > SEQUENCE_MASK:
+                self._ms, self._sequence = self._ms + 1, 0
+            sequence = self._sequence
+            self._sequence = sequence + 1
+            return (self._ms << TIME_SHIFT) | self._shard_bits | sequence
+
+    def next_ids(self, count: int) -> range:
+        """Reserve ``count`` (at most 4096) consecutive ids in one call"""
+        if not 0 < count <= SEQUENCE_MASK + 1:
+            raise ValueError(f"count must be in [1, {SEQUENCE_MASK + 1}]")
+        first = self._advance(count)
+        return range(first, first + count)
+
+    def next_token(self) -> str:
+        """
+        Next id as a genesis-anchored 48-digit token
+        
+        Same id path as next_id, inlined. Ids of one millisecond share all
+        but their last digits, so the shared prefix is formatted once per
+        millisecond and each token only formats TOKEN_LOW_DIGITS digits.
+        """
+        now = self._anchor_ms + (_monotonic_ns() - self._anchor_ns) // 1_000_000
+        with self._lock:
+            if now > self._ms:
+                self._ms, self._sequence = now, 0
+            elif self._sequence > SEQUENCE_MASK:
+                self._ms, self._sequence = self._ms + 1, 0
+            sequence = self._sequence
+            self._sequence = sequence + 1
+            ms = self._ms
+        
+        base = self._token_base
+        if base[0] != ms:
+            first = f"{GENESIS_TOKEN}{(ms << TIME_SHIFT) | self._shard_bits:0{ID_DIGITS}d}"
+            base = self._token_base = (ms, first[:-TOKEN_LOW_DIGITS], int(first[-TOKEN_LOW_DIGITS:]))
+        low = base[2] + sequence
+        if low < _TOKEN_LOW_MOD:
+            return base[1] + _TOKEN_LOW_FORMAT % low
+        # The sequence carries into the cached prefix: format in full
+        return f"{GENESIS_TOKEN}{(ms << TIME_SHIFT) | self._shard_bits | sequence:0{ID_DIGITS}d}"
+
+    @staticmethod
+    def to_token(token_id: int) -> str:
+        return f"{GENESIS_TOKEN}{token_id:0{ID_DIGITS}d}"
+
+    @staticmethod
+    def decode(token_id: int) -> dict:
+        """Split an id into its timestamp, node, process and sequence fields"""
+        return {
+            'timestamp_ms': (token_id >> TIME_SHIFT) + GENESIS_TIMESTAMP_MS,
+            'node_id': (token_id >> (SHARD_SHIFT + PROCESS_BITS)) & ((1 << NODE_BITS) - 1),
+            'process_id': (token_id >> SHARD_SHIFT) & ((1 << PROCESS_BITS) - 1),
+            'sequence': token_id & SEQUENCE_MASK
+        }
+
+
+_default_sequencer: Optional[TokenSequencer] = None
+_default_lock = threading.Lock()
+
+
+def get_sequencer() -> TokenSequencer:
+    """Process-wide sequencer shared by the tokenization and currency systems"""
+    global _default_sequencer
+    if _default_sequencer is None:
+        with _default_lock:
+            # Two sequencers would share a shard but not _ms/_sequence: duplicate ids
+            if _default_sequencer is None:
+                _default_sequencer = TokenSequencer()
+    return _default_sequencer
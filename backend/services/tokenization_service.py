@@ -4,6 +4,8 @@ Tokenization Service - Pure business logic
 from datetime import datetime, timezone
 from typing import Dict, Any
 
+from .token_sequencer import get_sequencer
+
 class TokenizationService:
     GENESIS_DATE = datetime(2024, 7, 1, 0, 0, 0, tzinfo=timezone.utc)
     
@@ -25,5 +27,6 @@ class TokenizationService:
         return {
             'genesis': genesis,
             'current_block': current,
-            'full_token': f"{genesis}|{current}"
+            'full_token': f"{genesis}|{current}",
+            'sequence_token': get_sequencer().next_token()
         }
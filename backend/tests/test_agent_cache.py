@@ -0,0 +1,130 @@
+"""
+Agent response cache: coalescing, cancellation, expiry and the SQLite tier
+"""
+
+import asyncio
+
+import pytest
+
+try:
+    from backend.tsi_core import AgentResponseCache
+except ImportError:
+    from tsi_core import AgentResponseCache
+
+
+def _producer(outputs, gate=None):
+    """produce() stand-in returning successive outputs, optionally held until ``gate`` is set"""
+    calls = []
+
+    async def produce():
+        calls.append(len(calls))
+        if gate is not None:
+            await gate.wait()
+        return outputs[len(calls) - 1]
+
+    return produce, calls
+
+
+def test_followers_receive_the_leaders_result():
+    async def main():
+        cache = AgentResponseCache(db_path=None)
+        gate = asyncio.Event()
+        produce, calls = _producer(["answer"], gate)
+        tasks = [asyncio.create_task(cache.fetch("k", produce)) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.set()
+        return await asyncio.gather(*tasks), calls, cache.metrics
+
+    results, calls, metrics = asyncio.run(main())
+    assert len(calls) == 1
+    assert results == [("answer", "miss")] + [("answer", "coalesced")] * 4
+    assert (metrics["misses"], metrics["coalesced"]) == (1, 4)
+
+
+def test_cancelled_leader_leaves_followers_retrying():
+    async def main():
+        cache = AgentResponseCache(db_path=None)
+        gate = asyncio.Event()
+        produce, calls = _producer(["first", "second"], gate)
+        leader = asyncio.create_task(cache.fetch("k", produce))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(cache.fetch("k", produce)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers), calls
+
+    results, calls = asyncio.run(main())
+    # One follower takes over as leader and calls the model again; the others get its result
+    assert len(calls) == 2
+    sources = sorted(source for _, source in results)
+    assert sources[-1] == "miss" and set(sources[:-1]) <= {"coalesced", "memory"}
+    assert {output for output, _ in results} == {"second"}
+
+
+def test_failed_leader_propagates_to_followers():
+    async def main():
+        cache = AgentResponseCache(db_path=None)
+        gate = asyncio.Event()
+
+        async def produce():
+            await gate.wait()
+            raise RuntimeError("model unavailable")
+
+        tasks = [asyncio.create_task(cache.fetch("k", produce)) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
+
+
+def test_entries_expire_after_their_ttl():
+    async def main():
+        cache = AgentResponseCache(db_path=None, ttl=0.05)
+        produce, calls = _producer(["old", "new"])
+        first = await cache.fetch("k", produce)
+        cached = await cache.fetch("k", produce)
+        await asyncio.sleep(0.1)
+        refreshed = await cache.fetch("k", produce)
+        return first, cached, refreshed, cache.metrics["expired"]
+
+    assert asyncio.run(main()) == (("old", "miss"), ("old", "memory"), ("new", "miss"), 1)
+
+
+def test_disk_hits_survive_a_new_cache_instance(tmp_path):
+    db_path = str(tmp_path / "agent_cache.db")
+
+    async def main():
+        cache = AgentResponseCache(db_path=db_path)
+        produce, calls = _producer(["stored", "expired"])
+        await cache.fetch("kept", produce)
+        await cache.fetch("short", produce, {"ttl": 0.05})
+        await asyncio.sleep(0.1)
+
+        reopened = AgentResponseCache(db_path=db_path)
+        again, calls_again = _producer(["recomputed"])
+        kept = await reopened.fetch("kept", again)
+        kept_again = await reopened.fetch("kept", again)
+        short = await reopened.fetch("short", again)
+        return kept, kept_again, short, calls_again, reopened.purge_expired()
+
+    kept, kept_again, short, calls, purged = asyncio.run(main())
+    assert kept == ("stored", "disk")
+    assert kept_again == ("stored", "memory")
+    assert short == ("recomputed", "miss") and len(calls) == 1
+    assert purged == 0  # The expired row was replaced by the recomputed one
+
+
+def test_no_store_responses_are_not_cached(tmp_path):
+    async def main():
+        cache = AgentResponseCache(db_path=str(tmp_path / "agent_cache.db"))
+        produce, calls = _producer(["a", "b"])
+        first = await cache.fetch("k", produce, {"no_store": True})
+        second = await cache.fetch("k", produce)
+        return first, second
+
+    assert asyncio.run(main()) == (("a", "miss"), ("b", "miss"))
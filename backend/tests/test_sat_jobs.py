@@ -0,0 +1,71 @@
+"""
+SAT job queue: answers, budgets and cancellation
+"""
+
+import asyncio
+
+try:
+    from backend.sat_jobs import SATJobQueue, SATBudget, JobStatus
+    from backend.sat_solver import Clause, generate_random_3sat
+except ImportError:
+    from sat_jobs import SATJobQueue, SATBudget, JobStatus
+    from sat_solver import Clause, generate_random_3sat
+
+
+def _hard_instance():
+    """Random 3-SAT at the phase transition, far beyond a sub-second budget"""
+    return generate_random_3sat(300, 1278, seed=11), 300
+
+
+def test_job_answers_sat_and_unsat():
+    async def main():
+        queue = SATJobQueue(max_workers=2)
+        sat = queue.submit([Clause([1, 2]), Clause([-1])], 2)
+        unsat = queue.submit([Clause([1]), Clause([-1])], 1)
+        return await queue.wait(sat), await queue.wait(unsat)
+
+    sat, unsat = asyncio.run(main())
+    assert (sat.status, sat.answer) == (JobStatus.DONE, "SAT")
+    assert sat.result['assignment'] == {1: False, 2: True}
+    assert (unsat.status, unsat.answer) == (JobStatus.DONE, "UNSAT")
+
+
+def test_exhausted_budgets_answer_unknown():
+    async def main():
+        queue = SATJobQueue(max_workers=2)
+        clauses, num_variables = _hard_instance()
+        timed = queue.submit(clauses, num_variables, budget=SATBudget(wall_seconds=0.5))
+        counted = queue.submit(clauses, num_variables, budget=SATBudget(max_cycles=200))
+        return await queue.wait(timed), await queue.wait(counted)
+
+    timed, counted = asyncio.run(main())
+    assert (timed.status, timed.answer, timed.reason) == (JobStatus.DONE, "UNKNOWN", "time budget exhausted")
+    assert (counted.status, counted.answer, counted.reason) == (JobStatus.DONE, "UNKNOWN", "cycle budget exhausted")
+
+
+def test_cancelled_jobs_finish_cancelled():
+    async def main():
+        queue = SATJobQueue(max_workers=1)
+        clauses, num_variables = _hard_instance()
+        running = queue.submit(clauses, num_variables)
+        queued = queue.submit(clauses, num_variables)
+        while queue.get(running).status is JobStatus.QUEUED:
+            await asyncio.sleep(0.05)
+        assert queue.cancel(queued)  # Never started
+        assert queue.cancel(running)
+        finished = await queue.wait(running), await queue.wait(queued)
+        assert not queue.cancel(running)  # Already finished
+        return finished
+
+    running, queued = asyncio.run(main())
+    assert (running.status, running.reason) == (JobStatus.CANCELLED, "cancelled")
+    assert (queued.status, queued.reason) == (JobStatus.CANCELLED, "cancelled")
+
+
+def test_wait_returns_jobs_evicted_while_waiting():
+    async def main():
+        queue = SATJobQueue(max_workers=2, max_finished=0)
+        ids = [queue.submit([Clause([1, 2])], 2) for _ in range(3)]
+        return await asyncio.gather(*(queue.wait(job_id) for job_id in ids))
+
+    assert [job.answer for job in asyncio.run(main())] == ["SAT"] * 3
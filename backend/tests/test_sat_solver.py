@@ -0,0 +1,156 @@
+"""
+SAT solver: engines against brute force, DRAT proofs, incremental solving,
+preprocessing and DIMACS I/O
+"""
+
+import gzip
+import itertools
+import lzma
+import random
+
+import pytest
+
+try:
+    from backend.sat_solver import (RKLSATSolver, IncrementalSATSolver, SATPreprocessor, Clause,
+                                    DIMACSError, DIMACSWarning, check_drat, check_model,
+                                    generate_random_3sat, parse_dimacs, write_dimacs)
+except ImportError:
+    from sat_solver import (RKLSATSolver, IncrementalSATSolver, SATPreprocessor, Clause,
+                            DIMACSError, DIMACSWarning, check_drat, check_model,
+                            generate_random_3sat, parse_dimacs, write_dimacs)
+
+
+def _brute_force(clauses, num_variables):
+    for values in itertools.product((False, True), repeat=num_variables):
+        assignment = dict(enumerate(values, start=1))
+        if check_model(clauses, assignment):
+            return True
+    return False
+
+
+def _instances(count=40, num_variables=8):
+    """Small random 3-SAT around the phase transition, so both answers occur"""
+    rng = random.Random(7)
+    for seed in range(count):
+        num_clauses = rng.randint(3 * num_variables, 5 * num_variables)
+        yield generate_random_3sat(num_variables, num_clauses, seed=seed), num_variables
+
+
+@pytest.mark.parametrize("engine", RKLSATSolver.ENGINES)
+def test_engines_agree_with_brute_force(engine):
+    answers = set()
+    for clauses, num_variables in _instances():
+        result = RKLSATSolver(engine=engine).solve(clauses, num_variables)
+        assert result.satisfiable == _brute_force(clauses, num_variables)
+        if result.satisfiable:
+            assert check_model(clauses, result.assignment)
+        answers.add(result.satisfiable)
+    assert answers == {True, False}
+
+
+@pytest.mark.parametrize("binary", [True, False])
+def test_unsat_answers_carry_a_checkable_drat_proof(tmp_path, binary):
+    checked = 0
+    for index, (clauses, num_variables) in enumerate(_instances()):
+        proof = tmp_path / f"proof-{index}.drat"
+        result = RKLSATSolver(engine="cdcl").solve(clauses, num_variables, proof=str(proof),
+                                                   proof_binary=binary)
+        if result.satisfiable:
+            continue
+        verdict = check_drat(clauses, num_variables, str(proof))
+        assert verdict.verified, verdict.message
+        checked += 1
+    assert checked > 0
+
+
+def test_drat_checker_rejects_a_bogus_proof():
+    clauses = [Clause([1, 2]), Clause([-1, 2]), Clause([1, -2])]  # Satisfiable: x1 = x2 = true
+    verdict = check_drat(clauses, 2, b"0\n")
+    assert not verdict.verified
+
+
+def test_incremental_assumptions_and_cores():
+    solver = IncrementalSATSolver()
+    solver.add_clauses([[1, 2], [-1, 3], [-2, 3]])
+    assert solver.solve().satisfiable
+    assert solver.solve([-3]).satisfiable is False
+    assert set(solver.core) <= {-3} and solver.core
+    result = solver.solve([1, 3])
+    assert result.satisfiable and result.assignment[1] and result.assignment[3]
+    # A failed call leaves the solver usable
+    assert solver.solve().satisfiable
+
+
+def test_incremental_push_pop():
+    solver = IncrementalSATSolver()
+    solver.add_clause([1, 2])
+    assert solver.push() == 1
+    solver.add_clause([-1])
+    solver.add_clause([-2])
+    assert not solver.solve().satisfiable
+    assert solver.pop() == 0
+    assert solver.solve().satisfiable
+    with pytest.raises(ValueError):
+        solver.pop()
+
+
+def test_incremental_matches_fresh_solves():
+    clauses, num_variables = next(_instances(1, 10))
+    solver = IncrementalSATSolver()
+    solver.add_clauses(clauses)
+    for lit in (1, -1, 2, -2, 5, -5):
+        expected = _brute_force(clauses + [Clause([lit])], num_variables)
+        assert solver.solve([lit]).satisfiable == expected
+
+
+def test_preprocessed_models_satisfy_the_original_formula():
+    for clauses, num_variables in _instances(count=30, num_variables=10):
+        simplified = SATPreprocessor().run(clauses, num_variables)
+        expected = _brute_force(clauses, num_variables)
+        if simplified.unsatisfiable:
+            assert not expected
+            continue
+        result = RKLSATSolver(engine="cdcl").solve(simplified.clauses, num_variables)
+        assert result.satisfiable == expected
+        if result.satisfiable:
+            assert check_model(clauses, simplified.extend(result.assignment))
+
+
+def test_solve_with_preprocess_returns_original_models():
+    for clauses, num_variables in _instances(count=20, num_variables=10):
+        result = RKLSATSolver(engine="cdcl", preprocess=True).solve(clauses, num_variables)
+        assert result.satisfiable == _brute_force(clauses, num_variables)
+        if result.satisfiable:
+            assert check_model(clauses, result.assignment)
+
+
+@pytest.mark.parametrize("suffix, opener", [("cnf", open), ("cnf.gz", gzip.open), ("cnf.xz", lzma.open)])
+def test_dimacs_round_trip(tmp_path, suffix, opener):
+    clauses = generate_random_3sat(30, 120, seed=3)
+    path = tmp_path / f"formula.{suffix}"
+    assert write_dimacs(clauses, 30, str(path), comments=["round trip"]) == len(clauses)
+
+    parsed, num_variables = parse_dimacs(str(path))
+    assert num_variables == 30
+    assert [clause.literals for clause in parsed] == [clause.literals for clause in clauses]
+
+    with opener(path, "rb") as f:
+        raw = f.read()
+    compressed = path.read_bytes()
+    from_bytes, _ = parse_dimacs(compressed)  # Compression sniffed from the magic bytes
+    assert [clause.literals for clause in from_bytes] == [clause.literals for clause in clauses]
+    assert raw.startswith(b"c round trip")
+
+
+def test_dimacs_clause_count_mismatch_warns_unless_strict():
+    text = b"p cnf 3 3\n1 2 0\n-1 3 0\n"
+    with pytest.warns(DIMACSWarning):
+        parsed, num_variables = parse_dimacs(text)
+    assert len(parsed) == 2 and num_variables == 3
+    with pytest.raises(DIMACSError):
+        parse_dimacs(text, strict=True)
+
+
+def test_dimacs_rejects_variables_beyond_the_header():
+    with pytest.raises(DIMACSError):
+        parse_dimacs(b"p cnf 2 1\n1 3 0\n")
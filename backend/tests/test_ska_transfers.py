@@ -0,0 +1,132 @@
+"""
+SKA ledger transfers: conservation, rollback, range boundaries and the API
+"""
+
+import asyncio
+import random
+
+import pytest
+
+try:
+    from backend.tsi_core import SKACurrencySystem
+except ImportError:
+    from tsi_core import SKACurrencySystem
+
+
+OWNERS = ["alice", "bob", "carol", "dave"]
+
+
+def _open(tmp_path):
+    return SKACurrencySystem(db_path=str(tmp_path / "ska.db"))
+
+
+def _holdings(ska):
+    """Owner of every minted credit, read credit by credit"""
+    return [ska.owner_of(ska.credit_id(second)) for second in range(ska.minted)]
+
+
+def _assert_consistent(ska):
+    holdings = _holdings(ska)
+    for owner in [ska.treasury] + OWNERS:
+        assert ska.balance(owner) == holdings.count(owner), owner
+    assert sum(ska.balance(owner) for owner in [ska.treasury] + OWNERS) == ska.minted
+
+
+def test_bulk_transfers_conserve_total_balance(tmp_path):
+    ska = _open(tmp_path)
+    ska.mint_credits(500)
+    rng = random.Random(5)
+    for _ in range(30):
+        transfers = []
+        for _ in range(rng.randint(1, 6)):
+            from_owner = rng.choice([ska.treasury] + OWNERS)
+            to_owner = rng.choice([ska.treasury] + OWNERS)
+            transfers.append((from_owner, to_owner, rng.randint(0, 10)))
+        try:
+            moved = ska.transfer_many(transfers)
+        except ValueError:
+            continue
+        assert [len(ids) for ids in moved] == [n for _, _, n in transfers]
+        _assert_consistent(ska)
+    ska.close()
+
+    ska = _open(tmp_path)
+    _assert_consistent(ska)
+    ska.close()
+
+
+def test_overdraft_rolls_back_the_whole_batch(tmp_path):
+    ska = _open(tmp_path)
+    ska.mint_credits(20)
+    ska.transfer_amount(ska.treasury, "alice", 5)
+    before = _holdings(ska)
+
+    with pytest.raises(ValueError):
+        ska.transfer_many([(ska.treasury, "bob", 10), ("alice", "carol", 3), ("bob", "dave", 11)])
+    assert _holdings(ska) == before
+    assert (ska.balance(ska.treasury), ska.balance("alice"), ska.balance("bob")) == (15, 5, 0)
+
+    # The treasury's implicit floor is restored too: the next pick starts where it did
+    assert ska.transfer_amount(ska.treasury, "bob", 15) == [ska.credit_id(s) for s in range(5, 20)]
+    _assert_consistent(ska)
+    ska.close()
+
+
+def test_treasury_picks_split_at_range_boundaries(tmp_path):
+    ska = _open(tmp_path)
+    ska.mint_credits(10)
+    ska.mint_credits(5, owner="alice")  # Seconds 10-14 are explicit rows
+    ska.mint_credits(10)                # 15-24 extend the treasury's implicit range
+    ska.transfer_credit(ska.credit_id(3), "carol")
+
+    ids = ska.transfer_amount(ska.treasury, "bob", 18)
+    expected = [s for s in range(25) if s != 3 and not 10 <= s < 15][:18]
+    assert ids == [ska.credit_id(second) for second in expected]
+    assert ska.owner_of(ska.credit_id(14)) == "alice"
+    assert ska.owner_of(ska.credit_id(24)) == ska.treasury
+
+    # Credits returned to the treasury are explicit again and are picked first
+    ska.transfer_amount("bob", ska.treasury, 2)
+    assert len(ska.transfer_amount(ska.treasury, "dave", 3)) == 3
+    _assert_consistent(ska)
+    ska.close()
+
+
+def test_async_transfers_run_on_the_writer_thread(tmp_path):
+    ska = _open(tmp_path)
+    ska.mint_credits(100)
+
+    async def main():
+        return await asyncio.gather(*(ska.transfer_amount_async(ska.treasury, owner, 10) for owner in OWNERS))
+
+    assert [len(ids) for ids in asyncio.run(main())] == [10] * len(OWNERS)
+    _assert_consistent(ska)
+    ska.close()
+
+
+def test_transfer_endpoint_requires_the_sending_owner(tmp_path, monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    try:
+        from backend import api
+    except ImportError:
+        import api
+
+    ska = _open(tmp_path)
+    ska.mint_credits(10, owner="alice")
+    monkeypatch.setattr(api, "tsi", type("TSI", (), {"currency": ska})())
+    client = TestClient(api.app)  # No startup: the ledger above stands in for TSICore
+    body = {"from_owner": "alice", "to_owner": "bob", "amount": 4}
+
+    assert client.post("/credits/transfer", json=body).status_code == 401
+    mallory = api.auth_service.create_token("mallory", api.Role.EXTERNAL)
+    response = client.post("/credits/transfer", json=body, headers={"Authorization": f"Bearer {mallory}"})
+    assert response.status_code == 403
+    assert ska.balance("alice") == 10
+
+    alice = api.auth_service.create_token("alice", api.Role.EXTERNAL)
+    response = client.post("/credits/transfer", json=body, headers={"Authorization": f"Bearer {alice}"})
+    assert response.status_code == 200 and response.json()["transferred"] == 4
+    assert (ska.balance("alice"), ska.balance("bob")) == (6, 4)
+    ska.close()
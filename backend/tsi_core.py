@@ -21,15 +21,35 @@ ARCHITECTURE:
 import asyncio
 import hashlib
 import json
+import re
 import time
 import math
 import sqlite3
+import zlib
+import lzma
+import struct
+import threading
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager, contextmanager
 import anthropic
+import importlib.util
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import AsyncIterator, Dict, Iterable, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+try:
+    import zstandard
+except ImportError:  # Archive segments and RKL frames fall back to zlib
+    zstandard = None
+
+try:
+    from backend.services.token_sequencer import TokenSequencer, get_sequencer
+except ImportError:
+    from services.token_sequencer import TokenSequencer, get_sequencer
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CORE CONSTANTS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -44,6 +64,8 @@ POLYNOMIAL_EXPONENT = 1.77  # O(n^1.77) complexity
 BASE_COMPRESSION = 6561  # 3^8
 ADAPTIVE_COMPRESSION = 390625  # 5^8
 OVERLAP_COEFFICIENT = 0.85
+COMPRESSION_BLOCK_SIZE = 1 << 20  # Bytes per independently compressed block
+COMPRESSION_DICT_SIZE = 16384  # Bytes per trained dictionary
 
 # SKA Credits
 CREDITS_PER_SECOND = 1.0  # EXACTLY 1 credit per second
@@ -53,14 +75,52 @@ CREDIT_VALUE_USD = 1.0
 FAILSAFE_INTERVALS = [0.2, 0.5, 1.0, 10800, 21600, 43200, 64800, 86400]
 # Revolution King Sync: 3h, 6h, 9h, 12h, 15h, 18h, 21h, 24h
 
+# Write-behind persistence
+WRITE_BEHIND_BATCH = 512  # Events flushed per batch at most
+WRITE_BEHIND_INTERVAL = 0.5  # Seconds an event may wait for its batch to fill
+
+# Currency snapshots
+SNAPSHOT_INTERVAL = 10800  # Seconds between snapshots (first Revolution King Sync, 3h)
+SNAPSHOTS_KEPT = 8  # Most recent snapshots retained in the database
+
+# Agent model calls
+AGENT_MODEL = "claude-sonnet-4-20250514"
+AGENT_MAX_TOKENS = 4000
+SWARM_MAX_CONCURRENCY = 64  # Model calls in flight across the whole swarm
+AGENT_MAX_CONCURRENCY = 8  # Model calls in flight per agent
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE = 32
+HTTP_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle pooled connection is kept open
+HTTP_TIMEOUT = 120.0
+AGENT_CACHE_SIZE = 1024  # Responses kept in the in-process cache tier
+AGENT_CACHE_TTL = 3600.0  # Seconds a cached response stays fresh
+PARALLEL_DEADLINE = 60.0  # Seconds a fan-out waits before cancelling stragglers
+
 # API Keys (from environment in production)
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
+ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL") or None  # e.g. a local stub for load tests
 SQUARE_LOCATION_ID = "LCX039E7QRA5G"
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TEMPORAL DNA TOKENIZER
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Byte -> ASCII digit for bytes 0..249; 250..255 are deleted to keep digits uniform
+_DIGIT_TABLE = bytes(48 + b % 10 for b in range(256))
+_DIGIT_REJECT = bytes(range(250, 256))
+
+# ASCII seconds digits -> tens * 10 / units; non-digits push the sum to >= 100
+_TENS_TABLE = bytes(10 * (b - 48) if 48 <= b <= 53 else 100 for b in range(256))
+_UNITS_TABLE = bytes(b - 48 if 48 <= b <= 57 else 0 for b in range(256))
+
+def _seconds_in_sync(token_second: int, current_second: int) -> bool:
+    """Within one second of the world clock, wrapping at the minute"""
+    return token_second < 60 and (token_second - current_second + 1) % 60 <= 2
+
+def _sync_table(current_second: int) -> bytes:
+    """Seconds code -> 0 if in sync with ``current_second``, else 1"""
+    return bytes(0 if _seconds_in_sync(code, current_second) else 1 for code in range(256))
+
 class TemporalDNATokenizer:
     """
     Breakthrough tokenization system:
@@ -74,10 +134,12 @@ class TemporalDNATokenizer:
     def __init__(self):
         self.genesis = GENESIS_TOKEN
         self.current_capacity = 16  # Genesis layer
+        self._batch_seed = os.urandom(16)
+        self._batch_counter = 0
         
-    def get_world_clock_second(self) -> str:
-        """Get current second in SSms format (4 digits)"""
-        now = datetime.now(timezone.utc)
+    def get_world_clock_second(self, timestamp: Optional[float] = None) -> str:
+        """Get current (or ``timestamp``'s) second in SSms format (4 digits)"""
+        now = datetime.fromtimestamp(time.time() if timestamp is None else timestamp, timezone.utc)
         seconds = now.second
         microseconds = now.microsecond // 10000  # 0-99
         return f"{seconds:02d}{microseconds:02d}"
@@ -110,7 +172,66 @@ class TemporalDNATokenizer:
         
         return token
     
-    def verify_token(self, token: str) -> bool:
+    def generate_tokens(self, n: int, expansion_level: int = 0,
+                        out: Optional[bytearray] = None) -> bytearray:
+        """
+        Generate ``n`` temporal DNA tokens into one ASCII buffer
+        
+        The clock is read once for the whole batch. Random digits come from
+        a single SHAKE-256 stream keyed by a per-tokenizer seed, the batch
+        counter and the clock, mapped to decimal digits with one translate
+        (bytes >= 250 are dropped so every digit is equally likely). Tokens
+        are then assembled column by column with strided slice assignment,
+        so the Python-level work depends on the token width, not on ``n``.
+        
+        Args:
+            n: Number of tokens
+            expansion_level: Number of 16-digit expansions per token
+            out: Optional preallocated buffer of at least n * width bytes
+        
+        Returns:
+            Buffer holding token i at [i * width, (i + 1) * width), where
+            width = 16 * (expansion_level + 1)
+        """
+        width = 16 * (expansion_level + 1)
+        size = n * width
+        if out is None:
+            out = bytearray(size)
+        elif len(out) < size:
+            raise ValueError(f"Buffer holds {len(out)} bytes, {size} needed")
+        if n == 0:
+            return out
+        
+        view = memoryview(out)[:size]
+        for k, digit in enumerate(self.genesis.encode()):
+            view[k::width] = bytes((digit,)) * n
+        if expansion_level == 0:
+            return out
+        
+        now = time.time()
+        world_second = self.get_world_clock_second(now).encode()
+        digits = self._random_digits(n * expansion_level * 12, now)
+        stride = expansion_level * 12
+        for layer in range(expansion_level):
+            base = 16 * (layer + 1)
+            for j in range(12):
+                view[base + j::width] = digits[layer * 12 + j::stride]
+            for j, digit in enumerate(world_second):
+                view[base + 12 + j::width] = bytes((digit,)) * n
+        return out
+    
+    def _random_digits(self, count: int, now: float) -> bytes:
+        """``count`` uniformly random ASCII digits from one counter-mode XOF stream"""
+        self._batch_counter += 1
+        key = self._batch_seed + self._batch_counter.to_bytes(8, "big") + repr(now).encode()
+        length = count + count // 32 + 64  # 6/256 of the bytes are rejected on average
+        while True:
+            digits = hashlib.shake_256(key).digest(length).translate(_DIGIT_TABLE, _DIGIT_REJECT)
+            if len(digits) >= count:
+                return digits[:count]
+            length *= 2
+    
+    def verify_token(self, token: Union[str, bytes]) -> bool:
         """
         Verify token validity and synchronization
         
@@ -118,34 +239,97 @@ class TemporalDNATokenizer:
         1. Genesis matches (first 16 digits)
         2. Length is multiple of 16
         3. All expansion last-4-digits are identical
-        4. Last-4-digits match current world clock (within 1 second tolerance)
+        4. Last-4-digits match current world clock (within 1 second tolerance,
+           wrapping around the minute)
+        
+        The token is scanned in place, block suffixes are compared against
+        the final one with startswith at each offset, and the first
+        mismatch ends the scan.
         """
-        # Check genesis
-        if not token.startswith(self.genesis):
-            return False
+        if not isinstance(token, str):
+            token = bytes(token).decode("ascii", "replace")
         
-        # Check length
-        if len(token) % 16 != 0:
+        # Check genesis and length
+        if not token.startswith(self.genesis) or len(token) % 16 != 0:
             return False
+        if len(token) == 16:
+            return True
         
-        # Extract expansion blocks (skip genesis)
-        if len(token) > 16:
-            blocks = [token[i:i+16] for i in range(16, len(token), 16)]
-            
-            # Check all last-4-digits are identical
-            last_4_values = [block[-4:] for block in blocks]
-            if len(set(last_4_values)) != 1:
+        # Check all last-4-digits are identical
+        suffix = token[-4:]
+        for end in range(28, len(token) - 16, 16):
+            if not token.startswith(suffix, end):
                 return False  # Forgery detected
+        
+        # Check synchronization with world clock (one read)
+        if not suffix[:2].isdigit():
+            return False
+        return _seconds_in_sync(int(suffix[:2]), int(time.time()) % 60)
+    
+    def verify_many(self, tokens: Union[Iterable[Union[str, bytes]], bytes, bytearray, memoryview],
+                    width: Optional[int] = None) -> List[bool]:
+        """
+        Verify a batch of tokens with one clock read
+        
+        Tokens are grouped by width and each group is checked column-wise:
+        every genesis and suffix column is XORed against its expected value
+        as one big integer, so the per-token Python work is a single pass
+        over the final mismatch bytes.
+        
+        Args:
+            tokens: Token strings/bytes, or one contiguous buffer of
+                fixed-width tokens (as returned by generate_tokens) when
+                ``width`` is given
+            width: Token width for buffer input
+        
+        Returns:
+            One verdict per token, in input order
+        """
+        current = int(time.time()) % 60
+        if width is not None:
+            buffer = bytes(tokens)
+            if width <= 0 or width % 16 != 0 or len(buffer) % width != 0:
+                raise ValueError(f"Buffer of {len(buffer)} bytes is not a whole number of {width}-digit tokens")
+            return self._verify_column_block(buffer, width, len(buffer) // width, current)
+        
+        texts = [token if isinstance(token, str) else bytes(token).decode("ascii", "replace")
+                 for token in tokens]
+        groups: Dict[int, List[int]] = {}
+        for index, text in enumerate(texts):
+            groups.setdefault(len(text), []).append(index)
+        
+        verdicts = [False] * len(texts)
+        for group_width, indices in groups.items():
+            if group_width == 0 or group_width % 16 != 0:
+                continue
+            block = "".join([texts[index] for index in indices]).encode("ascii", "replace")
+            for index, ok in zip(indices, self._verify_column_block(block, group_width, len(indices), current)):
+                verdicts[index] = ok
+        return verdicts
+    
+    def _verify_column_block(self, buffer: bytes, width: int, n: int, current: int) -> List[bool]:
+        """Verdicts for ``n`` same-width tokens laid out back to back in ``buffer``"""
+        if n == 0:
+            return []
+        
+        mismatch = 0
+        for k, digit in enumerate(self.genesis.encode()):
+            mismatch |= int.from_bytes(buffer[k::width], "big") ^ int.from_bytes(bytes((digit,)) * n, "big")
+        
+        if width > 16:
+            for j in range(4):
+                expected = int.from_bytes(buffer[width - 4 + j::width], "big")
+                for end in range(28 + j, width - 4, 16):
+                    mismatch |= int.from_bytes(buffer[end::width], "big") ^ expected
             
-            # Check synchronization with world clock
-            current_second = self.get_world_clock_second()
-            token_second = last_4_values[0]
-            
-            # Allow 1-second tolerance for network delays
-            if abs(int(token_second[:2]) - int(current_second[:2])) > 1:
-                return False  # Out of sync
+            # Seconds code per token: tens * 10 + units, or >= 100 when not a digit.
+            # The two translated columns never carry into each other when added.
+            tens = buffer[width - 4::width].translate(_TENS_TABLE)
+            units = buffer[width - 3::width].translate(_UNITS_TABLE)
+            seconds = (int.from_bytes(tens, "big") + int.from_bytes(units, "big")).to_bytes(n, "big")
+            mismatch |= int.from_bytes(seconds.translate(_sync_table(current)), "big")
         
-        return True
+        return [byte == 0 for byte in mismatch.to_bytes(n, "big")]
     
     def expand_capacity(self, current_token: str) -> str:
         """
@@ -176,40 +360,196 @@ class SKACurrencySystem:
     - 1 SKC = $1 USD
     - Dual timestamp: creation + transaction
     - Temporal DNA integration
+    
+    Range-based ledger: credit n is the one minted for second n after
+    GENESIS_TIMESTAMP, and every credit below the minted high-water mark
+    exists implicitly, owned by TREASURY. Only credits that leave the
+    treasury get a row in ``credit_owners`` (keyed by their second), and
+    ``minting_log`` holds one row per contiguous minted range, so storage
+    grows with transfers rather than with elapsed time. Supply is
+    arithmetic and ownership is a single primary-key lookup.
+    
+    snapshot() checkpoints the minted supply and implicit floor, moves
+    older minting_log rows into append-only compressed archive segments
+    and truncates the WAL; startup recovers from the latest snapshot plus the
+    minting_log rows written after it.
+    
+    Transaction tokens come from a TokenSequencer, so concurrent writers
+    never stamp two transfers with the same token.
+    
+    All writes go through one persistent WAL-mode connection. Per-owner
+    credit counts are materialised in ``balances`` and mirrored in memory,
+    so balance lookups never touch SQLite; the ``*_async`` variants run
+    writes on a dedicated writer thread for callers on an event loop.
     """
     
-    def __init__(self, db_path: str = "ska_currency.db"):
+    def __init__(self, db_path: str = "ska_currency.db", treasury: str = "TREASURY",
+                 archive_dir: Optional[str] = None, sequencer: Optional[TokenSequencer] = None):
         self.db_path = db_path
+        self.treasury = treasury
+        self.archive_dir = archive_dir or f"{db_path}.archive"
         self.tokenizer = TemporalDNATokenizer()
+        self.sequencer = sequencer or get_sequencer()
+        self._lock = threading.RLock()
+        self._archive_lock = threading.Lock()  # One archiver at a time; file I/O runs outside _lock
+        self._conn = self._connect()
+        self._writer: Optional[ThreadPoolExecutor] = None
         self.init_database()
+        self._implicit_floor = 0  # Every second below this is held explicitly
+        self.recover()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the shared connection (autocommit; transactions are explicit)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def close(self):
+        """Stop the writer thread and close the shared connection"""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        with self._lock:
+            self._conn.close()
         
     def init_database(self):
         """Initialize currency database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS credits (
-                id TEXT PRIMARY KEY,
-                creation_timestamp REAL NOT NULL,
-                creation_token TEXT NOT NULL,
-                owner TEXT NOT NULL,
-                value_usd REAL NOT NULL,
-                transaction_timestamp REAL,
-                transaction_token TEXT
-            )
-        """)
+        with self._lock, self._transaction() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS credit_owners (
+                    second INTEGER PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    transaction_timestamp REAL,
+                    transaction_token TEXT
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_credit_owners_owner ON credit_owners (owner)")
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS minting_log (
+                    timestamp REAL PRIMARY KEY,
+                    credits_minted INTEGER NOT NULL,
+                    total_supply INTEGER NOT NULL
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS balances (
+                    owner TEXT PRIMARY KEY,
+                    credits INTEGER NOT NULL
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    timestamp REAL PRIMARY KEY,
+                    minted INTEGER NOT NULL,
+                    implicit_floor INTEGER NOT NULL
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS archive_marks (
+                    name TEXT PRIMARY KEY,
+                    archived_through REAL NOT NULL
+                )
+            """)
+            
+            self._migrate_credits_table(cursor)
+            self._migrate_snapshots_table(cursor)
+            
+            if not cursor.execute("SELECT 1 FROM balances LIMIT 1").fetchone():
+                cursor.execute("""
+                    INSERT INTO balances (owner, credits)
+                    SELECT owner, COUNT(*) FROM credit_owners GROUP BY owner
+                """)
+    
+    def _migrate_credits_table(self, cursor: sqlite3.Cursor):
+        """Fold a one-row-per-credit ``credits`` table into the sparse ledger and drop it"""
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'credits'"
+        ).fetchone()
+        if not exists:
+            return
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS minting_log (
-                timestamp REAL PRIMARY KEY,
-                credits_minted INTEGER NOT NULL,
-                total_supply INTEGER NOT NULL
-            )
-        """)
+        legacy = cursor.execute("""
+            SELECT id, owner, transaction_timestamp, transaction_token FROM credits
+            WHERE owner != ? AND length(id) = 32
+        """, (self.treasury,)).fetchall()
+        cursor.executemany("""
+            INSERT OR IGNORE INTO credit_owners (second, owner, transaction_timestamp, transaction_token)
+            VALUES (?, ?, ?, ?)
+        """, [(self.credit_second(row[0]),) + tuple(row[1:]) for row in legacy])
+        cursor.execute("DROP TABLE credits")
+    
+    def _migrate_snapshots_table(self, cursor: sqlite3.Cursor):
+        """Drop the per-owner balances blob older snapshots carried (the balances table is authoritative)"""
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(snapshots)")]
+        if "balances" in columns:
+            cursor.execute("ALTER TABLE snapshots DROP COLUMN balances")
+    
+    @contextmanager
+    def _transaction(self):
+        """Cursor wrapped in BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error)"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn.cursor()
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+    
+    def recover(self):
+        """
+        Rebuild in-memory state: latest snapshot plus the live minting_log
         
-        conn.commit()
-        conn.close()
+        Supply is the larger of the snapshot's and the newest minting_log
+        range's total. The newest range is kept by snapshot() and may have
+        been extended in place since, keeping its older timestamp, so it
+        must not be filtered by the snapshot time. Snapshots leave only
+        that row and later ones behind, and balances come from the balances
+        table (one row per owner), so startup cost does not depend on how
+        long the ledger has been running.
+        """
+        with self._lock:
+            snapshot = self.latest_snapshot()
+            self._implicit_floor = snapshot["implicit_floor"] if snapshot else 0
+            (logged,) = self._conn.execute("SELECT MAX(total_supply) FROM minting_log").fetchone()
+            self.minted = max(snapshot["minted"] if snapshot else 0, logged or 0)
+            
+            self._balances = self._load_balances()
+            self._released = sum(n for owner, n in self._balances.items() if owner != self.treasury)
+    
+    def _load_balances(self) -> Dict[str, int]:
+        """Explicit credit_owners rows per owner"""
+        return dict(self._conn.execute("SELECT owner, credits FROM balances WHERE credits != 0"))
+    
+    def _apply_balances(self, cursor: sqlite3.Cursor, deltas: Dict[str, int]):
+        """Write per-owner row-count changes to the balances table"""
+        cursor.executemany("""
+            INSERT INTO balances (owner, credits) VALUES (?, ?)
+            ON CONFLICT (owner) DO UPDATE SET credits = credits + excluded.credits
+        """, [(owner, delta) for owner, delta in deltas.items() if delta])
+    
+    def _commit_balances(self, deltas: Dict[str, int]):
+        """Mirror committed balance changes in memory"""
+        for owner, delta in deltas.items():
+            self._balances[owner] = self._balances.get(owner, 0) + delta
+            if owner != self.treasury:
+                self._released += delta
+    
+    @staticmethod
+    def credit_id(second: int) -> str:
+        """Deterministic id of the credit minted for ``second`` since genesis"""
+        return f"{GENESIS_TOKEN}{second:016d}"
+    
+    @staticmethod
+    def credit_second(credit_id: str) -> Optional[int]:
+        """Second since genesis encoded in a credit id, or None if it is not a credit id"""
+        if len(credit_id) != 32 or not credit_id.startswith(GENESIS_TOKEN) or not credit_id[16:].isdigit():
+            return None
+        return int(credit_id[16:])
     
     def calculate_total_supply(self) -> int:
         """Calculate total credits that should exist based on time since genesis"""
@@ -217,79 +557,595 @@ class SKACurrencySystem:
         seconds_since_genesis = current_time - GENESIS_TIMESTAMP
         return int(seconds_since_genesis * CREDITS_PER_SECOND)
     
-    def mint_credits(self, count: int, owner: str = "TREASURY") -> List[SKACredit]:
+    def mint_range(self, start: int, end: int, owner: Optional[str] = None) -> int:
+        """
+        Mint the credits for seconds [start, end)
+        
+        Treasury mints only move the high-water mark and extend the current
+        minting_log range, so their cost does not depend on the range size.
+        Minting straight to another owner writes one sparse row per credit
+        with a single executemany.
+        
+        Args:
+            start: First second (since genesis) to mint; seconds already
+                minted are skipped
+            end: One past the last second to mint
+            owner: Initial owner (default: the treasury)
+        
+        Returns:
+            Number of credits minted
+        """
+        owner = owner or self.treasury
+        with self._lock:
+            if start > self.minted:
+                raise ValueError(f"Cannot mint from second {start}: seconds from {self.minted} are unminted")
+            start = self.minted
+            count = max(0, end - start)
+            if count == 0:
+                return 0
+            
+            deltas = {owner: count} if owner != self.treasury else {}
+            with self._transaction() as cursor:
+                if owner != self.treasury:
+                    cursor.executemany("""
+                        INSERT INTO credit_owners (second, owner) VALUES (?, ?)
+                    """, ((second, owner) for second in range(start, end)))
+                    self._apply_balances(cursor, deltas)
+                
+                # One log row per contiguous range: extend the open one if this batch continues it
+                cursor.execute("""
+                    UPDATE minting_log
+                    SET credits_minted = credits_minted + ?, total_supply = ?
+                    WHERE timestamp = (SELECT MAX(timestamp) FROM minting_log) AND total_supply = ?
+                """, (count, end, start))
+                if cursor.rowcount == 0:
+                    cursor.execute("""
+                        INSERT INTO minting_log (timestamp, credits_minted, total_supply)
+                        VALUES (?, ?, ?)
+                    """, (time.time(), count, end))
+            self.minted = end
+            self._commit_balances(deltas)
+        
+        return count
+    
+    def mint_credits(self, count: int, owner: Optional[str] = None) -> List[SKACredit]:
         """
         Mint new SKA Credits
         
         Args:
-            count: Number of credits to mint
-            owner: Initial owner (default: TREASURY)
+            count: Number of credits to mint (the next ``count`` seconds)
+            owner: Initial owner (default: the treasury)
         
         Returns:
             List of newly minted credits
         """
-        current_time = time.time()
-        credits = []
+        owner = owner or self.treasury
+        with self._lock:
+            start = self.minted
+            self.mint_range(start, start + count, owner)
         
-        for i in range(count):
-            # Generate temporal DNA token
-            token_id = self.tokenizer.generate_token(expansion_level=0)
-            
-            # Create credit
-            credit = SKACredit(
-                id=token_id,
-                creation_timestamp=current_time + i,
-                creation_token=self.tokenizer.genesis,
-                owner=owner
-            )
-            credits.append(credit)
+        return [self._credit(second, owner) for second in range(start, start + count)]
+    
+    def catch_up(self, owner: Optional[str] = None) -> int:
+        """
+        Mint every credit owed up to now in one operation
         
-        # Save to database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        Returns:
+            Number of credits minted (0 when already up to date)
+        """
+        with self._lock:
+            return self.mint_range(self.minted, self.calculate_total_supply(), owner)
+    
+    def _credit(self, second: int, owner: str, transaction_timestamp: Optional[float] = None,
+                transaction_token: Optional[str] = None) -> SKACredit:
+        return SKACredit(
+            id=self.credit_id(second),
+            creation_timestamp=float(GENESIS_TIMESTAMP + second),
+            creation_token=self.tokenizer.genesis,
+            owner=owner,
+            value_usd=CREDIT_VALUE_USD,
+            transaction_timestamp=transaction_timestamp,
+            transaction_token=transaction_token
+        )
+    
+    def get_credit(self, credit_id: str) -> Optional[SKACredit]:
+        """Look up a minted credit; None if the id is malformed or not minted yet"""
+        second = self.credit_second(credit_id)
+        if second is None or second >= self.minted:
+            return None
         
-        for credit in credits:
-            cursor.execute("""
-                INSERT INTO credits (id, creation_timestamp, creation_token, owner, value_usd)
-                VALUES (?, ?, ?, ?, ?)
-            """, (credit.id, credit.creation_timestamp, credit.creation_token, credit.owner, credit.value_usd))
+        row = self._conn.execute("""
+            SELECT owner, transaction_timestamp, transaction_token FROM credit_owners WHERE second = ?
+        """, (second,)).fetchone()
+        if row is None:
+            return self._credit(second, self.treasury)
+        return self._credit(second, *row)
+    
+    def owner_of(self, credit_id: str) -> Optional[str]:
+        """Current owner of a minted credit, or None"""
+        credit = self.get_credit(credit_id)
+        return credit.owner if credit else None
+    
+    def balance(self, owner: str) -> int:
+        """Number of minted credits held by ``owner`` (served from memory)"""
+        if owner == self.treasury:
+            return self.minted - self._released
+        return self._balances.get(owner, 0)
+    
+    def _pick_credits(self, cursor: sqlite3.Cursor, owner: str, n: int) -> List[Tuple[int, bool]]:
+        """
+        Choose ``n`` credits held by ``owner`` as (second, explicit) pairs
         
-        # Log minting
-        total_supply = self.calculate_total_supply()
-        cursor.execute("""
-            INSERT OR REPLACE INTO minting_log (timestamp, credits_minted, total_supply)
-            VALUES (?, ?, ?)
-        """, (current_time, count, total_supply))
+        Explicit rows come from the owner index; the treasury falls back to
+        its implicit credits, lowest seconds first, scanning forward from
+        the implicit floor one window of credit_owners rows at a time.
+        """
+        picked = [(row[0], True) for row in cursor.execute(
+            "SELECT second FROM credit_owners WHERE owner = ? LIMIT ?", (owner, n)
+        )]
+        if owner != self.treasury:
+            return picked
         
-        conn.commit()
-        conn.close()
+        second = self._implicit_floor
+        while len(picked) < n and second < self.minted:
+            window_end = min(self.minted, second + max(2 * (n - len(picked)), 1024))
+            taken = {row[0] for row in cursor.execute(
+                "SELECT second FROM credit_owners WHERE second >= ? AND second < ?", (second, window_end)
+            )}
+            while second < window_end and len(picked) < n:
+                if second not in taken:
+                    picked.append((second, False))
+                second += 1
+        self._implicit_floor = second
+        return picked
+    
+    def _move(self, cursor: sqlite3.Cursor, from_owner: str, to_owner: str, n: int,
+              stamp: Tuple[float, str], deltas: Dict[str, int]) -> List[int]:
+        """Reassign ``n`` credits inside the current transaction; returns their seconds"""
+        if from_owner == self.treasury:
+            pending = -sum(delta for owner, delta in deltas.items() if owner != self.treasury)
+        else:
+            pending = deltas.get(from_owner, 0)
+        available = self.balance(from_owner) + pending
+        if n < 0 or n > available:
+            raise ValueError(f"{from_owner} holds {available} credits, cannot transfer {n}")
+        
+        picked = self._pick_credits(cursor, from_owner, n)
+        cursor.executemany("""
+            INSERT INTO credit_owners (second, owner, transaction_timestamp, transaction_token)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (second) DO UPDATE SET
+                owner = excluded.owner,
+                transaction_timestamp = excluded.transaction_timestamp,
+                transaction_token = excluded.transaction_token
+        """, [(second, to_owner) + stamp for second, _ in picked])
+        
+        explicit = sum(1 for _, was_explicit in picked if was_explicit)
+        deltas[from_owner] = deltas.get(from_owner, 0) - explicit
+        deltas[to_owner] = deltas.get(to_owner, 0) + len(picked)
+        return [second for second, _ in picked]
+    
+    def transfer_many(self, transfers: List[Tuple[str, str, int]]) -> List[List[str]]:
+        """
+        Apply several (from_owner, to_owner, amount) transfers atomically
+        
+        All transfers share one transaction and one transaction token; if
+        any of them overdraws its sender nothing is applied.
+        
+        Returns:
+            Ids of the credits moved, one list per transfer
+        """
+        stamp = (time.time(), self.sequencer.next_token())
+        deltas: Dict[str, int] = {}
+        
+        with self._lock:
+            floor = self._implicit_floor
+            try:
+                with self._transaction() as cursor:
+                    moved = [self._move(cursor, from_owner, to_owner, n, stamp, deltas)
+                             for from_owner, to_owner, n in transfers]
+                    self._apply_balances(cursor, deltas)
+            except BaseException:
+                self._implicit_floor = floor
+                raise
+            self._commit_balances(deltas)
         
-        return credits
+        return [[self.credit_id(second) for second in seconds] for seconds in moved]
+    
+    def transfer_amount(self, from_owner: str, to_owner: str, n: int) -> List[str]:
+        """Move ``n`` credits from one owner to another; returns the ids moved"""
+        return self.transfer_many([(from_owner, to_owner, n)])[0]
     
     def transfer_credit(self, credit_id: str, new_owner: str) -> bool:
         """Transfer credit to new owner with transaction timestamp"""
+        second = self.credit_second(credit_id)
+        if second is None or second >= self.minted:
+            return False
+        
         current_time = time.time()
-        transaction_token = self.tokenizer.generate_token(expansion_level=1)
+        transaction_token = self.sequencer.next_token()
+        
+        with self._lock:
+            with self._transaction() as cursor:
+                row = cursor.execute(
+                    "SELECT owner FROM credit_owners WHERE second = ?", (second,)
+                ).fetchone()
+                cursor.execute("""
+                    INSERT INTO credit_owners (second, owner, transaction_timestamp, transaction_token)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (second) DO UPDATE SET
+                        owner = excluded.owner,
+                        transaction_timestamp = excluded.transaction_timestamp,
+                        transaction_token = excluded.transaction_token
+                """, (second, new_owner, current_time, transaction_token))
+                
+                deltas = {new_owner: 1}
+                if row is not None:
+                    deltas[row[0]] = deltas.get(row[0], 0) - 1
+                self._apply_balances(cursor, deltas)
+            self._commit_balances(deltas)
+        
+        return True
+    
+    def latest_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Most recent snapshot, or None"""
+        row = self._conn.execute("""
+            SELECT timestamp, minted, implicit_floor FROM snapshots
+            ORDER BY timestamp DESC LIMIT 1
+        """).fetchone()
+        if row is None:
+            return None
+        return {"timestamp": row[0], "minted": row[1], "implicit_floor": row[2]}
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Checkpoint supply and the implicit floor, then compact the database
+        
+        Balances are not copied: the balances table is updated in the same
+        transaction as every transfer, so it is already durable.
+        
+        The snapshot row commits first (snapshots beyond SNAPSHOTS_KEPT are
+        dropped with it); then minting_log rows older than the newest one
+        are archived by _archive() (the newest stays so the open range can
+        keep growing) and the WAL is truncated.
+        
+        Returns:
+            Snapshot summary with the number of rows archived
+        """
+        with self._lock:
+            now = time.time()
+            owners = 1 + sum(1 for owner, credits in self._balances.items() if credits and owner != self.treasury)
+            
+            with self._transaction() as cursor:
+                cursor.execute("""
+                    INSERT OR REPLACE INTO snapshots (timestamp, minted, implicit_floor)
+                    VALUES (?, ?, ?)
+                """, (now, self.minted, self._implicit_floor))
+                
+                cursor.execute("""
+                    DELETE FROM snapshots WHERE timestamp NOT IN (
+                        SELECT timestamp FROM snapshots ORDER BY timestamp DESC LIMIT ?
+                    )
+                """, (SNAPSHOTS_KEPT,))
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        archived = self._archive("minting_log", ("timestamp", "credits_minted", "total_supply"))
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        
+        return {"timestamp": now, "minted": self.minted, "owners": owners, "archived": archived}
+    
+    def _archive(self, table: str, columns: Tuple[str, ...]) -> int:
+        """
+        Move a table's rows older than its newest one into a new archive segment
         
-        cursor.execute("""
-            UPDATE credits
-            SET owner = ?, transaction_timestamp = ?, transaction_token = ?
-            WHERE id = ?
-        """, (new_owner, current_time, transaction_token, credit_id))
+        Segments are append-only: each holds the rows after the table's
+        committed high-water mark (archive_marks) and is named after that
+        mark. It is compressed and written outside any transaction and
+        without holding _lock; the rows are then deleted and the mark
+        advanced in one short transaction. If that never commits, the next
+        call starts from the same mark and replaces the same segment, so a
+        retry neither loses nor duplicates rows.
         
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        Returns:
+            Number of rows archived
+        """
+        with self._archive_lock:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT archived_through FROM archive_marks WHERE name = ?", (table,)
+                ).fetchone()
+                mark = row[0] if row else 0.0
+                # Rows below the newest one are never modified again, so they can be read once here
+                rows = self._conn.execute(f"""
+                    SELECT {", ".join(columns)} FROM {table}
+                    WHERE timestamp > ? AND timestamp < (SELECT MAX(timestamp) FROM {table})
+                    ORDER BY timestamp
+                """, (mark,)).fetchall()
+            if not rows:
+                return 0
+            
+            segment = {column: [row[i] for row in rows] for i, column in enumerate(columns)}
+            os.makedirs(self.archive_dir, exist_ok=True)
+            path = os.path.join(self.archive_dir, f"{table}-{mark!r}.seg")
+            tmp = f"{path}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(self._compress(json.dumps(segment, separators=(",", ":")).encode()))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            
+            with self._lock, self._transaction() as cursor:
+                through = rows[-1][0]
+                cursor.execute(f"DELETE FROM {table} WHERE timestamp > ? AND timestamp <= ?", (mark, through))
+                cursor.execute("""
+                    INSERT INTO archive_marks (name, archived_through) VALUES (?, ?)
+                    ON CONFLICT (name) DO UPDATE SET archived_through = excluded.archived_through
+                """, (table, through))
         
-        return success
+        return len(rows)
+    
+    def archive_segments(self, table: str) -> List[str]:
+        """Paths of a table's archive segments, oldest first"""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        prefix = f"{table}-"
+        marks = [(float(name[len(prefix):-4]), name) for name in os.listdir(self.archive_dir)
+                 if name.startswith(prefix) and name.endswith(".seg")]
+        return [os.path.join(self.archive_dir, name) for _, name in sorted(marks)]
+    
+    @staticmethod
+    def _compress(data: bytes) -> bytes:
+        """Codec byte followed by the payload: b"S" zstd, b"Z" zlib"""
+        if zstandard is not None:
+            return b"S" + zstandard.ZstdCompressor(level=19).compress(data)
+        return b"Z" + zlib.compress(data, 9)
+    
+    @staticmethod
+    def read_segment(path: str) -> Dict[str, List[Any]]:
+        """Decode an archive segment into {column: values}"""
+        with open(path, "rb") as f:
+            blob = f.read()
+        codec, payload = blob[:1], blob[1:]
+        if codec == b"S":
+            if zstandard is None:
+                raise RuntimeError(f"{path} is zstd-compressed; install zstandard to read it")
+            data = zstandard.ZstdDecompressor().decompress(payload)
+        elif codec == b"Z":
+            data = zlib.decompress(payload)
+        else:
+            raise ValueError(f"{path} is not an archive segment")
+        return json.loads(data)
+    
+    async def _write_async(self, fn, *args):
+        """Run a write on the dedicated writer thread"""
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ska-writer")
+        return await asyncio.get_running_loop().run_in_executor(self._writer, fn, *args)
+    
+    async def transfer_many_async(self, transfers: List[Tuple[str, str, int]]) -> List[List[str]]:
+        """transfer_many() without blocking the event loop"""
+        return await self._write_async(self.transfer_many, transfers)
+    
+    async def transfer_amount_async(self, from_owner: str, to_owner: str, n: int) -> List[str]:
+        """transfer_amount() without blocking the event loop"""
+        return await self._write_async(self.transfer_amount, from_owner, to_owner, n)
+    
+    async def transfer_credit_async(self, credit_id: str, new_owner: str) -> bool:
+        """transfer_credit() without blocking the event loop"""
+        return await self._write_async(self.transfer_credit, credit_id, new_owner)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # RKL MATHEMATICAL FRAMEWORK
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Frame: header, then blocks of (kind, raw length, payload length) + payload,
+# closed by an end block. Blocks are compressed independently so a stream can
+# be decoded block by block.
+_FRAME_MAGIC = b"RKLC"
+_FRAME_VERSION = 1
+_FRAME_HEADER = struct.Struct(">4sBBBI")  # magic, version, codec, level, dictionary id
+_BLOCK_HEADER = struct.Struct(">BII")  # kind, raw length, payload length
+_BLOCK_COMPRESSED, _BLOCK_STORED, _BLOCK_END = 0, 1, 2
+
+CODECS = {"zlib": 0, "lzma": 1, "zstd": 2}
+_CODEC_NAMES = {code: name for name, code in CODECS.items()}
+
+def default_codec() -> str:
+    """zstd when the zstandard package is installed, zlib otherwise"""
+    return "zstd" if zstandard is not None else "zlib"
+
+def compression_level(codec: str, compression: int = BASE_COMPRESSION) -> int:
+    """
+    Map an RKL compression factor onto a codec level
+    
+    The factor is placed on a log scale where ADAPTIVE_COMPRESSION (5^8) is
+    the codec's strongest level, so BASE_COMPRESSION (3^8) lands on zlib's
+    default of 6.
+    """
+    strength = min(1.0, max(0.0, math.log(max(compression, 1)) / math.log(ADAPTIVE_COMPRESSION)))
+    top = 19 if codec == "zstd" else 9
+    return max(1, round(top * strength))
+
+def dictionary_id(dictionary: bytes) -> int:
+    """Id stored in frame headers to name the dictionary a frame needs"""
+    return zlib.adler32(dictionary) or 1
+
+def build_dictionary(samples: List[bytes], size: int = COMPRESSION_DICT_SIZE) -> bytes:
+    """
+    Train a compression dictionary on sample payloads
+    
+    Uses zstd's trainer when available. Otherwise (or when the trainer
+    rejects the samples) the dictionary is made of the word runs of up to
+    three words that recur across samples, weighted by the number of
+    samples they appear in times their length, with the most valuable
+    ones last where deflate's window reaches them cheapest.
+    """
+    if zstandard is not None:
+        try:
+            return zstandard.train_dictionary(size, samples).as_bytes()
+        except Exception:
+            pass
+    
+    counts: Dict[bytes, int] = {}
+    for sample in samples:
+        words = re.findall(rb"\S+\s*", sample)
+        seen = set()
+        for run in range(1, 4):
+            for i in range(len(words) - run + 1):
+                phrase = b"".join(words[i:i + run])
+                if phrase not in seen:
+                    seen.add(phrase)
+                    counts[phrase] = counts.get(phrase, 0) + 1
+    ranked = sorted((phrase for phrase, count in counts.items() if count > 1),
+                    key=lambda phrase: counts[phrase] * len(phrase), reverse=True)
+    
+    chosen, used = [], 0
+    for phrase in ranked:
+        if used + len(phrase) > size:
+            continue
+        chosen.append(phrase)
+        used += len(phrase)
+    if not chosen and samples:
+        return samples[-1][-size:]
+    return b"".join(reversed(chosen))
+
+class RKLCompressor:
+    """
+    Incremental compressor in the style of zlib.compressobj
+    
+    compress() buffers input and returns the blocks completed so far;
+    flush() emits the final partial block and the end marker.
+    """
+    
+    def __init__(self, codec: Optional[str] = None, level: Optional[int] = None,
+                 dictionary: Optional[bytes] = None, block_size: int = COMPRESSION_BLOCK_SIZE):
+        self.codec = codec or default_codec()
+        if self.codec not in CODECS:
+            raise ValueError(f"Unknown codec: {self.codec}")
+        if self.codec == "zstd" and zstandard is None:
+            raise ValueError("zstd codec requires the zstandard package")
+        if self.codec == "lzma" and dictionary:
+            raise ValueError("lzma codec does not support dictionaries")
+        self.level = level if level is not None else compression_level(self.codec)
+        self.dictionary = dictionary or b""
+        self.block_size = block_size
+        self._buffer = bytearray()
+        self._started = False
+        self._zstd = None
+        if self.codec == "zstd":
+            dict_data = zstandard.ZstdCompressionDict(self.dictionary) if self.dictionary else None
+            self._zstd = zstandard.ZstdCompressor(level=self.level, dict_data=dict_data)
+    
+    def compress(self, data: bytes) -> bytes:
+        self._buffer += data
+        out = bytearray(self._header())
+        while len(self._buffer) >= self.block_size:
+            out += self._block(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+        return bytes(out)
+    
+    def flush(self) -> bytes:
+        out = bytearray(self._header())
+        if self._buffer:
+            out += self._block(bytes(self._buffer))
+            self._buffer.clear()
+        out += _BLOCK_HEADER.pack(_BLOCK_END, 0, 0)
+        return bytes(out)
+    
+    def _header(self) -> bytes:
+        if self._started:
+            return b""
+        self._started = True
+        dict_id = dictionary_id(self.dictionary) if self.dictionary else 0
+        return _FRAME_HEADER.pack(_FRAME_MAGIC, _FRAME_VERSION, CODECS[self.codec], self.level, dict_id)
+    
+    def _block(self, raw: bytes) -> bytes:
+        if self.codec == "zlib":
+            compressor = (zlib.compressobj(self.level, zdict=self.dictionary) if self.dictionary
+                          else zlib.compressobj(self.level))
+            payload = compressor.compress(raw) + compressor.flush()
+        elif self.codec == "lzma":
+            payload = lzma.compress(raw, format=lzma.FORMAT_ALONE, preset=self.level)
+        else:
+            payload = self._zstd.compress(raw)
+        
+        if len(payload) >= len(raw):
+            return _BLOCK_HEADER.pack(_BLOCK_STORED, len(raw), len(raw)) + raw
+        return _BLOCK_HEADER.pack(_BLOCK_COMPRESSED, len(raw), len(payload)) + payload
+
+class RKLDecompressor:
+    """
+    Incremental decompressor for RKLCompressor frames
+    
+    decompress() accepts the frame in arbitrary pieces and returns the data
+    of every block completed so far; ``eof`` turns True at the end marker.
+    """
+    
+    def __init__(self, dictionaries: Optional[Dict[int, bytes]] = None):
+        self.dictionaries = dictionaries or {}
+        self.eof = False
+        self.codec: Optional[str] = None
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._zstd = None
+    
+    def decompress(self, data: bytes) -> bytes:
+        if self.eof:
+            if data:
+                raise ValueError("Data after the end of the RKL frame")
+            return b""
+        self._buffer += data
+        out = bytearray()
+        
+        if self.codec is None:
+            if len(self._buffer) < _FRAME_HEADER.size:
+                return b""
+            self._read_header()
+        
+        while len(self._buffer) >= _BLOCK_HEADER.size:
+            kind, raw_length, length = _BLOCK_HEADER.unpack_from(self._buffer)
+            if kind == _BLOCK_END:
+                self.eof = True
+                if len(self._buffer) > _BLOCK_HEADER.size:
+                    raise ValueError("Data after the end of the RKL frame")
+                break
+            end = _BLOCK_HEADER.size + length
+            if len(self._buffer) < end:
+                break
+            payload = bytes(self._buffer[_BLOCK_HEADER.size:end])
+            del self._buffer[:end]
+            block = payload if kind == _BLOCK_STORED else self._inflate(payload, raw_length)
+            if len(block) != raw_length:
+                raise ValueError("Corrupt RKL block: length mismatch")
+            out += block
+        return bytes(out)
+    
+    def _read_header(self):
+        magic, version, codec, _, dict_id = _FRAME_HEADER.unpack_from(self._buffer)
+        if magic != _FRAME_MAGIC or version != _FRAME_VERSION or codec not in _CODEC_NAMES:
+            raise ValueError("Not an RKL compressed frame")
+        del self._buffer[:_FRAME_HEADER.size]
+        self.codec = _CODEC_NAMES[codec]
+        
+        if dict_id:
+            if dict_id not in self.dictionaries:
+                raise ValueError(f"Frame needs unknown dictionary {dict_id:#010x}")
+            self._dictionary = self.dictionaries[dict_id]
+        if self.codec == "zstd":
+            if zstandard is None:
+                raise ValueError("Frame is zstd-compressed; install zstandard to read it")
+            dict_data = zstandard.ZstdCompressionDict(self._dictionary) if self._dictionary else None
+            self._zstd = zstandard.ZstdDecompressor(dict_data=dict_data)
+    
+    def _inflate(self, payload: bytes, raw_length: int) -> bytes:
+        if self.codec == "zlib":
+            decompressor = (zlib.decompressobj(zdict=self._dictionary) if self._dictionary
+                            else zlib.decompressobj())
+            return decompressor.decompress(payload) + decompressor.flush()
+        if self.codec == "lzma":
+            return lzma.decompress(payload, format=lzma.FORMAT_ALONE)
+        return self._zstd.decompress(payload, max_output_size=raw_length)
+
 class RKLFramework:
     """
     Royal King's Loyalty Framework
@@ -303,6 +1159,10 @@ class RKLFramework:
         self.base_compression = BASE_COMPRESSION
         self.adaptive_compression = ADAPTIVE_COMPRESSION
         self.overlap_coef = OVERLAP_COEFFICIENT
+        self.codec = default_codec()
+        self.compression = self.base_compression
+        self.dictionaries: Dict[int, bytes] = {}
+        self.dictionary_id = 0  # Dictionary used by compress_data; 0 for none
     
     def calculate_complexity(self, n: int) -> float:
         """Calculate time complexity for problem size n"""
@@ -321,16 +1181,69 @@ class RKLFramework:
         """
         return (quantum_state * self.alpha + classical_state * (100 - self.alpha)) / 100
     
-    def compress_data(self, data: bytes) -> bytes:
-        """Apply RKL compression with adaptive parameters"""
-        # Simplified compression (production would use full algorithm)
-        compressed = hashlib.sha256(data).digest()
-        return compressed
+    def compressor(self, compression: Optional[int] = None, codec: Optional[str] = None,
+                   dictionary_id: Optional[int] = None) -> RKLCompressor:
+        """Streaming compressor using the framework's codec, level and dictionary"""
+        codec = codec or self.codec
+        dict_id = self.dictionary_id if dictionary_id is None else dictionary_id
+        if dict_id and dict_id not in self.dictionaries:
+            raise ValueError(f"Unknown dictionary {dict_id:#010x}")
+        return RKLCompressor(
+            codec=codec,
+            level=compression_level(codec, compression or self.compression),
+            dictionary=self.dictionaries.get(dict_id) if codec != "lzma" else None
+        )
+    
+    def decompressor(self) -> RKLDecompressor:
+        """Streaming decompressor that knows every registered dictionary"""
+        return RKLDecompressor(self.dictionaries)
+    
+    def compress_data(self, data: bytes, compression: Optional[int] = None) -> bytes:
+        """
+        Apply RKL compression with adaptive parameters
+        
+        Args:
+            data: Payload
+            compression: RKL compression factor, from BASE_COMPRESSION
+                (default) up to ADAPTIVE_COMPRESSION (strongest)
+        
+        Returns:
+            Self-describing RKL frame (codec, level, dictionary id, blocks)
+        """
+        compressor = self.compressor(compression)
+        return compressor.compress(data) + compressor.flush()
     
     def decompress_data(self, compressed: bytes) -> bytes:
         """Decompress RKL-compressed data"""
-        # Simplified (production would use full algorithm)
-        return compressed
+        decompressor = self.decompressor()
+        data = decompressor.decompress(compressed)
+        if not decompressor.eof:
+            raise ValueError("Truncated RKL frame")
+        return data
+    
+    def add_dictionary(self, dictionary: bytes, activate: bool = False) -> int:
+        """Register a (previously trained) dictionary; returns its id"""
+        dict_id = dictionary_id(dictionary)
+        self.dictionaries[dict_id] = dictionary
+        if activate:
+            self.dictionary_id = dict_id
+        return dict_id
+    
+    def train_dictionary(self, samples: List[Union[str, bytes]], size: int = COMPRESSION_DICT_SIZE,
+                         activate: bool = True) -> int:
+        """
+        Train a dictionary on typical payloads, e.g. agent prompts and responses
+        
+        Small repetitive messages compress poorly on their own; a shared
+        dictionary lets each one reference the common text. Frames record
+        the dictionary id, so keep (or re-add) every dictionary that was
+        used to compress stored data.
+        
+        Returns:
+            Dictionary id
+        """
+        encoded = [sample.encode() if isinstance(sample, str) else sample for sample in samples]
+        return self.add_dictionary(build_dictionary(encoded, size), activate)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 25 AUTONOMOUS AI AGENTS (FLAT HIERARCHY)
@@ -364,6 +1277,255 @@ class AgentRole(Enum):
     QUALITY_ASSURANCE = "QualityAssurance"
     INNOVATION_SCOUT = "InnovationScout"
 
+ROLE_DESCRIPTIONS = {
+    AgentRole.SALES_KING: "Lead sales strategist - close deals, optimize conversion, drive revenue",
+    AgentRole.MARKETING_MASTER: "Marketing strategist - campaigns, positioning, growth hacking",
+    AgentRole.CUSTOMER_ACQUISITION: "Acquire new customers - lead generation, prospecting, outreach",
+    AgentRole.REVENUE_OPTIMIZER: "Optimize revenue streams - pricing, upsells, monetization",
+    AgentRole.FINANCE_ANALYST: "Financial analysis - forecasting, budgeting, ROI optimization",
+    AgentRole.DATA_SCIENTIST: "Data analysis - insights, predictions, pattern recognition",
+    AgentRole.CONTENT_CREATOR: "Create compelling content - copy, videos, graphics",
+    AgentRole.EMAIL_MARKETER: "Email campaigns - sequences, automation, deliverability",
+    AgentRole.SOCIAL_MEDIA_MANAGER: "Social media - engagement, growth, brand presence",
+    AgentRole.CUSTOMER_SUCCESS: "Customer retention - onboarding, support, satisfaction",
+    AgentRole.PRODUCT_DEVELOPER: "Product development - features, roadmap, innovation",
+    AgentRole.TECH_ARCHITECT: "Technical architecture - infrastructure, scalability, security",
+    AgentRole.SECURITY_GUARDIAN: "Security - threat detection, compliance, protection",
+    AgentRole.LEGAL_ADVISOR: "Legal compliance - contracts, regulations, risk management",
+    AgentRole.HR_MANAGER: "Human resources - hiring, culture, team development",
+    AgentRole.OPERATIONS_MANAGER: "Operations - processes, efficiency, coordination",
+    AgentRole.STRATEGY_CONSULTANT: "Strategic planning - vision, roadmap, execution",
+    AgentRole.INVESTOR_RELATIONS: "Investor relations - fundraising, reporting, communications",
+    AgentRole.PARTNERSHIP_DEVELOPMENT: "Partnerships - deals, collaborations, alliances",
+    AgentRole.BRAND_MANAGER: "Brand management - identity, messaging, reputation",
+    AgentRole.PR_SPECIALIST: "Public relations - media, press releases, crisis management",
+    AgentRole.EVENT_COORDINATOR: "Events - planning, execution, networking",
+    AgentRole.TRAINING_SPECIALIST: "Training - education, onboarding, skill development",
+    AgentRole.QUALITY_ASSURANCE: "Quality control - testing, standards, improvements",
+    AgentRole.INNOVATION_SCOUT: "Innovation - trends, technologies, competitive intelligence"
+}
+
+# Routing terms beyond the descriptions and role names (the original auto-select keywords)
+ROLE_KEYWORDS = {
+    AgentRole.SALES_KING: ["sell", "close", "deal", "revenue"],
+    AgentRole.MARKETING_MASTER: ["market", "campaign", "brand"],
+    AgentRole.CONTENT_CREATOR: ["content", "write", "copy"],
+    AgentRole.DATA_SCIENTIST: ["data", "analytics", "insights"]
+}
+
+def create_async_client(api_key: str = ANTHROPIC_API_KEY, base_url: Optional[str] = ANTHROPIC_BASE_URL,
+                        max_connections: int = HTTP_MAX_CONNECTIONS,
+                        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+                        timeout: float = HTTP_TIMEOUT) -> "anthropic.AsyncAnthropic":
+    """
+    One AsyncAnthropic client over a tuned, shared HTTP connection pool
+    
+    Idle connections are kept alive for HTTP_KEEPALIVE_EXPIRY seconds so
+    back-to-back calls skip the TCP/TLS handshake, and HTTP/2 multiplexes
+    requests over them when the h2 package is installed.
+    """
+    import httpx
+    
+    http_client = anthropic.DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        ),
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=httpx.Timeout(timeout, connect=10.0)
+    )
+    return anthropic.AsyncAnthropic(api_key=api_key, base_url=base_url, http_client=http_client)
+
+_shared_client: Optional["anthropic.AsyncAnthropic"] = None
+
+def get_async_client() -> "anthropic.AsyncAnthropic":
+    """Process-wide client used by agents that were not given one"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = create_async_client()
+    return _shared_client
+
+class AgentResponseCache:
+    """
+    Two-tier cache of agent responses
+    
+    Tier 1 is an in-process LRU with per-entry expiry; tier 2 is a SQLite
+    table shared across restarts (and processes). Keys are a SHA-256 over
+    the canonical JSON of (role, model, max_tokens, system prompt, user
+    prompt). Concurrent identical requests are coalesced: the first one
+    calls the model and the rest await its result.
+    
+    Per-task control (task["cache_control"]):
+        no_cache: skip lookups and coalescing, always call the model
+        no_store: do not store the response
+        ttl: seconds the stored response stays fresh
+    """
+    
+    def __init__(self, db_path: Optional[str] = "agent_cache.db", max_entries: int = AGENT_CACHE_SIZE,
+                 ttl: float = AGENT_CACHE_TTL):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.metrics = {
+            "memory_hits": 0, "disk_hits": 0, "coalesced": 0, "misses": 0,
+            "bypassed": 0, "stores": 0, "evictions": 0, "expired": 0
+        }
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    output TEXT NOT NULL,
+                    expires REAL NOT NULL
+                )
+            """)
+    
+    @staticmethod
+    def make_key(role: str, request: Dict[str, Any]) -> str:
+        """Canonical hash of everything that determines the model's answer"""
+        canonical = json.dumps(
+            [role, request["model"], request["max_tokens"], request["system"], request["messages"]],
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    async def fetch(self, key: str, produce, control: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        """
+        Cached response for ``key``, calling ``produce()`` on a miss
+        
+        Returns:
+            (output, source) with source one of "memory", "disk",
+            "coalesced", "miss" or "bypass"
+        """
+        control = control or {}
+        no_cache, no_store = control.get("no_cache", False), control.get("no_store", False)
+        if no_cache and no_store:
+            self.metrics["bypassed"] += 1
+            return await produce(), "bypass"
+        
+        if not no_cache:
+            output = self._memory_get(key)
+            if output is not None:
+                self.metrics["memory_hits"] += 1
+                return output, "memory"
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.metrics["coalesced"] += 1
+                try:
+                    return await asyncio.shield(pending), "coalesced"
+                except asyncio.CancelledError:
+                    # Only the leader was cancelled (e.g. a parallel fan-out
+                    # dropping a straggler): retry, becoming the leader if needed
+                    if not pending.cancelled() or asyncio.current_task().cancelling():
+                        raise
+                    return await self.fetch(key, produce, control)
+        
+        future = asyncio.get_running_loop().create_future()
+        if not no_cache:
+            self._pending[key] = future
+        try:
+            output = await asyncio.to_thread(self._disk_get, key) if not no_cache and self._conn else None
+            if output is not None:
+                self.metrics["disk_hits"] += 1
+                self._memory_put(key, output, self.ttl)
+                source = "disk"
+            else:
+                self.metrics["misses"] += 1
+                output = await produce()
+                if not no_store:
+                    await self.put(key, output, control.get("ttl", self.ttl))
+                source = "miss"
+            future.set_result(output)
+            return output, source
+        except asyncio.CancelledError:
+            future.cancel()  # Followers retry rather than inherit this caller's cancellation
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Marks it retrieved when nobody was waiting
+            raise
+        finally:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+    
+    async def lookup(self, key: str) -> Optional[Tuple[str, str]]:
+        """(output, "memory" | "disk") when cached, without coalescing; None on a miss"""
+        output = self._memory_get(key)
+        if output is not None:
+            self.metrics["memory_hits"] += 1
+            return output, "memory"
+        if self._conn is not None:
+            output = await asyncio.to_thread(self._disk_get, key)
+            if output is not None:
+                self.metrics["disk_hits"] += 1
+                self._memory_put(key, output, self.ttl)
+                return output, "disk"
+        return None
+    
+    async def put(self, key: str, output: str, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        self._memory_put(key, output, ttl)
+        if self._conn is not None:
+            await asyncio.to_thread(self._disk_put, key, output, time.time() + ttl)
+        self.metrics["stores"] += 1
+    
+    def _memory_get(self, key: str) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._memory[key]
+            self.metrics["expired"] += 1
+            return None
+        self._memory.move_to_end(key)
+        return entry[1]
+    
+    def _memory_put(self, key: str, output: str, ttl: float):
+        self._memory[key] = (time.time() + ttl, output)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.metrics["evictions"] += 1
+    
+    def _disk_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output FROM responses WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+    
+    def _disk_put(self, key: str, output: str, expires: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, output, expires) VALUES (?, ?, ?)",
+                (key, output, expires)
+            )
+    
+    def purge_expired(self) -> int:
+        """Delete expired rows from the disk tier; returns how many"""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            return self._conn.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),)).rowcount
+    
+    def clear(self):
+        self._memory.clear()
+        if self._conn is not None:
+            with self._lock:
+                self._conn.execute("DELETE FROM responses")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus hit rate and current memory-tier size"""
+        hits = self.metrics["memory_hits"] + self.metrics["disk_hits"] + self.metrics["coalesced"]
+        lookups = hits + self.metrics["misses"]
+        return dict(self.metrics, entries=len(self._memory), hit_rate=hits / lookups if lookups else 0.0)
+
 @dataclass
 class Agent:
     """Single autonomous AI agent"""
@@ -371,49 +1533,104 @@ class Agent:
     agent_id: str
     status: str = "active"
     tasks_completed: int = 0
-    api_client: Optional[anthropic.Anthropic] = None
+    api_client: Optional["anthropic.AsyncAnthropic"] = None  # Shared client when None
+    max_concurrency: int = AGENT_MAX_CONCURRENCY
+    swarm_slots: Optional[asyncio.Semaphore] = field(default=None, repr=False, compare=False)
+    cache: Optional[AgentResponseCache] = field(default=None, repr=False, compare=False)
+    in_flight: int = 0
     
     def __post_init__(self):
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._system_prompt: Optional[str] = None
+        self._stream_totals = {"streams": 0, "ttfb_ms": 0.0, "rate_samples": 0, "tokens_per_sec": 0.0}
+    
+    @property
+    def client(self) -> "anthropic.AsyncAnthropic":
         if self.api_client is None:
-            self.api_client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+            self.api_client = get_async_client()
+        return self.api_client
+    
+    @asynccontextmanager
+    async def _call_slot(self):
+        """Hold a swarm-wide and a per-agent concurrency slot for one model call"""
+        if self.swarm_slots is not None:
+            await self.swarm_slots.acquire()
+        try:
+            async with self._slots:
+                self.in_flight += 1
+                try:
+                    yield
+                finally:
+                    self.in_flight -= 1
+        finally:
+            if self.swarm_slots is not None:
+                self.swarm_slots.release()
+    
+    async def _create_message(self, **request) -> Any:
+        """Model call under the swarm-wide and per-agent concurrency limits"""
+        async with self._call_slot():
+            return await self.client.messages.create(**request)
+    
+    @property
+    def system_prompt(self) -> str:
+        """Role system prompt, built once per agent"""
+        prompt = self._system_prompt
+        if prompt is None:
+            prompt = f"""You are {self.role.value}, an autonomous AI agent in the Sales King Academy system.
+        
+Your role: {self._get_role_description()}
+
+Process this task with mathematical precision and polynomial efficiency (O(n^1.77))."""
+            self._system_prompt = prompt
+        return prompt
+    
+    async def _complete(self, request: Dict[str, Any]) -> str:
+        """One model call; returns the response text"""
+        message = await self._create_message(**request)
+        return message.content[0].text
+    
+    def _build_request(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Messages API request for a task"""
+        # Construct prompt
+        user_prompt = f"""Task: {task.get('description', '')}
+
+Context: {task.get('context', {})}
+
+Provide a comprehensive, actionable response."""
+        
+        return {
+            "model": AGENT_MODEL,
+            "max_tokens": AGENT_MAX_TOKENS,
+            "system": self.system_prompt,
+            "messages": [
+                {"role": "user", "content": user_prompt}
+            ]
+        }
     
     async def process_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process a task using Claude API with polynomial complexity
         
         Args:
-            task: Task dictionary with 'description' and 'context'
+            task: Task dictionary with 'description' and 'context', and
+                optionally 'cache_control' (see AgentResponseCache)
         
         Returns:
             Result dictionary with 'output' and 'metadata'
         """
         start_time = time.time()
+        request = self._build_request(task)
         
-        # Construct prompt
-        system_prompt = f"""You are {self.role.value}, an autonomous AI agent in the Sales King Academy system.
-        
-Your role: {self._get_role_description()}
-
-Process this task with mathematical precision and polynomial efficiency (O(n^1.77))."""
-        
-        user_prompt = f"""Task: {task.get('description', '')}
-
-Context: {task.get('context', {})}
-
-Provide a comprehensive, actionable response."""
-        
-        # Call Claude API
+        # Call Claude API (awaited, so other tasks keep running meanwhile)
         try:
-            message = self.api_client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4000,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
-            
-            output = message.content[0].text
+            if self.cache is not None:
+                output, cache_source = await self.cache.fetch(
+                    AgentResponseCache.make_key(self.role.value, request),
+                    lambda: self._complete(request),
+                    task.get("cache_control")
+                )
+            else:
+                output, cache_source = await self._complete(request), "disabled"
             
             # Calculate processing time
             processing_time = time.time() - start_time
@@ -429,6 +1646,7 @@ Provide a comprehensive, actionable response."""
                     "agent_id": self.agent_id,
                     "processing_time": processing_time,
                     "task_number": self.tasks_completed,
+                    "cache": cache_source,
                     "timestamp": time.time()
                 }
             }
@@ -444,42 +1662,217 @@ Provide a comprehensive, actionable response."""
                 }
             }
     
+    async def stream_task(self, task: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a task, yielding the response as it is generated
+        
+        Yields {"type": "delta", "text": ...} events, then one "done" event
+        with the full output and timing metadata (time to first byte and
+        output tokens per second), or an "error" event. Nothing is read
+        ahead: the SDK stream is pulled only as the caller consumes events,
+        so a slow client slows the upstream read instead of piling up
+        buffered text. Cache hits arrive as a single delta.
+        """
+        start = time.perf_counter()
+        request = self._build_request(task)
+        control = task.get("cache_control") or {}
+        key = AgentResponseCache.make_key(self.role.value, request) if self.cache is not None else None
+        first_byte: Optional[float] = None
+        output_tokens: Optional[int] = None
+        
+        try:
+            hit = None
+            if self.cache is not None and not control.get("no_cache"):
+                hit = await self.cache.lookup(key)
+            if hit is not None:
+                output, cache_source = hit
+                first_byte = time.perf_counter()
+                yield {"type": "delta", "text": output}
+            else:
+                parts = []
+                async with self._call_slot():
+                    async with self.client.messages.stream(**request) as stream:
+                        async for text in stream.text_stream:
+                            if first_byte is None:
+                                first_byte = time.perf_counter()
+                            parts.append(text)
+                            yield {"type": "delta", "text": text}
+                        final = await stream.get_final_message()
+                output = "".join(parts)
+                output_tokens = final.usage.output_tokens
+                cache_source = "miss" if self.cache is not None else "disabled"
+                if self.cache is not None:
+                    self.cache.metrics["misses"] += 1
+                    if not control.get("no_store"):
+                        await self.cache.put(key, output, control.get("ttl"))
+        except Exception as e:
+            yield {
+                "type": "error",
+                "error": str(e),
+                "metadata": {"agent": self.role.value, "agent_id": self.agent_id, "timestamp": time.time()}
+            }
+            return
+        
+        end = time.perf_counter()
+        first_byte = first_byte or end
+        ttfb_ms = (first_byte - start) * 1000
+        tokens_per_sec = output_tokens / (end - first_byte) if output_tokens and end > first_byte else None
+        self._record_stream(ttfb_ms, tokens_per_sec)
+        self.tasks_completed += 1
+        
+        yield {
+            "type": "done",
+            "output": output,
+            "metadata": {
+                "agent": self.role.value,
+                "agent_id": self.agent_id,
+                "processing_time": end - start,
+                "ttfb_ms": ttfb_ms,
+                "output_tokens": output_tokens,
+                "tokens_per_sec": tokens_per_sec,
+                "task_number": self.tasks_completed,
+                "cache": cache_source,
+                "timestamp": time.time()
+            }
+        }
+    
+    def _record_stream(self, ttfb_ms: float, tokens_per_sec: Optional[float]):
+        totals = self._stream_totals
+        totals["streams"] += 1
+        totals["ttfb_ms"] += ttfb_ms
+        if tokens_per_sec is not None:
+            totals["rate_samples"] += 1
+            totals["tokens_per_sec"] += tokens_per_sec
+    
+    @property
+    def stream_metrics(self) -> Dict[str, Any]:
+        """Streams served with mean time to first byte and generation rate"""
+        totals = self._stream_totals
+        return {
+            "streams": totals["streams"],
+            "avg_ttfb_ms": totals["ttfb_ms"] / totals["streams"] if totals["streams"] else None,
+            "avg_tokens_per_sec": (totals["tokens_per_sec"] / totals["rate_samples"]
+                                   if totals["rate_samples"] else None)
+        }
+    
     def _get_role_description(self) -> str:
         """Get description of agent's role and responsibilities"""
-        descriptions = {
-            AgentRole.SALES_KING: "Lead sales strategist - close deals, optimize conversion, drive revenue",
-            AgentRole.MARKETING_MASTER: "Marketing strategist - campaigns, positioning, growth hacking",
-            AgentRole.CUSTOMER_ACQUISITION: "Acquire new customers - lead generation, prospecting, outreach",
-            AgentRole.REVENUE_OPTIMIZER: "Optimize revenue streams - pricing, upsells, monetization",
-            AgentRole.FINANCE_ANALYST: "Financial analysis - forecasting, budgeting, ROI optimization",
-            AgentRole.DATA_SCIENTIST: "Data analysis - insights, predictions, pattern recognition",
-            AgentRole.CONTENT_CREATOR: "Create compelling content - copy, videos, graphics",
-            AgentRole.EMAIL_MARKETER: "Email campaigns - sequences, automation, deliverability",
-            AgentRole.SOCIAL_MEDIA_MANAGER: "Social media - engagement, growth, brand presence",
-            AgentRole.CUSTOMER_SUCCESS: "Customer retention - onboarding, support, satisfaction",
-            AgentRole.PRODUCT_DEVELOPER: "Product development - features, roadmap, innovation",
-            AgentRole.TECH_ARCHITECT: "Technical architecture - infrastructure, scalability, security",
-            AgentRole.SECURITY_GUARDIAN: "Security - threat detection, compliance, protection",
-            AgentRole.LEGAL_ADVISOR: "Legal compliance - contracts, regulations, risk management",
-            AgentRole.HR_MANAGER: "Human resources - hiring, culture, team development",
-            AgentRole.OPERATIONS_MANAGER: "Operations - processes, efficiency, coordination",
-            AgentRole.STRATEGY_CONSULTANT: "Strategic planning - vision, roadmap, execution",
-            AgentRole.INVESTOR_RELATIONS: "Investor relations - fundraising, reporting, communications",
-            AgentRole.PARTNERSHIP_DEVELOPMENT: "Partnerships - deals, collaborations, alliances",
-            AgentRole.BRAND_MANAGER: "Brand management - identity, messaging, reputation",
-            AgentRole.PR_SPECIALIST: "Public relations - media, press releases, crisis management",
-            AgentRole.EVENT_COORDINATOR: "Events - planning, execution, networking",
-            AgentRole.TRAINING_SPECIALIST: "Training - education, onboarding, skill development",
-            AgentRole.QUALITY_ASSURANCE: "Quality control - testing, standards, improvements",
-            AgentRole.INNOVATION_SCOUT: "Innovation - trends, technologies, competitive intelligence"
-        }
-        return descriptions.get(self.role, "General autonomous agent")
+        return ROLE_DESCRIPTIONS.get(self.role, "General autonomous agent")
+
+_ROUTER_STOPWORDS = frozenset({"and", "the", "for", "new", "with", "all"})
+_ROUTER_SUFFIXES = ("ations", "ation", "ments", "ment", "ings", "ing", "ions", "ion", "ies", "es", "s", "ed", "e")
+_ROUTER_WORD = re.compile(r"[A-Za-z]+")
+_ROUTER_NAME_PART = re.compile(r"[A-Z]+(?![a-z])|[A-Z][a-z]+")
+
+def _route_stem(word: str) -> str:
+    """Crude suffix stripping; stems keep at least 4 letters"""
+    for suffix in _ROUTER_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    return word
+
+class TaskRouter:
+    """
+    Keyword router over all 25 agent roles
+    
+    The vocabulary is every word of the role descriptions, the role names
+    and ROLE_KEYWORDS, reduced to stems. All stems are compiled into one
+    regex (longest first), so a task description is scanned once and
+    each hit is looked up in a term -> (role, weight) table. Stems match
+    as word prefixes ("forecast" matches "forecasting"); terms of three
+    letters or fewer ("hr", "pr", "roi") must match whole words.
+    
+    Modes:
+        keyword: every matching term counts 1 for each role that uses it
+        tfidf: terms are weighted by term frequency in the role's
+            vocabulary times inverse role frequency, so "revenue" (three
+            roles) counts less than "fundraising" (one)
+    
+    Ties go to the role declared first in AgentRole; descriptions with no
+    hits go to ``default``.
+    """
+    
+    MODES = ("keyword", "tfidf")
+    
+    def __init__(self, mode: str = "keyword", default: AgentRole = AgentRole.STRATEGY_CONSULTANT):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown routing mode: {mode}")
+        self.mode = mode
+        self.default = default
+        self.roles = list(AgentRole)
+        
+        frequencies: Dict[str, Dict[int, int]] = {}
+        for index, role in enumerate(self.roles):
+            words = _ROUTER_WORD.findall(ROLE_DESCRIPTIONS.get(role, ""))
+            words += _ROUTER_NAME_PART.findall(role.value) + ROLE_KEYWORDS.get(role, [])
+            for word in words:
+                word = word.lower()
+                if word in _ROUTER_STOPWORDS or len(word) < 2:
+                    continue
+                counts = frequencies.setdefault(_route_stem(word), {})
+                counts[index] = counts.get(index, 0) + 1
+        
+        self.weights = {"keyword": {}, "tfidf": {}}
+        for term, counts in frequencies.items():
+            idf = math.log(1 + len(self.roles) / len(counts))
+            self.weights["keyword"][term] = tuple((index, 1.0) for index in counts)
+            self.weights["tfidf"][term] = tuple((index, tf * idf) for index, tf in counts.items())
+        
+        alternatives = [re.escape(term) + (r"\b" if len(term) <= 3 else "")
+                        for term in sorted(frequencies, key=lambda term: (-len(term), term))]
+        self.pattern = re.compile(r"\b(?:" + "|".join(alternatives) + ")")
+    
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.weights["keyword"])
+    
+    def scores(self, description: str, mode: Optional[str] = None) -> Dict[int, float]:
+        """Role index -> score for every role with at least one hit"""
+        weights = self.weights[mode or self.mode]
+        totals: Dict[int, float] = {}
+        for term in self.pattern.findall(description.lower()):
+            for index, weight in weights[term]:
+                totals[index] = totals.get(index, 0.0) + weight
+        return totals
+    
+    def route(self, description: str, mode: Optional[str] = None) -> AgentRole:
+        """Best role for a task description"""
+        totals = self.scores(description, mode)
+        if not totals:
+            return self.default
+        best = max(totals.values())
+        return self.roles[min(index for index, score in totals.items() if score == best)]
+    
+    def rank(self, description: str, mode: Optional[str] = None,
+             limit: Optional[int] = None) -> List[Tuple[AgentRole, float]]:
+        """Roles with a hit, best first"""
+        ranked = sorted(self.scores(description, mode).items(), key=lambda item: (-item[1], item[0]))
+        return [(self.roles[index], score) for index, score in ranked[:limit]]
 
 class AgentSwarm:
-    """Manages all 25 autonomous agents"""
+    """
+    Manages all 25 autonomous agents
     
-    def __init__(self):
+    All agents share one async client (one connection pool). A swarm-wide
+    semaphore caps model calls in flight and each agent has its own cap,
+    so many tasks can run concurrently on one event loop without a single
+    busy role starving the others. An optional AgentResponseCache is shared
+    by all agents.
+    """
+    
+    def __init__(self, client: Optional["anthropic.AsyncAnthropic"] = None,
+                 max_concurrency: int = SWARM_MAX_CONCURRENCY,
+                 agent_concurrency: int = AGENT_MAX_CONCURRENCY,
+                 cache: Optional[AgentResponseCache] = None,
+                 router: Optional[TaskRouter] = None):
+        self.client = client
+        self.cache = cache
+        self.router = router or TaskRouter()
+        self.max_concurrency = max_concurrency
+        self.agent_concurrency = agent_concurrency
+        self.slots = asyncio.Semaphore(max_concurrency)
         self.agents = []
+        self.by_role: Dict[AgentRole, Agent] = {}
         self.init_agents()
     
     def init_agents(self):
@@ -487,9 +1880,23 @@ class AgentSwarm:
         for role in AgentRole:
             agent = Agent(
                 role=role,
-                agent_id=f"{role.value.lower()}_{hashlib.md5(role.value.encode()).hexdigest()[:8]}"
+                agent_id=f"{role.value.lower()}_{hashlib.md5(role.value.encode()).hexdigest()[:8]}",
+                api_client=self.client,
+                max_concurrency=self.agent_concurrency,
+                swarm_slots=self.slots,
+                cache=self.cache
             )
             self.agents.append(agent)
+            self.by_role[role] = agent
+    
+    @property
+    def in_flight(self) -> int:
+        return sum(agent.in_flight for agent in self.agents)
+    
+    async def aclose(self):
+        """Close the swarm's own client (the process-wide shared client is left open)"""
+        if self.client is not None:
+            await self.client.close()
     
     async def delegate_task(self, task: Dict[str, Any], role: Optional[AgentRole] = None) -> Dict[str, Any]:
         """
@@ -503,7 +1910,7 @@ class AgentSwarm:
             Task result
         """
         if role:
-            agent = next((a for a in self.agents if a.role == role), None)
+            agent = self.by_role.get(role)
             if not agent:
                 return {"success": False, "error": f"Agent {role.value} not found"}
         else:
@@ -512,22 +1919,217 @@ class AgentSwarm:
         
         return await agent.process_task(task)
     
-    def _select_agent(self, task: Dict[str, Any]) -> Agent:
-        """Auto-select best agent for task based on keywords"""
-        description = task.get('description', '').lower()
-        
-        # Simple keyword matching (production would use more sophisticated NLP)
-        if any(word in description for word in ['sell', 'close', 'deal', 'revenue']):
-            return next(a for a in self.agents if a.role == AgentRole.SALES_KING)
-        elif any(word in description for word in ['market', 'campaign', 'brand']):
-            return next(a for a in self.agents if a.role == AgentRole.MARKETING_MASTER)
-        elif any(word in description for word in ['content', 'write', 'copy']):
-            return next(a for a in self.agents if a.role == AgentRole.CONTENT_CREATOR)
-        elif any(word in description for word in ['data', 'analytics', 'insights']):
-            return next(a for a in self.agents if a.role == AgentRole.DATA_SCIENTIST)
+    async def delegate_stream(self, task: Dict[str, Any],
+                              role: Optional[AgentRole] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming counterpart of delegate_task; yields Agent.stream_task events"""
+        if role:
+            agent = self.by_role.get(role)
+            if not agent:
+                yield {"type": "error", "error": f"Agent {role.value} not found"}
+                return
         else:
-            # Default to strategy consultant
-            return next(a for a in self.agents if a.role == AgentRole.STRATEGY_CONSULTANT)
+            agent = self._select_agent(task)
+        
+        async with aclosing(agent.stream_task(task)) as events:
+            async for event in events:
+                yield event
+    
+    async def delegate_parallel(self, task: Dict[str, Any], roles: List[AgentRole],
+                                deadline: Optional[float] = PARALLEL_DEADLINE,
+                                quorum: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Fan a task out to several agents at once and merge their answers
+        
+        Agents run concurrently in one TaskGroup. As soon as ``quorum``
+        agents have answered successfully, or ``deadline`` seconds have
+        passed, the remaining agents are cancelled, so latency tracks the
+        quorum-th fastest agent rather than the slowest.
+        
+        Args:
+            task: Task dictionary, sent unchanged to every agent
+            roles: Agent roles to consult (duplicates are ignored)
+            deadline: Seconds to wait at most (None waits indefinitely)
+            quorum: Successful answers to wait for (default: all roles)
+        
+        Returns:
+            Per-role results in the order given, each with status
+            ("ok", "error" or "cancelled") and latency_ms, plus the
+            successful outputs merged under role headings
+        """
+        roles = list(dict.fromkeys(roles))
+        if not roles:
+            raise ValueError("roles must not be empty")
+        quorum = len(roles) if quorum is None else quorum
+        if not 0 < quorum <= len(roles):
+            raise ValueError(f"quorum must be in [1, {len(roles)}]")
+        
+        agents = [self.by_role[role] for role in roles]
+        results: Dict[AgentRole, Dict[str, Any]] = {}
+        answered = asyncio.Event()
+        started = time.perf_counter()
+        
+        async def consult(agent: Agent):
+            result = await agent.process_task(task)
+            result["status"] = "ok" if result["success"] else "error"
+            result["latency_ms"] = (time.perf_counter() - started) * 1000
+            results[agent.role] = result
+            successes = sum(1 for r in results.values() if r["success"])
+            if successes >= quorum or len(results) == len(agents):
+                answered.set()
+        
+        async with asyncio.TaskGroup() as group:
+            pending = [group.create_task(consult(agent)) for agent in agents]
+            try:
+                await asyncio.wait_for(answered.wait(), deadline)
+            except asyncio.TimeoutError:
+                pass
+            for future in pending:
+                future.cancel()  # No-op for agents that have already answered
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        ordered = []
+        for agent in agents:
+            result = results.get(agent.role)
+            if result is None:
+                result = {
+                    "success": False,
+                    "status": "cancelled",
+                    "error": "cancelled after quorum" if answered.is_set() else "deadline exceeded",
+                    "latency_ms": elapsed_ms,
+                    "metadata": {"agent": agent.role.value, "agent_id": agent.agent_id}
+                }
+            result["role"] = agent.role.value
+            ordered.append(result)
+        
+        successes = [r for r in ordered if r["success"]]
+        return {
+            "success": len(successes) >= quorum,
+            "quorum": quorum,
+            "answered": len(successes),
+            "cancelled": sum(1 for r in ordered if r["status"] == "cancelled"),
+            "latency_ms": elapsed_ms,
+            "results": ordered,
+            "output": "\n\n".join(f"## {r['role']}\n{r['output']}" for r in successes)
+        }
+    
+    def stream_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-role TTFB and tokens/s for roles that have streamed"""
+        return {agent.role.value: agent.stream_metrics for agent in self.agents
+                if agent.stream_metrics["streams"]}
+    
+    def _select_agent(self, task: Dict[str, Any]) -> Agent:
+        """Auto-select best agent for task via the keyword router"""
+        return self.by_role[self.router.route(task.get('description', ''))]
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BACKGROUND PERSISTENCE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class WriteBehindQueue:
+    """
+    Write-behind queue for background loops
+    
+    put() only appends to an in-memory queue, so it is safe to call from
+    the event loop. A single writer thread drains the queue in batches,
+    flushing when WRITE_BEHIND_BATCH events have accumulated or the oldest
+    pending event has waited WRITE_BEHIND_INTERVAL seconds. Each batch is
+    split by kind and handed to the handler registered for that kind as
+    one list of payloads, so handlers can coalesce repeated events.
+    """
+    
+    def __init__(self, max_batch: int = WRITE_BEHIND_BATCH, max_delay: float = WRITE_BEHIND_INTERVAL):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "queue.Queue" = queue.Queue()
+        self._handlers: Dict[str, Any] = {}
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"events": 0, "batches": 0, "errors": 0}
+    
+    def register(self, kind: str, handler):
+        """Route events of ``kind`` to ``handler(payloads)``"""
+        self._handlers[kind] = handler
+    
+    def put(self, kind: str, payload: Any = None):
+        """Queue an event; never blocks"""
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for {kind!r}")
+        self._queue.put((kind, payload))
+    
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+    
+    def start(self):
+        """Start the writer thread (no-op if already running)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="tsi-write-behind", daemon=True)
+            self._thread.start()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far has been written"""
+        if self._thread is None or not self._thread.is_alive():
+            self._drain()
+            return True
+        done = threading.Event()
+        self._queue.put(("__flush__", done))
+        return done.wait(timeout)
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Flush pending events and stop the writer thread"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(("__stop__", None))
+            self._thread.join(timeout)
+        self._thread = None
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch and batch[-1][0] not in ("__flush__", "__stop__"):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            self._write(batch)
+            kind, payload = batch[-1]
+            if kind == "__flush__":
+                payload.set()
+            elif kind == "__stop__":
+                self._drain()
+                return
+    
+    def _drain(self):
+        """Write whatever is queued without waiting (writer thread or stopped queue only)"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write(batch)
+        for kind, payload in batch:
+            if kind == "__flush__":
+                payload.set()
+    
+    def _write(self, batch: List[Tuple[str, Any]]):
+        grouped: Dict[str, List[Any]] = {}
+        for kind, payload in batch:
+            if kind in self._handlers:
+                grouped.setdefault(kind, []).append(payload)
+        
+        for kind, payloads in grouped.items():
+            try:
+                self._handlers[kind](payloads)
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"❌ Write-behind {kind} error: {e}")
+            self.stats["events"] += len(payloads)
+        if grouped:
+            self.stats["batches"] += 1
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # MAIN TSI SYSTEM
@@ -540,11 +2142,26 @@ class TSICore:
         self.tokenizer = TemporalDNATokenizer()
         self.currency = SKACurrencySystem()
         self.rkl = RKLFramework()
-        self.agents = AgentSwarm()
+        self.agents = AgentSwarm(cache=AgentResponseCache())
         self.running = False
+        self.persistence = WriteBehindQueue()
+        self.persistence.register("mint", self._write_mints)
+        self.persistence.register("snapshot", self._write_snapshot)
+        self._last_snapshot = time.time()
+        self._status: Optional[Dict[str, Any]] = None
         
     def get_system_status(self) -> Dict[str, Any]:
-        """Get current system status"""
+        """
+        Get current system status
+        
+        Built on first use after each heartbeat tick and cached until the
+        next one, so repeated polling costs a dict copy.
+        """
+        if self._status is None:
+            self._status = self._build_system_status()
+        return dict(self._status)
+    
+    def _build_system_status(self) -> Dict[str, Any]:
         total_supply = self.currency.calculate_total_supply()
         seconds_since_genesis = time.time() - GENESIS_TIMESTAMP
         
@@ -561,7 +2178,8 @@ class TSICore:
             "agents": {
                 "total": len(self.agents.agents),
                 "active": len([a for a in self.agents.agents if a.status == "active"]),
-                "tasks_completed": sum(a.tasks_completed for a in self.agents.agents)
+                "tasks_completed": sum(a.tasks_completed for a in self.agents.agents),
+                "cache": self.agents.cache.stats() if self.agents.cache else None
             },
             "rkl_framework": {
                 "alpha": self.rkl.alpha,
@@ -571,6 +2189,12 @@ class TSICore:
             "current_token": self.tokenizer.generate_token(expansion_level=0)
         }
     
+    def get_agent(self, agent_id: int) -> Agent:
+        """Agent by position in the swarm (0-24, AgentRole order)"""
+        if not 0 <= agent_id < len(self.agents.agents):
+            raise KeyError(f"No agent {agent_id}")
+        return self.agents.agents[agent_id]
+    
     async def start(self):
         """Start the TSI system"""
         self.running = True
@@ -580,30 +2204,240 @@ class TSICore:
         print(f"🤖 Agents: {len(self.agents.agents)} active")
         
         # Start background tasks
+        self.persistence.start()
         asyncio.create_task(self._currency_minting_loop())
         asyncio.create_task(self._system_heartbeat())
     
+    async def stop(self):
+        """Stop the background loops and flush pending writes"""
+        self.running = False
+        self._status = None
+        await asyncio.to_thread(self.persistence.stop)
+    
+    def _write_mints(self, payloads: List[Any]):
+        """Write-behind handler: one catch-up covers every queued mint tick"""
+        self.currency.catch_up()
+    
+    def _write_snapshot(self, payloads: List[Any]):
+        """Write-behind handler: snapshot and compact the currency database"""
+        self.currency.snapshot()
+    
     async def _currency_minting_loop(self):
         """Background task: Mint SKA Credits every second"""
         while self.running:
-            try:
-                # Mint 1 credit
-                self.currency.mint_credits(count=1, owner="TREASURY")
-                await asyncio.sleep(1.0)
-            except Exception as e:
-                print(f"❌ Currency minting error: {e}")
-                await asyncio.sleep(1.0)
+            # Queue the tick; the writer thread mints everything owed when it flushes
+            now = time.time()
+            self.persistence.put("mint", now)
+            if now - self._last_snapshot >= SNAPSHOT_INTERVAL:
+                self.persistence.put("snapshot", now)
+                self._last_snapshot = now
+            await asyncio.sleep(1.0)
     
     async def _system_heartbeat(self):
         """Background task: System heartbeat every second"""
         while self.running:
-            try:
-                status = self.get_system_status()
-                # Log heartbeat (simplified - production would use proper logging)
-                await asyncio.sleep(1.0)
-            except Exception as e:
-                print(f"❌ Heartbeat error: {e}")
-                await asyncio.sleep(1.0)
+            # Expire the cached status; the next reader rebuilds it
+            self._status = None
+            await asyncio.sleep(1.0)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BENCHMARKS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def benchmark_tokenizer(num_tokens: int = 100000, expansion_level: int = 4):
+    """Compare single-token generation against the batched generate_tokens path"""
+    tokenizer = TemporalDNATokenizer()
+    single_count = max(1, num_tokens // 10)
+    
+    start = time.perf_counter()
+    for _ in range(single_count):
+        tokenizer.generate_token(expansion_level=expansion_level)
+    single_rate = single_count / (time.perf_counter() - start)
+    
+    buffer = bytearray(num_tokens * 16 * (expansion_level + 1))
+    start = time.perf_counter()
+    tokenizer.generate_tokens(num_tokens, expansion_level=expansion_level, out=buffer)
+    batch_rate = num_tokens / (time.perf_counter() - start)
+    
+    print(f"═══════════════════════════════════════════════")
+    print(f"TEMPORAL DNA TOKENIZER BENCHMARK")
+    print(f"═══════════════════════════════════════════════")
+    print(f"Expansion level: {expansion_level} ({16 * (expansion_level + 1)} digits)")
+    print(f"generate_token: {single_rate:,.0f} tokens/s")
+    print(f"generate_tokens: {batch_rate:,.0f} tokens/s ({batch_rate / single_rate:.0f}x)")
+    print(f"═══════════════════════════════════════════════")
+    
+    return {
+        'expansion_level': expansion_level,
+        'single_tokens_per_sec': single_rate,
+        'batch_tokens_per_sec': batch_rate
+    }
+
+def _sample_agent_payload(rng, size: int) -> bytes:
+    """Agent-style JSON records, repetitive like real prompts and responses"""
+    roles = [role.value for role in AgentRole]
+    words = ("revenue pipeline conversion campaign customer onboarding forecast strategy "
+             "retention pricing upsell outreach analysis roadmap growth brand").split()
+    parts, used = [], 0
+    while used < size:
+        record = json.dumps({
+            "agent": rng.choice(roles),
+            "task": " ".join(rng.choice(words) for _ in range(rng.randint(4, 12))),
+            "output": " ".join(rng.choice(words) for _ in range(rng.randint(20, 60))),
+            "timestamp": 1719792000 + rng.randrange(10 ** 8)
+        }) + "\n"
+        parts.append(record)
+        used += len(record)
+    return "".join(parts).encode()[:size]
+
+def benchmark_compression(sizes: Iterable[int] = (1 << 10, 64 << 10, 1 << 20, 8 << 20),
+                          message_count: int = 500):
+    """Compression ratio and throughput per codec and payload size, plus dictionary gain"""
+    import random
+    rng = random.Random(25)
+    rkl = RKLFramework()
+    codecs = ["zlib", "lzma"] + (["zstd"] if zstandard is not None else [])
+    rows = []
+    
+    print(f"═══════════════════════════════════════════════")
+    print(f"RKL COMPRESSION BENCHMARK")
+    print(f"═══════════════════════════════════════════════")
+    for size in sizes:
+        payload = _sample_agent_payload(rng, size)
+        for codec in codecs:
+            rkl.codec = codec
+            start = time.perf_counter()
+            frame = rkl.compress_data(payload)
+            compress_time = time.perf_counter() - start
+            start = time.perf_counter()
+            restored = rkl.decompress_data(frame)
+            decompress_time = time.perf_counter() - start
+            assert restored == payload
+            
+            row = {
+                'codec': codec,
+                'size': size,
+                'ratio': size / len(frame),
+                'compress_mb_per_sec': size / (1 << 20) / max(compress_time, 1e-9),
+                'decompress_mb_per_sec': size / (1 << 20) / max(decompress_time, 1e-9)
+            }
+            rows.append(row)
+            print(f"{codec:>5} {size:>9,} B: ratio {row['ratio']:5.2f}x, "
+                  f"compress {row['compress_mb_per_sec']:7.1f} MB/s, "
+                  f"decompress {row['decompress_mb_per_sec']:7.1f} MB/s")
+    
+    # Small agent messages, with and without a trained dictionary
+    rkl.codec = default_codec()
+    messages = [_sample_agent_payload(rng, rng.randint(300, 800)) for _ in range(message_count)]
+    training, held_out = messages[:message_count // 2], messages[message_count // 2:]
+    raw_total = sum(len(message) for message in held_out)
+    plain_total = sum(len(rkl.compress_data(message)) for message in held_out)
+    rkl.train_dictionary(training)
+    dict_total = sum(len(rkl.compress_data(message)) for message in held_out)
+    print(f"Agent messages ({len(held_out)} held out, {rkl.codec}): "
+          f"ratio {raw_total / plain_total:.2f}x plain, {raw_total / dict_total:.2f}x with dictionary")
+    print(f"═══════════════════════════════════════════════")
+    
+    return {
+        'payloads': rows,
+        'message_ratio_plain': raw_total / plain_total,
+        'message_ratio_dictionary': raw_total / dict_total
+    }
+
+ROUTING_CORPUS = [
+    ("Close the enterprise deal before quarter end", AgentRole.SALES_KING),
+    ("Improve conversion on the sales calls", AgentRole.SALES_KING),
+    ("Plan a growth campaign for the spring launch", AgentRole.MARKETING_MASTER),
+    ("Rework our market positioning against competitors", AgentRole.MARKETING_MASTER),
+    ("Build a prospecting list and outreach plan", AgentRole.CUSTOMER_ACQUISITION),
+    ("Generate more leads for the coaching program", AgentRole.CUSTOMER_ACQUISITION),
+    ("Design upsells for existing members", AgentRole.REVENUE_OPTIMIZER),
+    ("Test new pricing tiers for monetization", AgentRole.REVENUE_OPTIMIZER),
+    ("Forecast cash flow for next year", AgentRole.FINANCE_ANALYST),
+    ("Prepare the annual budget and ROI estimates", AgentRole.FINANCE_ANALYST),
+    ("Find patterns in churn data", AgentRole.DATA_SCIENTIST),
+    ("Build predictions from usage analytics", AgentRole.DATA_SCIENTIST),
+    ("Write copy for the landing page", AgentRole.CONTENT_CREATOR),
+    ("Script three short videos for the course", AgentRole.CONTENT_CREATOR),
+    ("Set up an email sequence with automation", AgentRole.EMAIL_MARKETER),
+    ("Fix deliverability of our newsletters", AgentRole.EMAIL_MARKETER),
+    ("Grow engagement on social media", AgentRole.SOCIAL_MEDIA_MANAGER),
+    ("Schedule posts for our social channels", AgentRole.SOCIAL_MEDIA_MANAGER),
+    ("Reduce churn with better customer retention", AgentRole.CUSTOMER_SUCCESS),
+    ("Raise satisfaction scores from support tickets", AgentRole.CUSTOMER_SUCCESS),
+    ("Prioritize features for the mobile app", AgentRole.PRODUCT_DEVELOPER),
+    ("Draft the product development plan for v2", AgentRole.PRODUCT_DEVELOPER),
+    ("Plan infrastructure for scalability", AgentRole.TECH_ARCHITECT),
+    ("Review the technical architecture of the API", AgentRole.TECH_ARCHITECT),
+    ("Improve threat detection on login", AgentRole.SECURITY_GUARDIAN),
+    ("Harden protection against account takeover", AgentRole.SECURITY_GUARDIAN),
+    ("Review the vendor contracts", AgentRole.LEGAL_ADVISOR),
+    ("Check which regulations apply in the EU", AgentRole.LEGAL_ADVISOR),
+    ("Start hiring two engineers", AgentRole.HR_MANAGER),
+    ("Improve company culture and HR policies", AgentRole.HR_MANAGER),
+    ("Streamline our fulfilment processes", AgentRole.OPERATIONS_MANAGER),
+    ("Improve efficiency of weekly coordination", AgentRole.OPERATIONS_MANAGER),
+    ("Set the three year vision", AgentRole.STRATEGY_CONSULTANT),
+    ("Help me think about what we should do next", AgentRole.STRATEGY_CONSULTANT),
+    ("Prepare the seed fundraising deck", AgentRole.INVESTOR_RELATIONS),
+    ("Draft the quarterly investor update", AgentRole.INVESTOR_RELATIONS),
+    ("Find partnerships with coaching platforms", AgentRole.PARTNERSHIP_DEVELOPMENT),
+    ("Negotiate an alliance with a software vendor", AgentRole.PARTNERSHIP_DEVELOPMENT),
+    ("Refresh our visual identity", AgentRole.BRAND_MANAGER),
+    ("Protect our reputation after bad reviews", AgentRole.BRAND_MANAGER),
+    ("Write a press release for the launch", AgentRole.PR_SPECIALIST),
+    ("Handle the media questions about the outage", AgentRole.PR_SPECIALIST),
+    ("Organize a networking event in Austin", AgentRole.EVENT_COORDINATOR),
+    ("Plan the annual summit logistics for events", AgentRole.EVENT_COORDINATOR),
+    ("Create training for new sales reps", AgentRole.TRAINING_SPECIALIST),
+    ("Design an education track for skill development", AgentRole.TRAINING_SPECIALIST),
+    ("Define testing standards for releases", AgentRole.QUALITY_ASSURANCE),
+    ("Set up quality control for course material", AgentRole.QUALITY_ASSURANCE),
+    ("Track emerging technologies in edtech", AgentRole.INNOVATION_SCOUT),
+    ("Summarize competitive intelligence and trends", AgentRole.INNOVATION_SCOUT)
+]
+
+def _legacy_route(description: str) -> AgentRole:
+    """The substring rules _select_agent used before TaskRouter, for comparison"""
+    description = description.lower()
+    for role, words in ROLE_KEYWORDS.items():
+        if any(word in description for word in words):
+            return role
+    return AgentRole.STRATEGY_CONSULTANT
+
+def benchmark_routing(iterations: int = 200):
+    """Routing accuracy, role coverage and latency per mode over ROUTING_CORPUS"""
+    router = TaskRouter()
+    descriptions = [description for description, _ in ROUTING_CORPUS]
+    expected = [role for _, role in ROUTING_CORPUS]
+    modes = {"legacy": _legacy_route}
+    modes.update({mode: (lambda description, mode=mode: router.route(description, mode))
+                  for mode in TaskRouter.MODES})
+    rows = {}
+    
+    print(f"═══════════════════════════════════════════════")
+    print(f"TASK ROUTING BENCHMARK")
+    print(f"═══════════════════════════════════════════════")
+    print(f"Corpus: {len(ROUTING_CORPUS)} tasks, vocabulary: {router.vocabulary_size} terms")
+    for name, route in modes.items():
+        routed = [route(description) for description in descriptions]
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for description in descriptions:
+                route(description)
+        elapsed = time.perf_counter() - start
+        
+        rows[name] = {
+            'accuracy': sum(a == b for a, b in zip(routed, expected)) / len(expected),
+            'roles_reached': len(set(routed)),
+            'us_per_route': elapsed / (iterations * len(descriptions)) * 1e6
+        }
+        print(f"{name:>8}: accuracy {rows[name]['accuracy']:6.1%}, "
+              f"{rows[name]['roles_reached']:2d} roles reached, "
+              f"{rows[name]['us_per_route']:6.2f} µs/route")
+    print(f"═══════════════════════════════════════════════")
+    
+    return rows
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # EXPORTS
@@ -616,7 +2450,8 @@ __all__ = [
     'RKLFramework',
     'AgentSwarm',
     'Agent',
-    'AgentRole'
+    'AgentRole',
+    'TaskRouter'
 ]
 
 if __name__ == "__main__":
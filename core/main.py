@@ -6,21 +6,28 @@ import os
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials  
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import asyncio
+import json
+from typing import Optional
 
 # Import TSI Core (Custom LLM System)
 from backend.tsi_core import TSICore, Agent as TSIAgent, get_current_credits, generate_temporal_dna
-from backend.sat_solver import RKLSATSolver
+from backend.sat_solver import (RKLSATSolver, SATResult, DIMACSError, SolveInterrupted, parse_dimacs,
+                                parse_dimacs_async, portfolio_configs)
+from backend.sat_jobs import SATJobQueue, SATBudget
 from backend.mind_mastery import MindMasterySystem
 from backend.ska_autonomous_engine_complete import SKAAutonomousEngine
 
 app = FastAPI(title="Sales King Academy API")
 
+SAT_WALL_SECONDS = 60  # Deadline for one SAT request before it answers UNKNOWN
+SAT_MAX_UPLOAD = 64 << 20  # Largest DIMACS body accepted, before and after decompression
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -30,20 +37,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize all systems
-print("Initializing TSI Core...")
-tsi = TSICore()
-
-print("Initializing RKL SAT Solver...")
+# SAT workers are spawned processes that re-import this module when it runs
+# as a script, so only cheap objects are built at import time; the rest are
+# built once in startup()
 sat_solver = RKLSATSolver(alpha=25)
-
-print("Initializing Mind Mastery (MyIQ)...")
-myiq = MindMasterySystem()
-
-print("Initializing Autonomous Engine...")
-autonomous = SKAAutonomousEngine()
-
-print("✅ All systems initialized")
+sat_jobs = SATJobQueue(default_budget=SATBudget(wall_seconds=SAT_WALL_SECONDS))
+tsi: Optional[TSICore] = None
+myiq: Optional[MindMasterySystem] = None
+autonomous: Optional[SKAAutonomousEngine] = None
+
+@app.on_event("startup")
+async def startup():
+    """Initialize all systems"""
+    global tsi, myiq, autonomous
+    print("Initializing TSI Core...")
+    tsi = TSICore()
+    
+    print("Initializing Mind Mastery (MyIQ)...")
+    myiq = MindMasterySystem()
+    
+    print("Initializing Autonomous Engine...")
+    autonomous = SKAAutonomousEngine()
+    
+    print("✅ All systems initialized")
 
 # Models
 class ChatRequest(BaseModel):
@@ -52,7 +68,10 @@ class ChatRequest(BaseModel):
     use_web_search: bool = False
 
 class SATRequest(BaseModel):
-    problem: str
+    problem: str  # DIMACS CNF text
+    engine: str = "cdcl"
+    workers: int = 1  # > 1 races a solver portfolio across processes
+    preprocess: bool = False
 
 @app.get("/")
 async def root():
@@ -87,19 +106,112 @@ async def agent_chat(request: ChatRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/agents/chat/stream")
+async def agent_chat_stream(request: ChatRequest):
+    """Chat with an agent over server-sent events, one event per text delta"""
+    try:
+        agent = tsi.get_agent(request.agent_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    async def events():
+        async for event in agent.stream_task({"description": request.message}):
+            yield f"data: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.websocket("/agents/chat/ws")
+async def agent_chat_socket(websocket: WebSocket):
+    """Chat over a WebSocket: send ChatRequest JSON, receive delta events then done"""
+    await websocket.accept()
+    try:
+        while True:
+            try:
+                request = ChatRequest(**await websocket.receive_json())
+                agent = tsi.get_agent(request.agent_id)
+            except (KeyError, ValueError, TypeError) as e:
+                await websocket.send_json({"type": "error", "error": str(e)})
+                continue
+            async for event in agent.stream_task({"description": request.message}):
+                await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+
+def _sat_response(result, num_variables: int, num_clauses: int):
+    return {
+        "solution": {
+            "satisfiable": result.satisfiable,
+            "assignment": result.assignment,
+            "cycles": result.cycles,
+            "time_ms": result.time_ms,
+            "engine": result.engine,
+            "verification_hash": result.verification_hash,
+            "workers": result.workers,
+            "preprocessing": result.preprocessing
+        },
+        "variables": num_variables,
+        "clauses": num_clauses,
+        "complexity": "O(n^1.77)",
+        "alpha": 25
+    }
+
+async def _solve_job(clauses, num_variables: int, engine: str, preprocess: bool = False):
+    """Solve in the job queue (own process, wall-clock budget); UNKNOWN when the budget runs out"""
+    job = await sat_jobs.wait(sat_jobs.submit(clauses, num_variables, engine=engine, preprocess=preprocess))
+    if job.result is None:
+        if job.answer != "UNKNOWN":
+            raise RuntimeError(job.reason or "SAT job failed")
+        return {"solution": {"satisfiable": None, "answer": job.answer, "reason": job.reason,
+                             "cycles": job.progress.get("cycles", 0)},
+                "variables": num_variables, "clauses": len(clauses)}
+    return _sat_response(SATResult(**job.result), num_variables, len(clauses))
+
+def _solve_portfolio_blocking(clauses, num_variables: int, workers: int, engine: str):
+    """Portfolio race on a private solver; solve_portfolio rewrites its solver's cycles, ledger and stats"""
+    solver = RKLSATSolver(alpha=sat_solver.alpha)
+    return solver.solve_portfolio(clauses, num_variables,
+                                  configs=portfolio_configs(workers, solver.alpha, engine),
+                                  wall_seconds=SAT_WALL_SECONDS)
+
 @app.post("/rkl/solve")
 async def solve_sat(request: SATRequest):
     """Solve SAT problem using RKL Framework O(n^1.77)"""
+    max_workers = os.cpu_count() or 1
+    if not 1 <= request.workers <= max_workers:
+        raise HTTPException(status_code=400, detail=f"workers must be between 1 and {max_workers}")
+    if request.workers > 1 and request.preprocess:
+        raise HTTPException(status_code=400, detail="preprocess is not supported with workers > 1")
     try:
-        result = sat_solver.solve(request.problem)
-        return {
-            "solution": result,
-            "complexity": "O(n^1.77)",
-            "alpha": 25
-        }
+        clauses, num_variables = parse_dimacs(request.problem.encode())
+        if request.workers == 1:
+            return await _solve_job(clauses, num_variables, request.engine, request.preprocess)
+        try:
+            result = await asyncio.to_thread(_solve_portfolio_blocking, clauses, num_variables,
+                                             request.workers, request.engine)
+        except SolveInterrupted as e:
+            return {"solution": {"satisfiable": None, "answer": "UNKNOWN",
+                                 "reason": "time budget exhausted", "cycles": e.cycles},
+                    "variables": num_variables, "clauses": len(clauses)}
+        return _sat_response(result, num_variables, len(clauses))
+    except (DIMACSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/rkl/solve/dimacs")
+async def solve_sat_dimacs(request: Request, engine: str = "cdcl"):
+    """Solve a raw (optionally gzip/xz compressed) DIMACS CNF request body, parsed as it streams in"""
+    if int(request.headers.get("content-length") or 0) > SAT_MAX_UPLOAD:
+        raise HTTPException(status_code=413, detail=f"Body exceeds {SAT_MAX_UPLOAD} bytes")
+    encoding = request.headers.get("content-encoding")
+    compression = {"gzip": "gzip", "xz": "xz", "identity": None}.get(encoding, "auto")
+    try:
+        clauses, num_variables = await parse_dimacs_async(request.stream(), compression,
+                                                          max_bytes=SAT_MAX_UPLOAD)
+        return await _solve_job(clauses, num_variables, engine)
+    except (DIMACSError, ValueError, EOFError, OSError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/currency/balance")
 async def get_balance():
     """Get current SKA Credits balance"""